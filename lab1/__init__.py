@@ -1,3 +1,9 @@
 from lab1.core.base import Automata
+from lab1.core.compact import CompactAutomata
 
 from lab1.core.converters.enfa_to_nfa import ENFAToNFAConverter
+from lab1.core.converters.incremental import IncrementalENFAToNFAConverter
+from lab1.core.converters.keywords_to_dfa import KeywordsToDFAConverter
+from lab1.core.converters.nfa_to_dfa import NFAToDFAConverter
+from lab1.core.converters.minimize_dfa import DFAMinimizer
+from lab1.core.converters.regex_to_enfa import RegexToENFAConverter
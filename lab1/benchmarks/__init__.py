@@ -0,0 +1,4 @@
+"""
+The benchmarks package contains timing scripts for the lab1 automata tools.
+They are not part of the test suite and are run by hand or from CI jobs.
+"""
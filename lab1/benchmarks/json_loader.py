@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from lab1 import Automata
+
+
+def legacy_load_from_file(filename: str) -> Automata:
+    """The original `eval`-based loader, kept here as the comparison baseline."""
+    with open(filename, "r") as file:
+        data = json.loads(file.read())
+    data["A"] = set(data["A"])
+    data["X"] = set(data["X"])
+    data["f"] = {tuple(eval(k)): set(v) for k, v in data["f"].items()}
+    data["F"] = set(data["F"])
+    return Automata(**data)
+
+
+def from_json_load_from_file(filename: str) -> Automata:
+    with open(filename, "r") as file:
+        return Automata.from_json(file.read())
+
+
+def scale_up(automata: Automata, copies: int) -> Automata:
+    """Build `copies` disjoint renamed copies of the automaton in one instance."""
+
+    def rename(state, i):
+        return "{}_{}".format(state, i)
+
+    return Automata(
+        A={rename(a, i) for i in range(copies) for a in automata.A},
+        X=set(automata.X),
+        f={
+            (rename(a, i), x): {rename(b, i) for b in targets}
+            for i in range(copies)
+            for (a, x), targets in automata.f.items()
+        },
+        a0=rename(automata.a0, 0),
+        F={rename(a, i) for i in range(copies) for a in automata.F},
+        epsilon=automata.epsilon,
+    )
+
+
+def time_loader(loader, filename: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loader(filename)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Automata JSON loaders.")
+    parser.add_argument("--data", default="lab1/data")
+    parser.add_argument("--copies", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    loaders = {
+        "legacy eval": legacy_load_from_file,
+        "from_json": from_json_load_from_file,
+        "streaming": Automata.load_from_file,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in sorted(os.listdir(args.data)):
+            automata = scale_up(
+                Automata.load_from_file(os.path.join(args.data, name)), args.copies
+            )
+            filename = os.path.join(tmp, name)
+            automata.save_to_file(filename)
+
+            size = os.path.getsize(filename) / 2**20
+            print("{} x{} ({:.1f} MB)".format(name, args.copies, size))
+            for label, loader in loaders.items():
+                assert loader(filename) == automata
+                seconds = time_loader(loader, filename, args.repeat)
+                print("  {:<12} {:8.3f} s".format(label, seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Scaling benchmarks for Automata I/O and ENFA to NFA conversion.
+
+Every case is a seeded random ENFA, so runs on different machines or commits
+time exactly the same inputs. Each operation is timed `repeat` times (the
+best run is kept) and then run once more under tracemalloc for its peak
+memory. Results are written as JSON; passing an earlier result file as
+`--baseline` compares against it and exits with status 1 on regressions.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from lab1 import Automata, ENFAToNFAConverter
+from lab1.core.random_automata import random_enfa
+
+# name -> (states, symbols, density, epsilon density)
+#
+# Epsilon densities stay below 1: above it, the epsilon graph has a giant
+# strongly connected component and the NFA grows quadratically with the
+# number of states.
+CASES = {
+    "small": (1_000, 4, 1.0, 0.3),
+    "medium": (20_000, 8, 1.0, 0.3),
+    "large": (100_000, 8, 1.0, 0.3),
+    "epsilon-heavy": (20_000, 4, 0.5, 0.8),
+}
+
+
+def _measure(operation, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run_case(
+    n_states: int,
+    n_symbols: int,
+    density: float,
+    epsilon_density: float,
+    seed: int = 0,
+    repeat: int = 3,
+    engines=ENFAToNFAConverter.ENGINES,
+) -> dict:
+    """Time every benchmarked operation on one generated ENFA."""
+    enfa = random_enfa(seed, n_states, n_symbols, density, epsilon_density)
+    json_string = enfa.to_json()
+
+    operations = {
+        "from_json": lambda: Automata.from_json(json_string),
+        "to_json": enfa.to_json,
+        "_format_transition_table": enfa._format_transition_table,
+    }
+    for engine in engines:
+        converter = ENFAToNFAConverter(enfa, engine=engine)
+        operations["convert_to_nfa[{}]".format(engine)] = converter.convert_to_nfa
+
+    return {
+        "params": {
+            "states": n_states,
+            "symbols": n_symbols,
+            "density": density,
+            "epsilon_density": epsilon_density,
+            "seed": seed,
+            "transitions": sum(len(targets) for targets in enfa.f.values()),
+        },
+        "results": {
+            name: _measure(operation, repeat) for name, operation in operations.items()
+        },
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Compare two result documents. Return one row per (case, operation, metric)
+    present in both: (case, operation, metric, baseline, current, ratio,
+    regressed), where `regressed` means the ratio exceeds 1 + tolerance.
+    """
+    rows = []
+    for case, data in current["cases"].items():
+        base_case = baseline["cases"].get(case)
+        if base_case is None or base_case["params"] != data["params"]:
+            continue
+        for operation, metrics in data["results"].items():
+            base_metrics = base_case["results"].get(operation)
+            if base_metrics is None:
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                old, new = base_metrics[metric], metrics[metric]
+                ratio = new / old if old else float("inf") if new else 1.0
+                rows.append(
+                    (case, operation, metric, old, new, ratio, ratio > 1 + tolerance)
+                )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark Automata JSON I/O and ENFA to NFA conversion."
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        default=["small", "medium"],
+        choices=sorted(CASES),
+        help="predefined cases to run",
+    )
+    parser.add_argument(
+        "--case",
+        nargs=4,
+        action="append",
+        default=[],
+        metavar=("STATES", "SYMBOLS", "DENSITY", "EPSILON_DENSITY"),
+        help="an extra custom case; may be repeated",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=list(ENFAToNFAConverter.ENGINES),
+        choices=ENFAToNFAConverter.ENGINES,
+    )
+    parser.add_argument("--output", default="-", help="result file ('-' for stdout)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed slowdown or memory growth before a regression is reported",
+    )
+    args = parser.parse_args()
+
+    cases = {name: CASES[name] for name in args.cases}
+    for states, symbols, density, epsilon_density in args.case:
+        params = (int(states), int(symbols), float(density), float(epsilon_density))
+        cases["custom-{}-{}-{}-{}".format(*params)] = params
+
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": {},
+    }
+    for name, params in cases.items():
+        print("running {} {}".format(name, params), file=sys.stderr)
+        document["cases"][name] = run_case(
+            *params, seed=args.seed, repeat=args.repeat, engines=args.engines
+        )
+
+    text = json.dumps(document, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+
+    if args.baseline is None:
+        return
+    with open(args.baseline, "r") as file:
+        baseline = json.load(file)
+    regressions = 0
+    for case, operation, metric, old, new, ratio, regressed in compare(
+        document, baseline, args.tolerance
+    ):
+        regressions += regressed
+        print(
+            "{:<14} {:<30} {:<10} {:>14.6g} {:>14.6g} {:7.2f}x{}".format(
+                case, operation, metric, old, new, ratio, "  REGRESSION" * regressed
+            ),
+            file=sys.stderr,
+        )
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
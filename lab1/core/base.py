@@ -4,6 +4,10 @@ from dataclasses import dataclass
 
 from automata.fa.nfa import NFA
 
+from lab1.core.dot import render_dot, write_dot
+from lab1.core.loader import decode_automata, read_automata_json
+from lab1.core.tracked import Changes, TrackedDict, tracked_set
+
 
 @dataclass
 class Automata:
@@ -14,22 +18,71 @@ class Automata:
     F: set  # Set of final states
     epsilon: str = None  # Epsilon symbol (optional)
 
+    def __setattr__(self, name, value):
+        # The sets and f are kept in tracked containers sharing one counter,
+        # so cached tables notice in-place edits as well as reassignments.
+        changes = self._change_counter()
+        if name in ("A", "X", "F"):
+            value = tracked_set(value, changes)
+        elif name == "f":
+            if isinstance(value, TrackedDict) and not value._changes.claimed:
+                changes = self._adopt_counter(value._changes)
+            else:
+                value = TrackedDict(value, changes)
+        elif name not in ("a0", "epsilon"):
+            object.__setattr__(self, name, value)
+            return
+        changes.count += 1
+        object.__setattr__(self, name, value)
+
+    def _change_counter(self) -> Changes:
+        changes = self.__dict__.get("_changes")
+        if changes is None:
+            changes = self.__dict__["_changes"] = Changes(claimed=True)
+        return changes
+
+    def _adopt_counter(self, changes: Changes) -> Changes:
+        # Switch to the counter of an adopted f, moving the other containers
+        # over and keeping the count ahead of any cached table.
+        changes.count = max(changes.count, self._change_counter().count) + 1
+        changes.claimed = True
+        for name in ("A", "X", "F"):
+            container = self.__dict__.get(name)
+            if container is not None:
+                container._changes = changes
+        self.__dict__["_changes"] = changes
+        return changes
+
+    def _cached(self, name: str, build):
+        """
+        Return the table cached under `name`, built by `build(self)` on first
+        use and again after any change to the automaton.
+        """
+        changes = self._change_counter()
+        cached = self.__dict__.get(name)
+        if cached is None or cached[0] != changes.count:
+            cached = self.__dict__[name] = (changes.count, build(self))
+        return cached[1]
+
     @classmethod
     def from_json(cls, json_string):
         """Deserialize the JSON string to create an Automata instance."""
-        data = json.loads(json_string)
-        data["A"] = set(data["A"])
-        data["X"] = set(data["X"])
-        data["f"] = {tuple(eval(k)): set(v) for k, v in data["f"].items()}
-        data["F"] = set(data["F"])
-        return cls(**data)
+        return cls(**decode_automata(json.loads(json_string)))
 
     @classmethod
     def load_from_file(cls, filename: str):
-        """Load an Automata instance from a file containing its JSON representation."""
+        """
+        Load an Automata instance from a file containing its JSON representation,
+        or memory-map it if the file is in the binary container format.
+        """
+        # Imported here because the binary format builds on CompactAutomata,
+        # which extends this class.
+        from lab1.core.binary import MappedAutomata, is_binary_file
+
+        if is_binary_file(filename):
+            return MappedAutomata.open(filename)
         with open(filename, "r") as file:
-            json_string = file.read()
-            return cls.from_json(json_string)
+            return cls(**read_automata_json(file))
 
     def __repr__(self):
         return (
@@ -43,8 +96,20 @@ class Automata:
             f")"
         )
 
-    def visualize(self, filename: str = "automata.png"):
-        """Generate a visual representation of the automaton and save it to a file."""
+    def _trimmed(self):
+        # Imported here because trimming builds on CompactAutomata, which
+        # extends this class.
+        from lab1.core.trim import trim
+
+        return trim(self).automata
+
+    def visualize(self, filename: str = "automata.png", trim: bool = False):
+        """
+        Generate a visual representation of the automaton and save it to a file.
+        With `trim` set, dead and unreachable states are left out.
+        """
+        if trim:
+            return self._trimmed().visualize(filename)
         # Convert the transition function to the format expected by visual-automata
         transitions = {}
         for (state, symbol), targets in self.f.items():
@@ -68,6 +133,84 @@ class Automata:
         graph = automaton.show_diagram()
         graph.draw(filename, prog="dot", format="png")
 
+    def write_dot(self, out, trim: bool = False, **options):
+        """
+        Stream the automaton as Graphviz DOT to a filename or text stream.
+        With `trim` set, dead and unreachable states are left out.
+
+        Options: merge_edges, max_nodes, depth (see `lab1.core.dot.write_dot`).
+        """
+        return write_dot(self._trimmed() if trim else self, out, **options)
+
+    def render_dot(
+        self,
+        filename: str,
+        output_format: str = "png",
+        trim: bool = False,
+        **options,
+    ):
+        """Render the automaton with the `dot` executable, without automata-lib."""
+        render_dot(
+            self._trimmed() if trim else self, filename, output_format, **options
+        )
+
+    def accepts_many(self, words):
+        """
+        Return a boolean NumPy array telling which of the words are accepted.
+
+        Each word is a sequence of symbols; a str is read one character at a time.
+        The simulator tables are built on first use and cached on the instance
+        until the automaton changes, like the path index.
+        """
+        # Imported here because the simulator builds on CompactAutomata, which
+        # extends this class.
+        from lab1.core.simulation import BatchSimulator
+
+        return self._cached("_batch_simulator", BatchSimulator).accepts_many(words)
+
+    def count_words(self, n: int) -> list:
+        """Return the numbers of accepted words of lengths 0..n."""
+        from lab1.core.counting import WordCounter
+
+        return WordCounter(self).count(n)
+
+    def sample_words(
+        self, length: int, size: int = 1, seed=None, up_to: bool = False
+    ) -> list:
+        """
+        Draw `size` accepted words of exactly `length` symbols (of at most
+        `length` symbols with `up_to`) uniformly at random, as tuples.
+        """
+        from lab1.core.counting import WordCounter
+
+        return WordCounter(self).sample(length, size, seed, up_to)
+
+    def path_index(self):
+        """
+        Return the shortest-word distance index of the automaton. It is built
+        on first use and cached on the instance until the automaton changes,
+        whether its attributes are replaced or edited in place.
+        """
+        from lab1.core.paths import PathIndex
+
+        return self._cached("_path_index", PathIndex)
+
+    def invalidate_path_index(self):
+        """Drop the cached shortest-word distance index."""
+        self.__dict__.pop("_path_index", None)
+
+    def shortest_word(self):
+        """Return a shortest accepted word as a tuple, or None if there is none."""
+        return self.path_index().shortest_word()
+
+    def shortest_word_to(self, state):
+        """Return a shortest word reaching `state` as a tuple, or None."""
+        return self.path_index().shortest_word_to(state)
+
+    def shortest_words(self, k: int = None):
+        """Yield (up to `k`) accepted words lazily in length-lexicographic order."""
+        return self.path_index().shortest_words(k)
+
     def to_json(self):
         """Serialize the Automata instance to a JSON string."""
         return json.dumps(
@@ -81,8 +224,16 @@ class Automata:
             }
         )
 
-    def save_to_file(self, filename: str):
-        """Save the Automata instance to a file in JSON format."""
+    def save_to_file(self, filename: str, binary: bool = False):
+        """
+        Save the Automata instance to a file in JSON format, or in the
+        memory-mappable binary container format if `binary` is set.
+        """
+        if binary:
+            from lab1.core.binary import save_binary
+
+            save_binary(self, filename)
+            return
         with open(filename, "w") as file:
             file.write(self.to_json())
 
@@ -0,0 +1,296 @@
+"""
+Versioned, memory-mappable binary container for automata.
+
+Layout (all integers little-endian, every section 8-byte aligned):
+
+    header     magic b"LAB1AUT\\0", version, flags, n_states, n_symbols,
+               n_input_symbols, epsilon_id (-1 if none), initial state id,
+               then an (offset, size) pair for each section below
+    state_offsets / state_data    string table of the state names
+    symbol_offsets / symbol_data  string table of the symbols
+    offsets    int64[n_states * n_symbols + 1], CSR row offsets
+    targets    int32[n_transitions], CSR targets
+    final      bitmap of the final states, bit q of byte q // 8
+    row_order  int64 row indices of the transitions in their original order
+
+A string table stores the JSON encoding of each name in UTF-8, so int and
+str names survive the round trip. `MappedAutomata.open` maps the file and
+wraps the sections in memoryviews without copying; names are only decoded
+when they are looked up, so opening is O(1) and the pages are shared
+between processes mapping the same file.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+from lab1.core.base import Automata
+from lab1.core.compact import CompactAutomata
+
+MAGIC = b"LAB1AUT\x00"
+VERSION = 1
+
+_SECTIONS = (
+    "state_offsets",
+    "state_data",
+    "symbol_offsets",
+    "symbol_data",
+    "offsets",
+    "targets",
+    "final",
+    "row_order",
+)
+_HEADER = struct.Struct("<8sIIqqqqq" + "qq" * len(_SECTIONS))
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _to_le_bytes(values, typecode: str) -> bytes:
+    values = array(typecode, values)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(view: memoryview, typecode: str):
+    if _LITTLE_ENDIAN:
+        return view.cast(typecode)
+    values = array(typecode, bytes(view))
+    values.byteswap()
+    return values
+
+
+def _string_table(names) -> tuple:
+    offsets = [0]
+    data = bytearray()
+    for name in names:
+        data += json.dumps(name).encode("utf-8")
+        offsets.append(len(data))
+    return _to_le_bytes(offsets, "q"), bytes(data)
+
+
+class _StringTable(Sequence):
+    """Lazily decoded view over a string table section."""
+
+    def __init__(self, offsets, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return json.loads(bytes(self._data[self._offsets[i] : self._offsets[i + 1]]))
+
+
+class _LazyIndex(Mapping):
+    """Name to id index that is only built on the first lookup."""
+
+    def __init__(self, names: Sequence):
+        self._names = names
+        self._ids = None
+
+    def _index(self) -> dict:
+        if self._ids is None:
+            self._ids = {name: i for i, name in enumerate(self._names)}
+        return self._ids
+
+    def __getitem__(self, name):
+        return self._index()[name]
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self):
+        return len(self._names)
+
+
+class _Bitmap(Sequence):
+    """0/1 flags read from a packed bitmap."""
+
+    def __init__(self, data: memoryview, size: int):
+        self._data = data
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        return (self._data[i >> 3] >> (i & 7)) & 1
+
+
+def save_binary(automata: Automata, filename: str):
+    """Write the automaton to `filename` in the binary container format."""
+    if not isinstance(automata, CompactAutomata):
+        automata = CompactAutomata.from_automata(automata)
+
+    n = automata.n_states
+    final = bytearray((n + 7) // 8)
+    for q in range(n):
+        if automata.final_flags[q]:
+            final[q >> 3] |= 1 << (q & 7)
+
+    state_offsets, state_data = _string_table(automata.states)
+    symbol_offsets, symbol_data = _string_table(automata.symbols)
+    sections = [
+        state_offsets,
+        state_data,
+        symbol_offsets,
+        symbol_data,
+        _to_le_bytes(automata.offsets, "q"),
+        _to_le_bytes(automata.targets, "i"),
+        bytes(final),
+        _to_le_bytes(automata.row_order, "q"),
+    ]
+
+    position = _HEADER.size
+    layout = []
+    for section in sections:
+        position += -position % 8
+        layout += [position, len(section)]
+        position += len(section)
+
+    epsilon_id = automata.epsilon_id
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        n,
+        automata.n_symbols,
+        automata.n_input_symbols,
+        -1 if epsilon_id is None else epsilon_id,
+        automata.initial,
+        *layout,
+    )
+
+    # Write next to the target and rename, so readers never see a partial file.
+    temporary = "{}.{}.tmp".format(filename, os.getpid())
+    with open(temporary, "wb") as file:
+        file.write(header)
+        for offset, section in zip(layout[::2], sections):
+            file.write(bytes(offset - file.tell()))
+            file.write(section)
+    os.replace(temporary, filename)
+
+
+def is_binary_file(filename: str) -> bool:
+    with open(filename, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+class MappedAutomata(CompactAutomata):
+    """
+    CompactAutomata whose arrays live in a memory-mapped binary container.
+
+    Use `MappedAutomata.open(filename)`; the instance is read-only and keeps
+    the mapping open until `close()` is called or it is garbage collected.
+    """
+
+    @classmethod
+    def open(cls, filename: str) -> "MappedAutomata":
+        with open(filename, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mapping) < _HEADER.size or mapping[: len(MAGIC)] != MAGIC:
+            mapping.close()
+            raise ValueError(f"{filename!r} is not a binary automata file")
+
+        self = cls.__new__(cls)
+        self._mapping = mapping
+        self._views = []
+        try:
+            self._map_sections(filename)
+        except (IndexError, TypeError) as e:
+            # Sections that do not fit their declared types or counts.
+            self.close()
+            raise ValueError(f"Corrupt binary automata file {filename!r}") from e
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def _view(self, view: memoryview) -> memoryview:
+        # Every view of the mapping is kept, so close() can release them all.
+        self._views.append(view)
+        return view
+
+    def _array(self, section: memoryview, typecode: str):
+        values = _from_le_bytes(section, typecode)
+        return self._view(values) if isinstance(values, memoryview) else values
+
+    def _map_sections(self, filename: str):
+        view = self._view(memoryview(self._mapping))
+        fields = _HEADER.unpack_from(view)
+        (
+            _magic,
+            version,
+            _flags,
+            n_states,
+            n_symbols,
+            n_input_symbols,
+            epsilon_id,
+            initial,
+        ) = fields[:8]
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary automata version {version}")
+
+        layout = fields[8:]
+        sections = {}
+        for name, offset, size in zip(_SECTIONS, layout[::2], layout[1::2]):
+            if offset < 0 or size < 0 or offset + size > len(view):
+                raise ValueError(f"Corrupt binary automata file {filename!r}")
+            sections[name] = self._view(view[offset : offset + size])
+
+        self.states = _StringTable(
+            self._array(sections["state_offsets"], "q"), sections["state_data"]
+        )
+        self.state_ids = _LazyIndex(self.states)
+        self.symbols = list(
+            _StringTable(
+                self._array(sections["symbol_offsets"], "q"),
+                sections["symbol_data"],
+            )
+        )
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.n_input_symbols = n_input_symbols
+        self.epsilon_id = None if epsilon_id < 0 else epsilon_id
+        self.epsilon = None if epsilon_id < 0 else self.symbols[epsilon_id]
+        self.initial = initial
+        self.a0 = self.states[initial]
+        self.final_flags = _Bitmap(sections["final"], n_states)
+        self.offsets = self._array(sections["offsets"], "q")
+        self.targets = self._array(sections["targets"], "i")
+        self.row_order = self._array(sections["row_order"], "q")
+        if len(self.offsets) != n_states * n_symbols + 1:
+            raise ValueError(f"Corrupt binary automata file {filename!r}")
+
+        self._init_views()
+
+    def close(self):
+        """Release the memory mapping; the instance is unusable afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mapping.close()
+
+
+def json_to_binary(json_filename: str, binary_filename: str):
+    """Convert an automata JSON file to the binary container format."""
+    save_binary(CompactAutomata.load_from_file(json_filename), binary_filename)
+
+
+def binary_to_json(binary_filename: str, json_filename: str):
+    """Convert a binary container back to the automata JSON format."""
+    automata = MappedAutomata.open(binary_filename)
+    try:
+        automata.save_to_file(json_filename)
+    finally:
+        automata.close()
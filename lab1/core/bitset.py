@@ -0,0 +1,20 @@
+"""
+Helpers for sets of interned state ids encoded as Python ints, where bit `i`
+is set if state id `i` is a member.
+"""
+
+
+def to_bits(ids) -> int:
+    """Encode an iterable of ids as a bitset."""
+    bits = 0
+    for i in ids:
+        bits |= 1 << i
+    return bits
+
+
+def iter_bits(bits: int):
+    """Yield the ids of the set bits in ascending order."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -0,0 +1,129 @@
+"""
+Content-addressed on-disk cache for conversion results.
+
+Entries are keyed by the SHA-256 of a canonical JSON encoding of the input
+automaton, so equal automata share an entry no matter how their sets and
+dicts happen to be ordered. Each entry is one `<key>.json` file holding the
+result in the regular Automata JSON format.
+
+Writes go to a unique temporary file that is renamed into place, so
+concurrent processes never observe partial entries. The modification time
+of an entry is its last use: hits touch the file, and when the directory
+grows past `max_bytes` the least recently used entries are removed.
+"""
+import hashlib
+import json
+import os
+import uuid
+
+from lab1.core.base import Automata
+
+# Bump when the cached results of the converters change.
+CACHE_VERSION = 1
+
+
+def canonical_json(automata: Automata) -> str:
+    """Encode the automaton as JSON that does not depend on iteration order."""
+
+    def ordered(values):
+        return sorted(values, key=json.dumps)
+
+    f = [[a, x, ordered(targets)] for (a, x), targets in automata.f.items() if targets]
+    return json.dumps(
+        {
+            "A": ordered(automata.A),
+            "X": ordered(automata.X),
+            "f": sorted(f, key=json.dumps),
+            "a0": automata.a0,
+            "F": ordered(automata.F),
+            "epsilon": automata.epsilon,
+        },
+        separators=(",", ":"),
+    )
+
+
+class ConversionCache:
+    """Size-limited LRU cache of conversion results in a local directory."""
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, automata: Automata, namespace: str = "enfa-to-nfa") -> str:
+        """Return the stable cache key of an input automaton."""
+        digest = hashlib.sha256()
+        digest.update("{}:v{}:".format(namespace, CACHE_VERSION).encode("utf-8"))
+        digest.update(canonical_json(automata).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key: str):
+        """Return the cached Automata for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r") as file:
+                automata = Automata.from_json(file.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except ValueError:
+            # A corrupt entry is dropped and treated as a miss.
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return automata
+
+    def put(self, key: str, automata: Automata):
+        """Store `automata` under `key` and evict entries beyond the size limit."""
+        path = self._path(key)
+        temporary = "{}.{}.{}.tmp".format(path, os.getpid(), uuid.uuid4().hex)
+        with open(temporary, "w") as file:
+            file.write(automata.to_json())
+        os.replace(temporary, path)
+        self._evict()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Another process evicted it first.
+            return False
+        return True
+
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if self._remove(path):
+                self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
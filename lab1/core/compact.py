@@ -0,0 +1,263 @@
+from array import array
+from collections.abc import Mapping, Set
+
+import numpy as np
+
+from lab1.core.base import Automata
+
+
+class _NameSetView(Set):
+    """Read-only set view over interned names, optionally filtered by a flag table."""
+
+    def __init__(self, names: list, ids: dict, flags: bytearray = None):
+        self._names = names
+        self._ids = ids
+        self._flags = flags
+
+    def __contains__(self, item):
+        i = self._ids.get(item)
+        return i is not None and (self._flags is None or bool(self._flags[i]))
+
+    def __iter__(self):
+        if self._flags is None:
+            return iter(self._names)
+        return (name for name, flag in zip(self._names, self._flags) if flag)
+
+    def __len__(self):
+        if self._flags is None:
+            return len(self._names)
+        return sum(self._flags)
+
+    def __repr__(self):
+        return repr(set(self))
+
+    @classmethod
+    def _from_iterable(cls, it):
+        # Results of &, | and - are plain sets.
+        return set(it)
+
+    def union(self, *others):
+        return set(self).union(*others)
+
+    def intersection(self, *others):
+        return set(self).intersection(*others)
+
+    def difference(self, *others):
+        return set(self).difference(*others)
+
+    def issubset(self, other):
+        return self <= set(other)
+
+
+class _TransitionView(Mapping):
+    """Read-only `(state, symbol) -> targets` view over the CSR transition arrays."""
+
+    def __init__(self, automata: "CompactAutomata"):
+        self._automata = automata
+
+    def __getitem__(self, key):
+        automata = self._automata
+        state, symbol = key
+        q = automata.state_ids.get(state)
+        x = automata.symbol_ids.get(symbol)
+        if q is None or x is None:
+            raise KeyError(key)
+        targets = automata.successors(q, x)
+        if not targets:
+            raise KeyError(key)
+        return frozenset(automata.states[t] for t in targets)
+
+    def __iter__(self):
+        automata = self._automata
+        k = automata.n_symbols
+        for row in automata.row_order:
+            q, x = divmod(row, k)
+            yield automata.states[q], automata.symbols[x]
+
+    def __len__(self):
+        return len(self._automata.row_order)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class CompactAutomata(Automata):
+    """
+    Automata backed by interned states and symbols and a CSR transition table.
+
+    States and symbols are mapped to dense ints (`states`/`state_ids`,
+    `symbols`/`symbol_ids`). The transitions of row `q * n_symbols + x` are
+    `targets[offsets[row]:offsets[row + 1]]`, sorted ascending. If `epsilon`
+    is set and not part of `X`, it gets the last symbol id. `row_order` lists
+    the non-empty rows in the order of the source `f`, so iterating `f`
+    reproduces that order.
+
+    The usual `A`, `X`, `f`, `a0`, `F` and `epsilon` attributes are exposed as
+    read-only views, so converters and the JSON I/O work unchanged.
+    """
+
+    def __init__(self, A, X, f, a0, F, epsilon=None):
+        self.states = sorted(A, key=str)
+        self.state_ids = {state: i for i, state in enumerate(self.states)}
+        self.symbols = sorted(X, key=str)
+        self.n_input_symbols = len(self.symbols)
+        if epsilon is not None and epsilon not in X:
+            self.symbols.append(epsilon)
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.epsilon = epsilon
+        self.epsilon_id = self.symbol_ids.get(epsilon) if epsilon is not None else None
+
+        if a0 not in self.state_ids:
+            raise ValueError(f"Start state {a0!r} is not in the set of states")
+        self.a0 = a0
+        self.initial = self.state_ids[a0]
+
+        self.final_flags = bytearray(len(self.states))
+        for state in F:
+            if state not in self.state_ids:
+                raise ValueError(f"Final state {state!r} is not in the set of states")
+            self.final_flags[self.state_ids[state]] = 1
+
+        # Encode every row first, then lay them out with a prefix sum.
+        k = len(self.symbols)
+        rows = {}
+        for (state, symbol), targets in f.items():
+            q = self.state_ids.get(state)
+            x = self.symbol_ids.get(symbol)
+            if q is None or x is None:
+                raise ValueError(
+                    f"Transition {(state, symbol)!r} uses an unknown state or symbol"
+                )
+            try:
+                encoded = sorted({self.state_ids[t] for t in targets})
+            except KeyError as e:
+                raise ValueError(
+                    f"Transition {(state, symbol)!r} targets unknown state {e.args[0]!r}"
+                ) from None
+            if encoded:
+                rows[q * k + x] = encoded
+
+        n_rows = len(self.states) * k
+        self.offsets = array("q", bytes(8 * (n_rows + 1)))
+        total = 0
+        for row in range(n_rows):
+            total += len(rows.get(row, ()))
+            self.offsets[row + 1] = total
+        self.targets = array("i", bytes(4 * total))
+        for row, encoded in rows.items():
+            self.targets[self.offsets[row] : self.offsets[row + 1]] = array(
+                "i", encoded
+            )
+
+        self.row_order = array("q", rows)
+        self._init_views()
+
+    def _init_views(self):
+        self._A_view = _NameSetView(self.states, self.state_ids)
+        self._X_view = _NameSetView(
+            self.symbols[: self.n_input_symbols], self.symbol_ids
+        )
+        self._F_view = _NameSetView(self.states, self.state_ids, self.final_flags)
+        self._f_view = _TransitionView(self)
+
+    @classmethod
+    def from_automata(cls, automata: Automata) -> "CompactAutomata":
+        """Build the compact representation of an existing Automata."""
+        return cls(
+            automata.A,
+            automata.X,
+            automata.f,
+            automata.a0,
+            automata.F,
+            automata.epsilon,
+        )
+
+    @classmethod
+    def from_table(
+        cls, states: list, symbols: list, table, initial: int, final_flags: bytearray
+    ) -> "CompactAutomata":
+        """
+        Build a complete DFA from a transition table given as a buffer of
+        int32 target ids, one per row `q * len(symbols) + x`, without going
+        through a transition dict.
+        """
+        self = cls.__new__(cls)
+        self.states = list(states)
+        self.state_ids = {state: i for i, state in enumerate(self.states)}
+        self.symbols = list(symbols)
+        self.n_input_symbols = len(self.symbols)
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.epsilon = None
+        self.epsilon_id = None
+        self.initial = initial
+        self.a0 = self.states[initial]
+        self.final_flags = bytearray(final_flags)
+
+        n_rows = len(self.states) * len(self.symbols)
+        self.targets = array("i")
+        self.targets.frombytes(memoryview(table).cast("B"))
+        if len(self.targets) != n_rows:
+            raise ValueError(
+                f"Expected {n_rows} table entries, got {len(self.targets)}"
+            )
+        # Every row holds exactly one target.
+        self.offsets = array("q")
+        self.offsets.frombytes(np.arange(n_rows + 1, dtype=np.int64).tobytes())
+        self.row_order = self.offsets[:-1]
+        self._init_views()
+        return self
+
+    def to_automata(self) -> Automata:
+        """Materialize a regular dict-and-set backed Automata."""
+        return Automata(
+            set(self.A),
+            set(self.X),
+            {key: set(targets) for key, targets in self.f.items()},
+            self.a0,
+            set(self.F),
+            self.epsilon,
+        )
+
+    @property
+    def A(self):
+        return self._A_view
+
+    @property
+    def X(self):
+        return self._X_view
+
+    @property
+    def F(self):
+        return self._F_view
+
+    @property
+    def f(self):
+        return self._f_view
+
+    @property
+    def n_states(self) -> int:
+        return len(self.states)
+
+    @property
+    def n_symbols(self) -> int:
+        return len(self.symbols)
+
+    def successors(self, q: int, x: int) -> array:
+        """Return the target state ids of state id `q` on symbol id `x`."""
+        row = q * len(self.symbols) + x
+        return self.targets[self.offsets[row] : self.offsets[row + 1]]
+
+    def is_final(self, q: int) -> bool:
+        return bool(self.final_flags[q])
+
+    def __eq__(self, other):
+        if not isinstance(other, Automata):
+            return NotImplemented
+        return (self.A, self.X, self.f, self.a0, self.F, self.epsilon) == (
+            other.A,
+            other.X,
+            other.f,
+            other.a0,
+            other.F,
+            other.epsilon,
+        )
@@ -1,4 +1,9 @@
 from lab1 import Automata
+from lab1.core.bitset import iter_bits, to_bits
+from lab1.core.cache import ConversionCache
+from lab1.core.compact import CompactAutomata
+from lab1.core.epsilon import epsilon_closures
+from lab1.core.trim import trim as trim_automata
 
 
 class ENFAToNFAConverter:
@@ -40,13 +45,72 @@ class ENFAToNFAConverter:
           if (a1, beta, a3) not in f' union f'' then add (a1, beta, a3) to W;
         od
     od
+
+    Engines:
+    --------
+    "worklist" (default) runs the algorithm above literally.
+
+    "closure" computes the same NFA from epsilon closures. Epsilon cycles are
+    collapsed into SCCs, the closure E(a) of every state is computed once as a
+    bitset over interned states, and the NFA is emitted in a single BFS from a0:
+      f'(a0, x) = union of E(a3) for a2 in E(a0), a3 in f(a2, x);
+      f'(a, x)  = union of E(a3) for a3 in f(a, x), for every other a in A';
+      F' = (F intersection A') union ({a0} if E(a0) intersects F).
+
+    Both engines produce the same NFA, so an optional `ConversionCache` is
+    shared between them: results are looked up by a hash of the canonical
+    input automaton before converting and stored afterwards.
+
+    With `trim=True` the ENFA is first trimmed (see `lab1.core.trim`): states
+    that are unreachable from a0 or cannot reach F are dropped before
+    conversion, and `trim_result` reports what was removed. The NFA accepts
+    the same language but has no dead states.
     """
 
-    def __init__(self, enfa: Automata):
+    ENGINES = ("worklist", "closure")
+
+    def __init__(
+        self,
+        enfa: Automata,
+        engine: str = "worklist",
+        cache: ConversionCache = None,
+        trim: bool = False,
+    ):
+        if engine not in self.ENGINES:
+            raise ValueError(
+                f"Unknown conversion engine {engine!r}, expected one of {self.ENGINES}"
+            )
         self.enfa = enfa
+        self.engine = engine
+        self.cache = cache
+        self.trim = trim
+        self.trim_result = None
 
     def convert_to_nfa(self) -> "Automata":
         """Convert the ENFA to an NFA."""
+        if self.trim:
+            self.trim_result = trim_automata(self.enfa)
+            return ENFAToNFAConverter(
+                self.trim_result.automata, self.engine, self.cache
+            ).convert_to_nfa()
+
+        if self.cache is not None:
+            key = self.cache.key(self.enfa)
+            nfa = self.cache.get(key)
+            if nfa is not None:
+                return nfa
+
+        if self.engine == "closure":
+            nfa = self._convert_with_closures()
+        else:
+            nfa = self._convert_with_worklist()
+
+        if self.cache is not None:
+            self.cache.put(key, nfa)
+        return nfa
+
+    def _convert_with_worklist(self) -> "Automata":
+        """Convert the ENFA to an NFA with the worklist algorithm."""
         # Initialize the starting state of the NFA.
         a0_prime = self.enfa.a0
         A_prime = {a0_prime}
@@ -112,3 +176,53 @@ class ENFAToNFAConverter:
         return Automata(
             A_prime, self.enfa.X, f_prime_dict, a0_prime, F_prime, self.enfa.epsilon
         )
+
+    def _convert_with_closures(self) -> "Automata":
+        """Convert the ENFA to an NFA using precomputed epsilon closures."""
+        enfa = self.enfa
+        if not isinstance(enfa, CompactAutomata):
+            enfa = CompactAutomata.from_automata(enfa)
+
+        closures = epsilon_closures(enfa)
+        symbols = [x for x in range(enfa.n_input_symbols) if x != enfa.epsilon_id]
+
+        def closure_step(states, x):
+            # Union of the closures of all x-successors of the given states.
+            bits = 0
+            for a in states:
+                for a3 in enfa.successors(a, x):
+                    bits |= closures[a3]
+            return bits
+
+        a0 = enfa.initial
+        a0_closure = list(iter_bits(closures[a0]))
+
+        seen = bytearray(enfa.n_states)
+        seen[a0] = 1
+        queue = [a0]
+        f_prime_dict = {}
+
+        # Emit the NFA in one BFS over the states it can reach.
+        for a in queue:
+            sources = a0_closure if a == a0 else (a,)
+            for x in symbols:
+                bits = closure_step(sources, x)
+                if not bits:
+                    continue
+                targets = set()
+                for b in iter_bits(bits):
+                    targets.add(enfa.states[b])
+                    if not seen[b]:
+                        seen[b] = 1
+                        queue.append(b)
+                f_prime_dict[(enfa.states[a], enfa.symbols[x])] = targets
+
+        A_prime = {enfa.states[a] for a in queue}
+        F_prime = {enfa.states[a] for a in queue if enfa.final_flags[a]}
+        final_bits = to_bits(a for a in range(enfa.n_states) if enfa.final_flags[a])
+        if closures[a0] & final_bits:
+            F_prime.add(enfa.a0)
+
+        return Automata(
+            A_prime, set(enfa.X), f_prime_dict, enfa.a0, F_prime, enfa.epsilon
+        )
@@ -0,0 +1,296 @@
+from lab1.core.base import Automata
+from lab1.core.bitset import iter_bits
+from lab1.core.compact import CompactAutomata
+from lab1.core.epsilon import epsilon_closures
+
+
+class IncrementalENFAToNFAConverter:
+    """
+    ENFA to NFA converter that keeps its result up to date under edits.
+
+    It produces the same NFA as `ENFAToNFAConverter`, using the closure
+    formulation of that converter:
+      f'(a0, x) = union of row(a2, x) for a2 in E(a0);
+      f'(a, x)  = row(a, x) = union of E(a3) for a3 in f(a, x);
+      F' = (F intersection A') union ({a0} if E(a0) intersects F),
+    where A' are the states reachable from a0 under f'.
+
+    Bookkeeping:
+    ------------
+    - E(a), the epsilon closure of every state, with the epsilon graph and its
+      reverse, so the states whose closure contains a given state are found
+      by a backward search.
+    - row(a, x) for every state, computed on first use and cached, with a
+      reverse index from each target a3 to the rows (a, x) reading E(a3).
+    - The NFA itself (A', f' and F'), built by the first `convert_to_nfa()`
+      call, with the rows invalidated since the last call.
+
+    Adding an epsilon edge a -> b extends E(q) by E(b) for every q whose
+    closure contains a. Removing one recomputes only those closures, reusing
+    the closures of all other states. Rows are invalidated when their own
+    transitions change or when the closure of one of their targets changes.
+
+    `convert_to_nfa()` patches the NFA in place: only the invalidated rows of
+    states in A' (and the rows of a0 that read them) are recomputed. States
+    that become reachable are added with a search from the new targets; if a
+    row lost targets, one pass over f' from a0 drops the states that are no
+    longer reachable.
+    """
+
+    def __init__(self, enfa: Automata):
+        self.A = set(enfa.A)
+        self.X = set(enfa.X)
+        self.a0 = enfa.a0
+        self.F = set(enfa.F)
+        self.epsilon = enfa.epsilon
+
+        self.f = {}
+        self._eps_succ = {}
+        self._eps_pred = {}
+        self._readers = {}
+        for (a, x), targets in enfa.f.items():
+            for b in targets:
+                self._add_edge(a, x, b)
+
+        compact = CompactAutomata(self.A, self.X, self.f, self.a0, self.F, self.epsilon)
+        self._closure = {
+            compact.states[q]: frozenset(compact.states[r] for r in iter_bits(bits))
+            for q, bits in enumerate(epsilon_closures(compact))
+        }
+        self._rows = {}
+        self._nfa = None
+        self._dirty = set()
+        self._start_changed = False
+
+    @property
+    def enfa(self) -> Automata:
+        """The current ENFA as a regular Automata."""
+        return Automata(
+            set(self.A),
+            set(self.X),
+            {key: set(targets) for key, targets in self.f.items() if targets},
+            self.a0,
+            set(self.F),
+            self.epsilon,
+        )
+
+    def _add_edge(self, a, x, b):
+        self.f.setdefault((a, x), set()).add(b)
+        if x == self.epsilon:
+            self._eps_succ.setdefault(a, set()).add(b)
+            self._eps_pred.setdefault(b, set()).add(a)
+        else:
+            self._readers.setdefault(b, set()).add((a, x))
+
+    def _remove_edge(self, a, x, b):
+        self.f[(a, x)].discard(b)
+        if x == self.epsilon:
+            self._eps_succ[a].discard(b)
+            self._eps_pred[b].discard(a)
+        elif b not in self.f[(a, x)]:
+            self._readers[b].discard((a, x))
+
+    def _check_transition(self, a, x, b):
+        if x != self.epsilon and x not in self.X:
+            raise ValueError(f"Symbol {x!r} is not in the alphabet")
+        for state in (a, b):
+            if state not in self.A:
+                self.A.add(state)
+                self._closure[state] = frozenset({state})
+
+    def _closure_holders(self, a) -> set:
+        """States whose epsilon closure contains `a`."""
+        holders = {a}
+        stack = [a]
+        while stack:
+            for p in self._eps_pred.get(stack.pop(), ()):
+                if p not in holders:
+                    holders.add(p)
+                    stack.append(p)
+        return holders
+
+    def _invalidate_row(self, row):
+        self._rows.pop(row, None)
+        self._dirty.add(row)
+
+    def _closures_changed(self, states):
+        if self.a0 in states:
+            self._start_changed = True
+        for state in states:
+            for row in self._readers.get(state, ()):
+                self._invalidate_row(row)
+
+    def add_transition(self, a, x, b):
+        """Add the transition (a, x, b) and update the affected closures."""
+        self._check_transition(a, x, b)
+        if b in self.f.get((a, x), ()):
+            return
+
+        if x != self.epsilon:
+            self._add_edge(a, x, b)
+            self._invalidate_row((a, x))
+            return
+
+        holders = self._closure_holders(a)
+        self._add_edge(a, x, b)
+        extra = self._closure[b]
+        changed = []
+        for q in holders:
+            if not extra <= self._closure[q]:
+                self._closure[q] = self._closure[q] | extra
+                changed.append(q)
+        self._closures_changed(changed)
+
+    def remove_transition(self, a, x, b):
+        """Remove the transition (a, x, b) and update the affected closures."""
+        if b not in self.f.get((a, x), ()):
+            raise ValueError(f"Transition {(a, x, b)!r} does not exist")
+
+        if x != self.epsilon:
+            self._remove_edge(a, x, b)
+            self._invalidate_row((a, x))
+            return
+
+        holders = self._closure_holders(a)
+        self._remove_edge(a, x, b)
+
+        # Closures of states outside `holders` never contained a, so they
+        # are still valid and the search can stop there.
+        changed = []
+        closures = {}
+        for q in holders:
+            closure = {q}
+            stack = [q]
+            while stack:
+                for r in self._eps_succ.get(stack.pop(), ()):
+                    if r in closure:
+                        continue
+                    if r in holders:
+                        closure.add(r)
+                        stack.append(r)
+                    else:
+                        closure |= self._closure[r]
+            closures[q] = frozenset(closure)
+        for q, closure in closures.items():
+            if closure != self._closure[q]:
+                self._closure[q] = closure
+                changed.append(q)
+        self._closures_changed(changed)
+
+    def _row(self, a, x) -> frozenset:
+        row = self._rows.get((a, x))
+        if row is None:
+            row = frozenset().union(
+                *(self._closure[a3] for a3 in self.f.get((a, x), ()))
+            )
+            self._rows[(a, x)] = row
+        return row
+
+    def _start_row(self, x) -> frozenset:
+        return frozenset().union(*(self._row(a2, x) for a2 in self._closure[self.a0]))
+
+    def convert_to_nfa(self) -> Automata:
+        """
+        Return the NFA equivalent of the current ENFA. The same Automata is
+        returned by every call and patched in place to reflect the edits made
+        since the previous one; treat it as read-only.
+        """
+        if self._nfa is None:
+            self._nfa = self._build()
+        elif self._dirty or self._start_changed:
+            self._refresh()
+        return self._nfa
+
+    def _build(self) -> Automata:
+        a0 = self.a0
+        start_rows = {x: self._start_row(x) for x in self.X}
+        self._dirty = set()
+        self._start_changed = False
+
+        seen = {a0}
+        queue = [a0]
+        f_prime = {}
+        for a in queue:
+            for x in self.X:
+                targets = start_rows[x] if a == a0 else self._row(a, x)
+                if not targets:
+                    continue
+                f_prime[(a, x)] = set(targets)
+                for b in targets:
+                    if b not in seen:
+                        seen.add(b)
+                        queue.append(b)
+
+        F_prime = self.F & seen
+        if self._closure[a0] & self.F:
+            F_prime.add(a0)
+        return Automata(seen, set(self.X), f_prime, a0, F_prime, self.epsilon)
+
+    def _refresh(self):
+        nfa, a0 = self._nfa, self.a0
+        dirty, self._dirty = self._dirty, set()
+        if self._start_changed:
+            start_symbols = self.X
+        else:
+            start_symbols = {x for a, x in dirty if a in self._closure[a0]}
+        self._start_changed = False
+
+        updates = [
+            ((a, x), self._row(a, x)) for a, x in dirty if a != a0 and a in nfa.A
+        ]
+        updates += [((a0, x), self._start_row(x)) for x in start_symbols]
+        added, shrunk = [], False
+        for key, targets in updates:
+            old = nfa.f.get(key, frozenset())
+            if targets == old:
+                continue
+            shrunk = shrunk or not targets >= old
+            added.extend(b for b in targets if b not in nfa.A)
+            if targets:
+                nfa.f[key] = set(targets)
+            else:
+                del nfa.f[key]
+
+        self._add_reachable(added)
+        if shrunk:
+            self._drop_unreachable()
+        if self._closure[a0].isdisjoint(self.F):
+            nfa.F.discard(a0)
+        else:
+            nfa.F.add(a0)
+
+    def _add_reachable(self, states):
+        """Add `states` to A' with every state newly reachable from them."""
+        nfa = self._nfa
+        queue = [b for b in dict.fromkeys(states) if b not in nfa.A]
+        nfa.A.update(queue)
+        for a in queue:
+            if a in self.F:
+                nfa.F.add(a)
+            for x in self.X:
+                targets = self._row(a, x)
+                if not targets:
+                    continue
+                nfa.f[(a, x)] = set(targets)
+                for b in targets:
+                    if b not in nfa.A:
+                        nfa.A.add(b)
+                        queue.append(b)
+
+    def _drop_unreachable(self):
+        """Remove the states no longer reachable from a0 under f' from the NFA."""
+        nfa = self._nfa
+        seen = {self.a0}
+        stack = [self.a0]
+        while stack:
+            a = stack.pop()
+            for x in self.X:
+                for b in nfa.f.get((a, x), ()):
+                    if b not in seen:
+                        seen.add(b)
+                        stack.append(b)
+        for a in nfa.A - seen:
+            nfa.A.discard(a)
+            nfa.F.discard(a)
+            for x in self.X:
+                nfa.f.pop((a, x), None)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from lab1.core.compact import CompactAutomata
+
+
+class KeywordsToDFAConverter:
+    """
+    Converter from a set of keywords to the Aho-Corasick automaton, as a
+    complete Deterministic Finite Automaton (DFA) over the keyword symbols.
+
+    The DFA accepts every word that ends with one of the keywords, so in a
+    run over a text it is in a final state exactly at the end offsets of
+    keyword occurrences.
+
+    Algorithm:
+    ----------
+    1. Insert the keywords into a trie. State 0 is the root, and state ids are
+       given in creation order. Edges are kept in one dict keyed by
+       `state * k + symbol id`.
+    2. Visit the trie level by level. The failure link of a state s reached
+       from parent p on x is delta(fail(p), x), or the root if p is the root.
+       Its row of delta is the trie row of s, with the missing entries taken
+       from the row of fail(s). fail(s) is always on an earlier level, so its
+       row is already complete. Each level is a handful of NumPy gathers.
+    3. A state is final if a keyword ends there or at its failure link.
+
+    Building the trie is linear in the total keyword length. Resolving delta
+    adds one table row of k entries per state, where k is the alphabet size.
+    The result is a `CompactAutomata` built straight from that table, with
+    the int states 0..n-1. It can be saved, loaded and visualized like any
+    other automaton.
+
+    Keywords are strs (one symbol per character) or sequences of symbols. The
+    alphabet is the given `alphabet` plus every keyword symbol. `accept_labels`
+    maps every final state to the label of the longest keyword ending there:
+    its index, or its key if `keywords` is a dict. If a keyword is listed
+    twice, the first label is kept. `failure_links` holds fail(s) for every
+    state.
+    """
+
+    def __init__(self, keywords, alphabet=None):
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        if isinstance(keywords, dict):
+            self.keywords = list(keywords.items())
+        else:
+            self.keywords = list(enumerate(keywords))
+        self.alphabet = set(alphabet) if alphabet is not None else set()
+        self.accept_labels = {}
+        self.failure_links = None
+
+    def convert_to_dfa(self) -> CompactAutomata:
+        """Build the Aho-Corasick DFA with start state 0."""
+        symbols = set(self.alphabet)
+        for _, keyword in self.keywords:
+            symbols.update(keyword)
+        symbols = sorted(symbols, key=str)
+        symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        k = len(symbols)
+
+        # Trie
+        children = {}
+        parent = [0]
+        symbol_of = [0]
+        depth = [0]
+        keyword_of = {}
+        for index, (_, keyword) in enumerate(self.keywords):
+            s = 0
+            for symbol in keyword:
+                x = symbol_ids[symbol]
+                child = children.get(s * k + x)
+                if child is None:
+                    child = children[s * k + x] = len(parent)
+                    parent.append(s)
+                    symbol_of.append(x)
+                    depth.append(depth[s] + 1)
+                s = child
+            keyword_of.setdefault(s, index)
+
+        n = len(parent)
+        parent = np.array(parent, dtype=np.intp)
+        symbol_of = np.array(symbol_of, dtype=np.intp)
+        depth = np.array(depth, dtype=np.intp)
+        label = np.full(n, -1, dtype=np.intp)
+        if keyword_of:
+            label[list(keyword_of)] = list(keyword_of.values())
+
+        delta = np.full((n, max(k, 1)), -1, dtype=np.int32)
+        delta[parent[1:], symbol_of[1:]] = np.arange(1, n, dtype=np.int32)
+        delta[0][delta[0] < 0] = 0
+        fail = np.zeros(n, dtype=np.intp)
+
+        # Failure links and delta, level by level
+        order = np.argsort(depth, kind="stable")
+        bounds = np.searchsorted(depth[order], np.arange(depth.max() + 2))
+        for start, end in zip(bounds[1:-1], bounds[2:]):
+            level = order[start:end]
+            p = parent[level]
+            fail[level] = np.where(p == 0, 0, delta[fail[p], symbol_of[level]])
+            rows = delta[level]
+            missing = rows < 0
+            rows[missing] = delta[fail[level]][missing]
+            delta[level] = rows
+            own = label[level]
+            label[level] = np.where(own >= 0, own, label[fail[level]])
+
+        final = label >= 0
+        names = [name for name, _ in self.keywords]
+        self.accept_labels = {
+            int(s): names[i] for s, i in zip(np.flatnonzero(final), label[final])
+        }
+        self.failure_links = fail
+        return CompactAutomata.from_table(
+            range(n), symbols, delta[:, :k].copy(), 0, final.astype(np.uint8)
+        )
@@ -0,0 +1,161 @@
+from array import array
+
+from lab1.core.base import Automata
+from lab1.core.compact import CompactAutomata
+from lab1.core.partition import refine_partition
+
+
+class DFAMinimizer:
+    """
+    Minimizer for Deterministic Finite Automata (DFA) using Hopcroft's
+    partition refinement in O(k * n log n) time and O(k * n) memory.
+
+    Algorithm:
+    ----------
+    1. Keep only the states reachable from a0 and add a virtual sink state
+       that receives every missing transition, so the DFA is complete.
+    2. Start from the partition {F, A \\ F} and put the smaller block, paired
+       with every symbol, on the waiting list W.
+    3. Pop a splitter (B, x) from W, mark every state with an x-transition
+       into B, and split each block into its marked and unmarked part.
+       For every symbol y, if (C, y) is waiting then both halves are waiting,
+       otherwise only the smaller half is added.
+    4. The blocks of the final partition are the states of the minimal DFA.
+
+    All state sets live in flat int arrays (a refinable partition plus the
+    inverse transition table in CSR form, see `lab1.core.partition`), so no
+    pairwise table is built.
+
+    If `complete` is False, the block of the sink state (states that can
+    never reach F) is dropped and the result is the minimal partial DFA.
+    Otherwise the sink block is kept whenever it is reachable, and it is
+    named "sink" unless it contains one of the original states.
+
+    After `minimize()`, `removed_states` holds the number of original states
+    that were merged away or dropped, and `state_map` maps every reachable
+    original state to its state in the minimal DFA.
+    """
+
+    def __init__(self, dfa: Automata, complete: bool = False):
+        self.dfa = dfa
+        self.complete = complete
+        self.removed_states = 0
+        self.state_map = {}
+
+    def minimize(self) -> Automata:
+        """Return the minimal DFA accepting the same language."""
+        dfa = self.dfa
+        if not isinstance(dfa, CompactAutomata):
+            dfa = CompactAutomata.from_automata(dfa)
+
+        symbols = [x for x in range(dfa.n_input_symbols) if x != dfa.epsilon_id]
+        k = len(symbols)
+
+        # Number the reachable states densely; the sink gets the last id.
+        order, delta, missing = self._reachable_transitions(dfa, symbols)
+        blocks = self._initial_blocks(dfa, order)
+        blk = refine_partition(delta, len(order) + 1, k, blocks)
+        return self._build_result(dfa, symbols, order, delta, missing, blk)
+
+    @staticmethod
+    def _initial_blocks(dfa: CompactAutomata, order: list) -> list:
+        """
+        Return the partition {F, A \\ F} of the reachable states. The sink
+        (the last id) starts among the non-final states.
+        """
+        n = len(order) + 1
+        finals = [q for q in range(n - 1) if dfa.final_flags[order[q]]]
+        others = [q for q in range(n - 1) if not dfa.final_flags[order[q]]]
+        others.append(n - 1)
+        return [finals, others]
+
+    @staticmethod
+    def _reachable_transitions(dfa: CompactAutomata, symbols: list):
+        """Return reachable states, the completed transition table and a missing flag."""
+        if dfa.epsilon_id is not None:
+            for q in range(dfa.n_states):
+                if len(dfa.successors(q, dfa.epsilon_id)):
+                    raise ValueError("A DFA must not contain epsilon transitions")
+
+        dense = {dfa.initial: 0}
+        order = [dfa.initial]
+        rows = []
+        for q in order:
+            for x in symbols:
+                targets = dfa.successors(q, x)
+                if len(targets) > 1:
+                    raise ValueError(
+                        f"State {dfa.states[q]!r} has several transitions on "
+                        f"{dfa.symbols[x]!r}, the automaton is not deterministic"
+                    )
+                if not targets:
+                    rows.append(-1)
+                    continue
+                t = targets[0]
+                if t not in dense:
+                    dense[t] = len(order)
+                    order.append(t)
+                rows.append(dense[t])
+
+        sink = len(order)
+        missing = -1 in rows
+        delta = array("i", (sink if t == -1 else t for t in rows))
+        delta.extend([sink] * len(symbols))
+        return order, delta, missing
+
+    def _build_result(self, dfa, symbols, order, delta, missing, blk):
+        n = len(order) + 1
+        sink = n - 1
+        k = len(symbols)
+
+        # Represent each block by its member with the smallest interned id.
+        representative = {}
+        for q in range(n - 1):
+            b = blk[q]
+            if b not in representative or order[q] < order[representative[b]]:
+                representative[b] = q
+
+        sink_block = blk[sink]
+        start_block = blk[0]
+        keep_sink = sink_block == start_block or (
+            self.complete and (missing or sink_block in representative)
+        )
+        sink_edges = self.complete and keep_sink
+
+        names = {b: dfa.states[order[q]] for b, q in representative.items()}
+        if sink_block not in names:
+            name = "sink"
+            while name in dfa.state_ids:
+                name += "'"
+            names[sink_block] = name
+
+        kept = [b for b in names if b != sink_block or keep_sink]
+        f = {}
+        for b in kept:
+            q = representative.get(b, sink)
+            for i, x in enumerate(symbols):
+                target = blk[delta[q * k + i]]
+                if target == sink_block and not sink_edges:
+                    continue
+                f[(names[b], dfa.symbols[x])] = {names[target]}
+
+        F = {
+            names[b]
+            for b in kept
+            if b in representative and dfa.final_flags[order[representative[b]]]
+        }
+        self.state_map = {
+            dfa.states[order[q]]: names[blk[q]]
+            for q in range(n - 1)
+            if blk[q] != sink_block or keep_sink
+        }
+        self.removed_states = dfa.n_states - sum(1 for b in kept if b in representative)
+
+        return Automata(
+            {names[b] for b in kept},
+            set(dfa.X),
+            f,
+            names[start_block],
+            F,
+            dfa.epsilon,
+        )
@@ -0,0 +1,114 @@
+from lab1.core.base import Automata
+from lab1.core.bitset import iter_bits, to_bits
+from lab1.core.compact import CompactAutomata
+from lab1.core.epsilon import epsilon_closures
+from lab1.core.trim import trim as trim_automata
+
+
+class NFAToDFAConverter:
+    """
+    Converter from Nondeterministic Finite Automata (NFA) to Deterministic
+    Finite Automata (DFA) by subset construction.
+
+    Algorithm:
+    ----------
+    1. Intern the NFA states to dense ids; a subset of NFA states is a bitset.
+    2. The start subset is {a0} (its epsilon closure if the input is an ENFA).
+    3. For every subset S and symbol x, the successor subset is the union of
+       f(a, x) over a in S (closed under epsilon moves). The per-state rows
+       f(a, x) are cached as bitsets, so a step is a union of ints.
+    4. Subsets are hash-consed: each distinct bitset gets one DFA state id.
+    5. A subset is final if it intersects F.
+
+    In on-demand mode (the default) only subsets reachable from a0 are ever
+    created. Otherwise every non-empty subset of A becomes a DFA state, which
+    is exponential in |A|.
+
+    The empty subset is not materialized, so the resulting DFA may be partial.
+    DFA states are named after their subsets, e.g. "{0, 2}", and
+    `subset_of` maps each DFA state back to its NFA states.
+
+    With `trim=True` the NFA is trimmed first (see `lab1.core.trim`), so no
+    subset contains dead states; `trim_result` reports what was removed.
+    """
+
+    def __init__(self, nfa: Automata, on_demand: bool = True, trim: bool = False):
+        self.nfa = nfa
+        self.on_demand = on_demand
+        self.trim = trim
+        self.trim_result = None
+        self.subset_of = {}
+
+    def convert_to_dfa(self) -> Automata:
+        """Convert the NFA to a DFA."""
+        nfa = self.nfa
+        if self.trim:
+            self.trim_result = trim_automata(nfa)
+            nfa = self.trim_result.automata
+        if not isinstance(nfa, CompactAutomata):
+            nfa = CompactAutomata.from_automata(nfa)
+
+        closures = epsilon_closures(nfa) if nfa.epsilon_id is not None else None
+        symbols = [x for x in range(nfa.n_input_symbols) if x != nfa.epsilon_id]
+        k = nfa.n_symbols
+        rows = {}
+
+        def row_bits(a, x):
+            # Successors of a single NFA state as a (closed) bitset.
+            row = a * k + x
+            bits = rows.get(row)
+            if bits is None:
+                bits = 0
+                for b in nfa.successors(a, x):
+                    bits |= closures[b] if closures is not None else 1 << b
+                rows[row] = bits
+            return bits
+
+        start = closures[nfa.initial] if closures is not None else 1 << nfa.initial
+        ids = {start: 0}
+        subsets = [start]
+        if not self.on_demand:
+            for bits in range(1, 1 << nfa.n_states):
+                if bits not in ids:
+                    ids[bits] = len(subsets)
+                    subsets.append(bits)
+
+        transitions = []
+        for i, subset in enumerate(subsets):
+            members = list(iter_bits(subset))
+            for x in symbols:
+                bits = 0
+                for a in members:
+                    bits |= row_bits(a, x)
+                if not bits:
+                    continue
+                j = ids.get(bits)
+                if j is None:
+                    j = ids[bits] = len(subsets)
+                    subsets.append(bits)
+                transitions.append((i, x, j))
+
+        names = [self._subset_name(nfa, bits) for bits in subsets]
+        final_bits = to_bits(a for a in range(nfa.n_states) if nfa.final_flags[a])
+
+        f = {}
+        for i, x, j in transitions:
+            f[(names[i], nfa.symbols[x])] = {names[j]}
+
+        self.subset_of = {
+            name: frozenset(nfa.states[a] for a in iter_bits(bits))
+            for name, bits in zip(names, subsets)
+        }
+
+        return Automata(
+            set(names),
+            set(nfa.X),
+            f,
+            names[0],
+            {name for name, bits in zip(names, subsets) if bits & final_bits},
+            nfa.epsilon,
+        )
+
+    @staticmethod
+    def _subset_name(nfa: CompactAutomata, bits: int) -> str:
+        return "{" + ", ".join(str(nfa.states[a]) for a in iter_bits(bits)) + "}"
@@ -0,0 +1,382 @@
+import re
+from functools import lru_cache
+
+from lab1.core.base import Automata
+from lab1.core.tracked import Changes, TrackedDict, TrackedSet
+
+# Characters with a meaning in patterns; anything else is a literal symbol.
+_SPECIAL = re.compile(r"[\\.\[\]()|*+?{}]")
+
+# One token per match. The outer named groups close last, so `lastgroup`
+# names the kind of token.
+_TOKENS = re.compile(
+    r"(?P<text>[^\\.\[\]()|*+?{}]+)"
+    r"|(?P<escape>\\(?P<escaped>.))"
+    r"|(?P<klass>\[(?P<negated>\^?)(?P<body>\]?(?:\\.|[^\]\\])*)\])"
+    r"|(?P<repeat>\{(?P<low>\d+)(?P<comma>,(?P<high>\d*))?\})"
+    r"|(?P<op>.)",
+    re.S,
+)
+_QUANTIFIERS = {"*": "star", "+": "plus", "?": "opt"}
+_OP_ERRORS = {
+    "[": "Unbalanced '['",
+    "{": "Malformed repetition",
+    "\\": "Dangling escape",
+}
+
+
+def _error(pattern: str, pos: int, message: str) -> ValueError:
+    return ValueError(f"{message} at position {pos} in pattern {pattern!r}")
+
+
+@lru_cache(maxsize=4096)
+def _class_symbols(body: str) -> tuple:
+    """Sorted symbols of a class body such as "a-z_" (without the brackets)."""
+    chars = []
+    escaped = False
+    for c in body:
+        if escaped or c != "\\":
+            chars.append((c, escaped))
+            escaped = False
+        else:
+            escaped = True
+    symbols = set()
+    i = 0
+    while i < len(chars):
+        c = chars[i][0]
+        if i + 2 < len(chars) and chars[i + 1] == ("-", False):
+            end = chars[i + 2][0]
+            if end < c:
+                raise ValueError(f"Reversed class range {c}-{end}")
+            symbols.update(chr(code) for code in range(ord(c), ord(end) + 1))
+            i += 3
+        else:
+            symbols.add(c)
+            i += 1
+    return tuple(sorted(symbols))
+
+
+def _sequence(items: list) -> tuple:
+    if not items:
+        return ("empty",)
+    return items[0] if len(items) == 1 else ("cat", items)
+
+
+def _alternatives(branches: list, items: list) -> tuple:
+    branches.append(_sequence(items))
+    return branches[0] if len(branches) == 1 else ("alt", branches)
+
+
+def _class_node(pattern: str, match) -> tuple:
+    try:
+        symbols = _class_symbols(match.group("body"))
+    except ValueError as e:
+        raise _error(pattern, match.start(), str(e)) from None
+    if not symbols:
+        raise _error(pattern, match.start(), "Empty class")
+    return ("class", symbols, bool(match.group("negated")))
+
+
+def _quantified(pattern: str, match, node: tuple) -> tuple:
+    if match.lastgroup == "op":
+        return (_QUANTIFIERS[match.group("op")], node)
+    low = int(match.group("low"))
+    if match.group("comma") is None:
+        high = low
+    else:
+        high = int(match.group("high")) if match.group("high") else None
+    if high is not None and high < low:
+        raise _error(pattern, match.start(), "Empty repetition range")
+    return ("rep", node, low, high)
+
+
+def _parse(pattern: str) -> tuple:
+    """Return the AST of a pattern and the set of symbols written in it."""
+    symbols = set()
+    groups = []  # Enclosing groups as (branches, items, position)
+    branches, items = [], []
+    for match in _TOKENS.finditer(pattern):
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == "text":
+            symbols.update(token)
+            items.append(("str", token))
+        elif kind == "escape":
+            symbols.add(token[1])
+            items.append(("str", token[1]))
+        elif kind == "klass":
+            node = _class_node(pattern, match)
+            symbols.update(node[1])
+            items.append(node)
+        elif kind == "repeat" or token in _QUANTIFIERS:
+            if not items:
+                raise _error(pattern, match.start(), "Nothing to repeat")
+            node = items.pop()
+            if node[0] == "str" and len(node[1]) > 1:
+                # A quantifier applies to the last symbol of a run only.
+                items.append(("str", node[1][:-1]))
+                node = ("str", node[1][-1])
+            items.append(_quantified(pattern, match, node))
+        elif token == "(":
+            groups.append((branches, items, match.start()))
+            branches, items = [], []
+        elif token == ")":
+            if not groups:
+                raise _error(pattern, match.start(), "Unbalanced ')'")
+            node = _alternatives(branches, items)
+            if node[0] == "str" and len(node[1]) > 1:
+                # Keep "(ab)*" from being read as "a(b)*".
+                node = ("cat", [node])
+            branches, items, _ = groups.pop()
+            items.append(node)
+        elif token == "|":
+            branches.append(_sequence(items))
+            items = []
+        elif token == ".":
+            items.append(("any",))
+        else:
+            message = _OP_ERRORS.get(token, f"Unexpected {token!r}")
+            raise _error(pattern, match.start(), message)
+
+    if groups:
+        raise _error(pattern, groups[-1][2], "Unbalanced '('")
+    return _alternatives(branches, items), symbols
+
+
+def parse_regex(pattern: str) -> tuple:
+    """
+    Parse a pattern into a tuple AST:
+      ("str", text), ("class", symbols, negated), ("any",), ("empty",),
+      ("cat", nodes), ("alt", nodes), ("star", node), ("plus", node),
+      ("opt", node), ("rep", node, low, high) with high None if unbounded.
+    """
+    return _parse(pattern)[0]
+
+
+class RegexToENFAConverter:
+    """
+    Converter from regular expressions to one combined Epsilon-Nondeterministic
+    Finite Automaton (ENFA) by Thompson's construction.
+
+    Syntax:
+    -------
+    Symbols are single characters. Supported are concatenation, `|`, `*`,
+    `+`, `?`, `{m}`, `{m,}`, `{m,n}`, groups `( )`, `.` (any symbol of the
+    alphabet), classes `[abc]`, `[a-z]`, `[^...]` (complement within the
+    alphabet) and `\\` escapes. The alphabet is the given `alphabet`, or else
+    every symbol written in any of the patterns.
+
+    Construction:
+    -------------
+    Every node is compiled from an existing state `s` and returns its end
+    state. Edges are only ever added out of `s` and into fresh states, so:
+      - a symbol adds one state, and concatenation continues from the end of
+        the previous part without a connecting epsilon edge;
+      - `n*` adds a loop state l with s -eps-> l, compiles n from l and links
+        its end back to l; l is also the end;
+      - `n?` and bounded repetitions add epsilon skips to the end state (to a
+        fresh one if the end is a loop state);
+      - every pattern is compiled directly from the shared start state 0.
+    Since nothing ever enters state 0 or the states of another pattern, runs
+    of different patterns never mix. States are the ints 0..n-1 in creation
+    order, and the end state of each pattern is final.
+
+    `accept_labels` maps every final state to the label of its pattern (the
+    pattern index, or the key if `patterns` is a dict).
+    """
+
+    def __init__(self, patterns, alphabet=None, epsilon: str = "epsilon"):
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if isinstance(patterns, dict):
+            self.patterns = list(patterns.items())
+        else:
+            self.patterns = list(enumerate(patterns))
+        self.alphabet = set(alphabet) if alphabet is not None else None
+        self.epsilon = epsilon
+        self.accept_labels = {}
+
+    def convert_to_enfa(self) -> Automata:
+        """Compile the patterns into one ENFA with start state 0."""
+        parsed = []
+        literals = set()
+        for label, pattern in self.patterns:
+            if _SPECIAL.search(pattern) is None:
+                literals.update(pattern)
+                parsed.append((label, ("str", pattern) if pattern else ("empty",)))
+            else:
+                node, symbols = _parse(pattern)
+                parsed.append((label, node))
+                literals |= symbols
+
+        alphabet = self.alphabet if self.alphabet is not None else literals
+        if self.epsilon in alphabet:
+            raise ValueError(
+                f"Epsilon symbol {self.epsilon!r} is also a pattern symbol"
+            )
+        if not literals <= alphabet:
+            raise ValueError(
+                f"Symbols {sorted(literals - alphabet)} are not in the alphabet"
+            )
+
+        builder = _ThompsonBuilder(sorted(alphabet), self.epsilon)
+        F = set()
+        labels = {}
+        for label, node in parsed:
+            s = builder.compile(node, 0)
+            if s == 0:
+                # The pattern matches only the empty word; give it its own state.
+                s = builder.new()
+                builder.add(0, self.epsilon, s)
+            F.add(s)
+            labels[s] = label
+
+        self.accept_labels = labels
+        f = TrackedDict.adopt(builder.f, builder.changes)
+        return Automata(set(range(builder.n)), set(alphabet), f, 0, F, self.epsilon)
+
+
+class _ThompsonBuilder:
+    """
+    Emits the states and transitions of parsed patterns into one dict.
+
+    The target sets are created as tracked sets on a counter of their own,
+    so the resulting Automata adopts them instead of copying every set.
+    Nodes are dispatched through a table of plain functions, so emitting a
+    node allocates nothing but its states' transitions.
+    """
+
+    def __init__(self, alphabet: list, epsilon: str):
+        self.alphabet = alphabet
+        self.epsilon = epsilon
+        self.f = {}
+        self.changes = Changes()
+        self.n = 1
+        # Star loop states: the only end states that have outgoing edges.
+        self.loops = set()
+
+    def new(self) -> int:
+        self.n += 1
+        return self.n - 1
+
+    def add(self, s, x, e):
+        key = (s, x)
+        targets = self.f.get(key)
+        if targets is None:
+            targets = self.f[key] = TrackedSet((e,))
+            targets._changes = self.changes
+        else:
+            targets.add(e)
+
+    def compile(self, node: tuple, s: int) -> int:
+        """Emit `node` starting from state `s` and return its end state."""
+        return _EMITTERS[node[0]](self, node, s)
+
+    def _str(self, node, s):
+        # A chain of fresh states; only the first edge leaves an existing state.
+        f, n, text, changes = self.f, self.n, node[1], self.changes
+        self.add(s, text[0], n)
+        for c in text[1:]:
+            targets = f[(n, c)] = TrackedSet((n + 1,))
+            targets._changes = changes
+            n += 1
+        self.n = n + 1
+        return n
+
+    def _cat(self, node, s):
+        for child in node[1]:
+            s = self.compile(child, s)
+        return s
+
+    def _symbols(self, symbols, s):
+        e = self.new()
+        for x in symbols:
+            self.add(s, x, e)
+        return e
+
+    def _class(self, node, s):
+        _, symbols, negated = node
+        if negated:
+            excluded = set(symbols)
+            symbols = [x for x in self.alphabet if x not in excluded]
+        return self._symbols(symbols, s)
+
+    def _any(self, node, s):
+        return self._symbols(self.alphabet, s)
+
+    def _alt(self, node, s):
+        e = self.new()
+        for child in node[1]:
+            b = self.new()
+            self.add(s, self.epsilon, b)
+            self.add(self.compile(child, b), self.epsilon, e)
+        return e
+
+    def _loop(self, child, s):
+        loop = self.new()
+        self.add(s, self.epsilon, loop)
+        end = self.compile(child, loop)
+        if end != loop:
+            self.add(end, self.epsilon, loop)
+        return loop, end
+
+    def _star(self, node, s):
+        loop, _ = self._loop(node[1], s)
+        self.loops.add(loop)
+        return loop
+
+    def _plus(self, node, s):
+        _, end = self._loop(node[1], s)
+        e = self.new()
+        self.add(end, self.epsilon, e)
+        return e
+
+    def _opt(self, node, s):
+        return self._join([s], self.compile(node[1], s))
+
+    def _rep(self, node, s):
+        _, child, low, high = node
+        for _ in range(low):
+            s = self.compile(child, s)
+        if high is None:
+            return self._star(("star", child), s)
+        skips = []
+        for _ in range(high - low):
+            skips.append(s)
+            s = self.compile(child, s)
+        return self._join(skips, s)
+
+    def _empty(self, node, s):
+        return s
+
+    def _join(self, skips, e):
+        # Let every state in `skips` jump to the end state `e`. Loop states
+        # have outgoing edges, so jumping into one would allow extra words;
+        # they get a fresh end state first.
+        skips = [skip for skip in skips if skip != e]
+        if not skips:
+            return e
+        if e in self.loops:
+            end = self.new()
+            self.add(e, self.epsilon, end)
+            e = end
+        for skip in skips:
+            self.add(skip, self.epsilon, e)
+        return e
+
+
+_EMITTERS = {
+    kind: getattr(_ThompsonBuilder, "_" + kind)
+    for kind in (
+        "str",
+        "cat",
+        "class",
+        "any",
+        "alt",
+        "star",
+        "plus",
+        "opt",
+        "rep",
+        "empty",
+    )
+}
@@ -0,0 +1,117 @@
+"""
+Counting and uniform sampling of accepted words by length.
+
+The automaton is determinized on demand (only reachable subsets, with the
+empty set as a sink), which makes every accepted word correspond to exactly
+one path. For a DFA with transition table T (state x symbol -> state), the
+number of accepted words of length n read from state q is
+
+    C[0][q] = 1 if q is final else 0
+    C[n][q] = sum over symbols x of C[n - 1][T[q, x]]
+
+so each row of the count table is one product of the adjacency matrix with
+the previous row, computed as a NumPy gather and sum over T.
+
+Sampling a word of length n uniformly walks from the start state and picks
+symbol x with probability C[r - 1][T[q, x]] / C[r][q], where r is the number
+of symbols still to be drawn. All samples advance in lockstep, one NumPy
+step per position.
+
+Counts are int64 while k^n fits, and Python ints (object arrays) beyond.
+"""
+import numpy as np
+
+from lab1.core.operations import Determinized
+
+_INT64_LIMIT = 1 << 63
+
+
+class WordCounter:
+    """Count tables of a determinized automaton, extended on demand."""
+
+    def __init__(self, automata, max_states: int = None):
+        """
+        Raises ValueError if the determinized automaton has more than
+        `max_states` reachable states.
+        """
+        determinized = Determinized(automata)
+        dfa = determinized.materialize(max_states)
+        self.symbols = sorted(dfa.X, key=str)
+        self.n_states = len(dfa.A)
+        self.transitions = np.zeros((self.n_states, len(self.symbols)), dtype=np.intp)
+        for i, x in enumerate(self.symbols):
+            for q in range(self.n_states):
+                (self.transitions[q, i],) = dfa.f[(q, x)]
+        final = np.zeros(self.n_states, dtype=np.int64)
+        final[list(dfa.F)] = 1
+        self._rows = [final]
+
+    def _extend(self, n: int):
+        k = len(self.symbols)
+        while len(self._rows) <= n:
+            previous = self._rows[-1]
+            if k ** len(self._rows) >= _INT64_LIMIT:
+                previous = previous.astype(object)
+            self._rows.append(previous[self.transitions].sum(axis=1))
+
+    def table(self, n: int) -> np.ndarray:
+        """
+        Return the (n + 1) x n_states table whose row i holds the number of
+        accepted words of length i read from each state.
+        """
+        self._extend(n)
+        rows = self._rows[: n + 1]
+        if any(row.dtype == object for row in rows):
+            rows = [row.astype(object) for row in rows]
+        return np.stack(rows)
+
+    def count(self, n: int) -> list:
+        """Return the numbers of accepted words of lengths 0..n."""
+        self._extend(n)
+        return [int(row[0]) for row in self._rows[: n + 1]]
+
+    def sample(self, length: int, size: int = 1, seed=None, up_to: bool = False):
+        """
+        Draw `size` accepted words uniformly at random, as tuples of symbols.
+
+        Words have exactly `length` symbols, or, with `up_to`, any length from
+        0 to `length`. Raises ValueError if there is no such accepted word.
+        """
+        rng = np.random.default_rng(seed)
+        table = self.table(length)
+        counts = table[:, 0]
+        if up_to:
+            total = sum(int(c) for c in counts)
+            if not total:
+                raise ValueError(f"No accepted words of length at most {length}")
+            weights = [int(c) / total for c in counts]
+            lengths = rng.choice(length + 1, size=size, p=weights)
+        else:
+            if not counts[length]:
+                raise ValueError(f"No accepted words of length {length}")
+            lengths = np.full(size, length, dtype=np.intp)
+
+        states = np.zeros(size, dtype=np.intp)
+        drawn = np.zeros((size, max(length, 1)), dtype=np.intp)
+        for t in range(length):
+            active = np.flatnonzero(lengths > t)
+            if not len(active):
+                break
+            remaining = lengths[active] - t
+            targets = self.transitions[states[active]]
+            weights = table[remaining[:, None] - 1, targets]
+            cumulative = (
+                (weights / table[remaining, states[active]][:, None])
+                .astype(np.float64)
+                .cumsum(axis=1)
+            )
+            u = rng.random(len(active)) * cumulative[:, -1]
+            choice = (cumulative <= u[:, None]).sum(axis=1)
+            drawn[active, t] = choice
+            states[active] = targets[np.arange(len(active)), choice]
+
+        symbols = self.symbols
+        return [
+            tuple(symbols[x] for x in row[:n])
+            for row, n in zip(drawn.tolist(), lengths.tolist())
+        ]
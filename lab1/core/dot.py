@@ -0,0 +1,129 @@
+"""
+Streaming Graphviz DOT export for automata.
+
+The writer walks the states and emits DOT text directly from `f`, without
+building an automata-lib or graphviz object first. Without limits it keeps
+only the outgoing edges of the current state in memory. To keep big graphs
+renderable, parallel edges between two states can be merged into one label,
+and the drawing can be restricted to the states within `depth` steps of a0
+and/or to at most `max_nodes` states; limited drawings pick their states in
+breadth-first order from a0.
+"""
+import subprocess
+from collections import deque
+
+EPSILON_LABEL = "ε"
+
+
+def _quote(name) -> str:
+    return '"' + str(name).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _symbols(automata) -> list:
+    symbols = sorted(automata.X, key=str)
+    if automata.epsilon is not None and automata.epsilon not in automata.X:
+        symbols.append(automata.epsilon)
+    return symbols
+
+
+def _selected_states(automata, symbols, depth: int, max_nodes: int) -> dict:
+    """BFS from a0 honouring the depth and node limits; maps state to depth."""
+    seen = {automata.a0: 0}
+    queue = deque([automata.a0])
+    while queue:
+        state = queue.popleft()
+        if depth is not None and seen[state] >= depth:
+            continue
+        for symbol in symbols:
+            for target in automata.f.get((state, symbol), ()):
+                if target in seen:
+                    continue
+                if max_nodes is not None and len(seen) >= max_nodes:
+                    return seen
+                seen[target] = seen[state] + 1
+                queue.append(target)
+    return seen
+
+
+def write_dot(
+    automata,
+    out,
+    merge_edges: bool = True,
+    max_nodes: int = None,
+    depth: int = None,
+    name: str = "automata",
+):
+    """
+    Write the automaton as DOT to `out`, a filename or a text stream (e.g. a
+    pipe). Returns the number of states drawn.
+    """
+    if isinstance(out, str):
+        with open(out, "w") as file:
+            return write_dot(automata, file, merge_edges, max_nodes, depth, name)
+
+    symbols = _symbols(automata)
+    if max_nodes is None and depth is None:
+        selected = None
+        states = automata.A
+    else:
+        selected = _selected_states(automata, symbols, depth, max_nodes)
+        states = selected.keys()
+
+    write = out.write
+    write("digraph {} {{\n".format(_quote(name)))
+    write("  rankdir=LR;\n  node [shape=circle];\n")
+    write('  "__start" [shape=point];\n')
+    write('  "__start" -> {};\n'.format(_quote(automata.a0)))
+
+    drawn = 0
+    for state in states:
+        drawn += 1
+        source = _quote(state)
+        if state in automata.F:
+            write("  {} [shape=doublecircle];\n".format(source))
+        else:
+            write("  {};\n".format(source))
+
+        labels = {}
+        for symbol in symbols:
+            label = EPSILON_LABEL if symbol == automata.epsilon else str(symbol)
+            for target in automata.f.get((state, symbol), ()):
+                if selected is not None and target not in selected:
+                    continue
+                if merge_edges:
+                    labels.setdefault(target, []).append(label)
+                else:
+                    write(
+                        "  {} -> {} [label={}];\n".format(
+                            source, _quote(target), _quote(label)
+                        )
+                    )
+        for target, merged in labels.items():
+            write(
+                "  {} -> {} [label={}];\n".format(
+                    source, _quote(target), _quote(", ".join(merged))
+                )
+            )
+
+    if selected is not None and drawn < len(automata.A):
+        write("  // {} of {} states drawn\n".format(drawn, len(automata.A)))
+    write("}\n")
+    return drawn
+
+
+def render_dot(automata, filename: str, output_format: str = "png", **options):
+    """
+    Render the automaton with the Graphviz `dot` executable, streaming the
+    DOT text into its stdin. Accepts the options of `write_dot`.
+    """
+    process = subprocess.Popen(
+        ["dot", "-T{}".format(output_format), "-o", filename],
+        stdin=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        write_dot(automata, process.stdin, **options)
+    finally:
+        process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError("dot exited with status {}".format(process.returncode))
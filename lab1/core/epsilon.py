@@ -0,0 +1,134 @@
+"""
+Epsilon-closure computation over a `CompactAutomata`.
+
+The epsilon graph is condensed into its strongly connected components with an
+iterative Tarjan pass. All states of one component share the same closure, and
+Tarjan emits components in reverse topological order, so every closure is the
+union of its own members and the already computed closures of its successor
+components. Closures are bitsets over interned state ids.
+"""
+from lab1.core.compact import CompactAutomata
+
+
+def epsilon_components(automata: CompactAutomata):
+    """
+    Return `(component, components)`: the component id of every state, and the
+    member lists of the epsilon SCCs in reverse topological order.
+    """
+    n = automata.n_states
+    eps = automata.epsilon_id
+    if eps is None:
+        return list(range(n)), [[q] for q in range(n)]
+
+    k = automata.n_symbols
+    offsets, targets = automata.offsets, automata.targets
+
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack = []
+    component = [-1] * n
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        row = root * k + eps
+        work = [[root, offsets[row], offsets[row + 1]]]
+
+        while work:
+            frame = work[-1]
+            v, i, end = frame
+            if i < end:
+                frame[1] = i + 1
+                w = targets[i]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    row = w * k + eps
+                    work.append([w, offsets[row], offsets[row + 1]])
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            work.pop()
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    component[w] = len(components)
+                    members.append(w)
+                    if w == v:
+                        break
+                components.append(members)
+
+    return component, components
+
+
+def epsilon_closures(automata: CompactAutomata) -> list:
+    """Return the epsilon closure of every state as a bitset over state ids."""
+    component, components = epsilon_components(automata)
+    eps = automata.epsilon_id
+    closures = []
+    for c, members in enumerate(components):
+        bits = 0
+        for q in members:
+            bits |= 1 << q
+            if eps is None:
+                continue
+            for w in automata.successors(q, eps):
+                if component[w] != c:
+                    bits |= closures[component[w]]
+        closures.append(bits)
+    return [closures[component[q]] for q in range(automata.n_states)]
+
+
+class ClosedRows:
+    """
+    Epsilon-closed successor bitsets of single states, computed on demand and
+    keyed by symbol name. Symbols the automaton does not know lead nowhere.
+    """
+
+    def __init__(self, automata):
+        if not isinstance(automata, CompactAutomata):
+            automata = CompactAutomata.from_automata(automata)
+        self.automata = automata
+        self.closures = epsilon_closures(automata)
+        self.final_bits = 0
+        for q in range(automata.n_states):
+            if automata.final_flags[q]:
+                self.final_bits |= 1 << q
+        self._rows = {}
+
+    def row(self, q: int, symbol) -> int:
+        key = (q, symbol)
+        row = self._rows.get(key)
+        if row is None:
+            row = 0
+            x = self.automata.symbol_ids.get(symbol)
+            if x is not None and x != self.automata.epsilon_id:
+                for r in self.automata.successors(q, x):
+                    row |= self.closures[r]
+            self._rows[key] = row
+        return row
+
+    def step(self, bits: int, symbol) -> int:
+        """Epsilon-closed successors of a set of states."""
+        result = 0
+        while bits:
+            low = bits & -bits
+            result |= self.row(low.bit_length() - 1, symbol)
+            bits ^= low
+        return result
@@ -0,0 +1,142 @@
+"""
+Language equivalence and inclusion of (epsilon-)NFAs without determinizing.
+
+The check is HKC (Bonchi and Pous, "Checking NFA equivalence with
+bisimulations up to congruence"). Both automata are put side by side in one
+id space and explored as pairs (X, Y) of epsilon-closed state sets, starting
+from the closures of the two start states. A pair whose sides differ in
+finality yields a counterexample. A pair is skipped if it already follows
+from the pairs visited before it:
+  - up to equivalence: X and Y are in one class of a union-find over the
+    visited sets, which is the Hopcroft-Karp check;
+  - up to congruence: X and Y have the same normal form, where a set Z is
+    saturated with U union V for every visited pair (U, V) with U or V
+    contained in Z.
+Congruence pruning is what keeps the exploration small on NFAs whose subset
+construction is exponential.
+
+Pairs are explored level by level, so the first counterexample found is a
+shortest one: a skipped pair can only disagree on a word if a visited pair
+at no greater depth disagrees on a word that is no longer. Within a level,
+pairs of smaller sets go first. Sets of the subset construction are often
+unions of smaller sets reached by words of the same length, and those
+unions can then be skipped.
+
+Inclusion L(A) <= L(B) is checked as the equivalence of X union Y and Y
+(from the start sets X of A and Y of B); a counterexample is then a word
+accepted by A and not by B.
+"""
+from lab1.core.epsilon import ClosedRows
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x, y):
+        self.parent[self.find(x)] = self.find(y)
+
+
+def _normal_form(pairs: list, bits: int) -> int:
+    changed = True
+    while changed:
+        changed = False
+        for x, y in pairs:
+            both = x | y
+            if both & ~bits and (not x & ~bits or not y & ~bits):
+                bits |= both
+                changed = True
+    return bits
+
+
+def _counterexample(a, b, inclusion: bool):
+    left, right = ClosedRows(a), ClosedRows(b)
+    shift = left.automata.n_states
+    mask = (1 << shift) - 1
+    final = left.final_bits | right.final_bits << shift
+    symbols = sorted(
+        {
+            x
+            for rows in (left, right)
+            for i, x in enumerate(rows.automata.symbols)
+            if i < rows.automata.n_input_symbols and i != rows.automata.epsilon_id
+        },
+        key=str,
+    )
+
+    def step(bits, symbol):
+        return (
+            left.step(bits & mask, symbol) | right.step(bits >> shift, symbol) << shift
+        )
+
+    x0 = left.closures[left.automata.initial]
+    y0 = right.closures[right.automata.initial] << shift
+    if inclusion:
+        x0 |= y0
+
+    visited = []
+    classes = _UnionFind()
+    trail = []  # (parent index, symbol) of every visited pair
+    level = [(x0, y0, -1, None)]
+    while level:
+        # Within a level, small sets go first, so that larger sets are more
+        # often unions of visited ones and get pruned.
+        level.sort(key=lambda pair: (pair[0] | pair[1]).bit_count())
+        next_level = []
+        for x, y, parent, symbol in level:
+            if classes.find(x) == classes.find(y):
+                continue
+            if _normal_form(visited, x) == _normal_form(visited, y):
+                continue
+
+            index = len(trail)
+            trail.append((parent, symbol))
+            if bool(x & final) != bool(y & final):
+                word = []
+                while index >= 0:
+                    index, symbol = trail[index]
+                    if index >= 0:
+                        word.append(symbol)
+                return tuple(reversed(word))
+
+            visited.append((x, y))
+            classes.union(x, y)
+            for symbol in symbols:
+                next_level.append((step(x, symbol), step(y, symbol), index, symbol))
+        level = next_level
+    return None
+
+
+def equivalence_counterexample(a, b):
+    """
+    Return a shortest word accepted by exactly one of the automata, as a
+    tuple of symbols, or None if they accept the same language.
+    """
+    return _counterexample(a, b, inclusion=False)
+
+
+def inclusion_counterexample(a, b):
+    """
+    Return a shortest word accepted by `a` but not by `b`, as a tuple of
+    symbols, or None if the language of `a` is included in that of `b`.
+    """
+    return _counterexample(a, b, inclusion=True)
+
+
+def equivalent(a, b) -> bool:
+    """Tell whether the automata accept the same language."""
+    return equivalence_counterexample(a, b) is None
+
+
+def included(a, b) -> bool:
+    """Tell whether every word accepted by `a` is accepted by `b`."""
+    return inclusion_counterexample(a, b) is None
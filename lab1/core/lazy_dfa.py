@@ -0,0 +1,278 @@
+"""
+Lazy DFA matching over (epsilon-)NFAs, in the style of RE2.
+
+DFA states are created on demand while input is scanned: a DFA state is the
+epsilon-closed set of NFA states the input can lead to, stored as a bitset,
+and each of its transitions is computed the first time it is taken. Known
+transitions are plain list lookups, so hot inputs run at DFA speed without
+ever building the full, possibly exponential, subset construction.
+
+The cache of DFA states, together with the memo of epsilon-closed NFA rows
+the transitions are computed from, is bounded by an estimate of its memory
+use. When the next state or row would not fit, both are flushed and rebuilt
+from the current state, which keeps the bookkeeping trivial. If flushes come so
+often that fewer than `min_steps_per_state` symbols were read per cached
+state since the last one, the cache is thrashing; the rest of that input is
+then run by plain NFA simulation over bitsets, which reads the row memo but
+never adds to it, so it costs no cache memory and causes no further flushes.
+
+With `search=True` the start states are added back after every step, so a
+state holds the runs started at every earlier position and is final where
+some substring ending there is accepted (unanchored search).
+"""
+import sys
+
+from lab1.core.compact import CompactAutomata
+from lab1.core.epsilon import epsilon_closures
+
+# Rough size of a cached state apart from its transition list and bitset.
+_STATE_OVERHEAD = 200
+# Rough size of a memoized NFA row apart from its bitset: the int key and
+# the dict slot, including the table's spare capacity.
+_ROW_OVERHEAD = 100
+# Generation of the uncached states `step` returns while the cache thrashes.
+_UNCACHED = -1
+
+
+class _DState:
+    __slots__ = ("bits", "final", "next", "generation")
+
+    def __init__(self, bits: int, final: bool, n_symbols: int, generation: int):
+        self.bits = bits  # Epsilon-closed set of NFA states
+        self.final = final
+        self.next = [None] * n_symbols  # Successor DFA state per symbol id
+        self.generation = generation  # Cache generation the state belongs to
+
+
+class LazyDFA:
+    """Matcher that builds DFA states on demand in a memory-bounded cache."""
+
+    def __init__(
+        self,
+        automata,
+        max_bytes: int = 8 * 2**20,
+        min_steps_per_state: int = 10,
+        search: bool = False,
+    ):
+        if not isinstance(automata, CompactAutomata):
+            automata = CompactAutomata.from_automata(automata)
+        self.automata = automata
+        self.max_bytes = max_bytes
+        self.min_steps_per_state = min_steps_per_state
+        self.search = search
+
+        self._closures = epsilon_closures(automata)
+        self._k = automata.n_symbols
+        symbols = [
+            x for x in range(automata.n_input_symbols) if x != automata.epsilon_id
+        ]
+        self.symbol_ids = {automata.symbols[x]: i for i, x in enumerate(symbols)}
+        self._symbols = symbols
+        self._final_bits = 0
+        for q in range(automata.n_states):
+            if automata.final_flags[q]:
+                self._final_bits |= 1 << q
+        self.initial_bits = self._closures[automata.initial]
+        self._rows = {}
+
+        self._state_bytes = (
+            _STATE_OVERHEAD + 8 * len(symbols) + (automata.n_states + 7) // 8
+        )
+        self._cache = {}
+        self._no_next = [None] * len(symbols)
+        self._generation = 0
+        self._start = None
+        self.memory_used = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.fallbacks = 0
+        self._steps_at_flush = 0
+        self._thrashing = False
+
+    # Counters
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of transitions that were found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def cached_states(self) -> int:
+        return len(self._cache)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "flushes": self.flushes,
+            "fallbacks": self.fallbacks,
+            "cached_states": self.cached_states,
+            "memory_used": self.memory_used,
+        }
+
+    # NFA steps
+
+    def _successors(self, q: int, x: int) -> int:
+        """Epsilon-closed successors of NFA state q on input symbol x."""
+        row = 0
+        for r in self.automata.successors(q, x):
+            row |= self._closures[r]
+        return row
+
+    def _row(self, q: int, x: int) -> int:
+        """`_successors`, memoized within the memory budget."""
+        key = q * self._k + x
+        row = self._rows.get(key)
+        if row is None:
+            row = self._successors(q, x)
+            row_bytes = _ROW_OVERHEAD + sys.getsizeof(row)
+            if self.memory_used + row_bytes > self.max_bytes:
+                self._flush()
+            if row_bytes <= self.max_bytes:
+                self._rows[key] = row
+                self.memory_used += row_bytes
+        return row
+
+    def _known_row(self, q: int, x: int) -> int:
+        """`_successors`, read from the memo if present but never added to it."""
+        row = self._rows.get(q * self._k + x)
+        return self._successors(q, x) if row is None else row
+
+    def _nfa_step(self, bits: int, x: int, row=None) -> int:
+        if row is None:
+            row = self._row
+        result = self.initial_bits if self.search else 0
+        while bits:
+            low = bits & -bits
+            result |= row(low.bit_length() - 1, x)
+            bits ^= low
+        return result
+
+    # Cache
+
+    def _flush(self):
+        steps = self.hits + self.misses - self._steps_at_flush
+        if steps < self.min_steps_per_state * max(1, len(self._cache)):
+            self._thrashing = True
+        for state in self._cache.values():
+            state.next = None
+        self._cache = {}
+        self._rows = {}
+        self._generation += 1
+        self._start = None
+        self.memory_used = 0
+        self.flushes += 1
+        self._steps_at_flush = self.hits + self.misses
+
+    def _intern(self, bits: int) -> _DState:
+        state = self._cache.get(bits)
+        if state is None:
+            if self.memory_used + self._state_bytes > self.max_bytes:
+                self._flush()
+            state = _DState(
+                bits,
+                bool(bits & self._final_bits),
+                len(self._symbols),
+                self._generation,
+            )
+            self._cache[bits] = state
+            self.memory_used += self._state_bytes
+        return state
+
+    @property
+    def start(self) -> _DState:
+        """The DFA state of the start of the input."""
+        self._thrashing = False
+        if self._start is None:
+            self._start = self._intern(self.initial_bits)
+        return self._start
+
+    def state(self, bits: int) -> _DState:
+        """The DFA state of a set of NFA states (a bitset over interned ids)."""
+        return self._intern(bits)
+
+    def step(self, state: _DState, symbol) -> _DState:
+        """
+        Return the DFA state after reading `symbol` in `state`. Once the cache
+        thrashes, the states returned until the next `start` are computed by
+        NFA simulation and not cached.
+        """
+        x = self.symbol_ids.get(symbol)
+        if x is None:
+            bits = self.initial_bits if self.search else 0
+        elif state.generation == self._generation:
+            target = state.next[x]
+            if target is not None:
+                self.hits += 1
+                return target
+        if not self._thrashing:
+            return self._intern(bits) if x is None else self._transition(state, x)
+        if state.generation != _UNCACHED:
+            self.fallbacks += 1
+        if x is not None:
+            self.misses += 1
+            bits = self._nfa_step(state.bits, self._symbols[x], self._known_row)
+        return self._uncached(bits)
+
+    def _uncached(self, bits: int) -> _DState:
+        state = _DState(bits, bool(bits & self._final_bits), 0, _UNCACHED)
+        # Shared and never filled in, so every step from it comes back here.
+        state.next = self._no_next
+        return state
+
+    def _transition(self, state: _DState, x: int) -> _DState:
+        self.misses += 1
+        target = self._intern(self._nfa_step(state.bits, self._symbols[x]))
+        if state.generation == self._generation:
+            state.next[x] = target
+        return target
+
+    # Matching
+
+    def accepts(self, word) -> bool:
+        """Tell whether the automaton accepts `word`, a sequence of symbols."""
+        ids = self.symbol_ids
+        state = self.start
+        symbols = iter(word)
+        for symbol in symbols:
+            x = ids.get(symbol)
+            if x is None:
+                if self.search:
+                    state = self.start
+                    continue
+                return False
+            target = state.next[x] if state.next is not None else None
+            if target is None:
+                target = self._transition(state, x)
+                if self._thrashing:
+                    return self._simulate(target.bits, symbols)
+                if not target.bits:
+                    return False  # Never taken in search mode
+            else:
+                self.hits += 1
+            state = target
+        return state.final
+
+    def accepts_many(self, words) -> list:
+        return [self.accepts(word) for word in words]
+
+    def _simulate(self, bits: int, symbols) -> bool:
+        """Read the remaining `symbols` from `bits` by NFA simulation."""
+        self.fallbacks += 1
+        ids = self.symbol_ids
+        row = self._known_row
+        for symbol in symbols:
+            x = ids.get(symbol)
+            if x is None:
+                if not self.search:
+                    return False
+                bits = self.initial_bits
+            elif bits:
+                bits = self._nfa_step(bits, self._symbols[x], row)
+            else:
+                return False
+        return bool(bits & self._final_bits)
@@ -0,0 +1,178 @@
+"""
+Eval-free decoding of the Automata JSON format.
+
+Transition keys are stored as the `str()` of a `(state, symbol)` tuple, e.g.
+`"('0', 'x')"`. They are parsed with a regular expression, falling back to
+`ast.literal_eval` for names that need escaping, so no code is ever executed.
+
+`read_automata_json` parses a file incrementally: only the current chunk and
+the decoded automaton are kept in memory, never the full text or the whole
+intermediate `json.loads` document. State and symbol names are interned while
+parsing, so every occurrence of a name shares one string
+object.
+"""
+import ast
+import json
+import re
+import sys
+
+_NAME = r"""(?:'([^'"\\]*)'|(-?\d+))"""
+_KEY_RE = re.compile(r"\(" + _NAME + ", " + _NAME + r"\)\Z")
+_WS_RE = re.compile(r"[ \t\n\r]*")
+
+
+def parse_transition_key(key: str, intern=None) -> tuple:
+    """Parse a serialized `(state, symbol)` transition key without `eval`."""
+    match = _KEY_RE.match(key)
+    if match is not None:
+        state_str, state_int, symbol_str, symbol_int = match.groups()
+        state = state_str if state_int is None else int(state_int)
+        symbol = symbol_str if symbol_int is None else int(symbol_int)
+    else:
+        try:
+            parsed = ast.literal_eval(key)
+        except (ValueError, SyntaxError):
+            raise ValueError(f"Malformed transition key: {key!r}") from None
+        if not isinstance(parsed, tuple) or len(parsed) != 2:
+            raise ValueError(f"Malformed transition key: {key!r}")
+        state, symbol = parsed
+
+    if intern is not None:
+        state, symbol = intern(state), intern(symbol)
+    return state, symbol
+
+
+def _intern(name):
+    """Intern string names; other JSON scalars (e.g. int states) pass through."""
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+def decode_automata(data: dict) -> dict:
+    """Convert a decoded JSON document to `Automata` constructor arguments."""
+    intern = _intern
+    data["A"] = set(map(intern, data["A"]))
+    data["X"] = set(map(intern, data["X"]))
+    data["f"] = {
+        parse_transition_key(key, intern): set(map(intern, targets))
+        for key, targets in data["f"].items()
+    }
+    data["F"] = set(map(intern, data["F"]))
+    return data
+
+
+class _JSONStream:
+    """Minimal pull parser over a text file, built on `JSONDecoder.raw_decode`."""
+
+    def __init__(self, file, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self, size: int = None) -> bool:
+        if self._eof:
+            return False
+        data = self._file.read(size or self._chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        # Drop the consumed prefix so the buffer stays around one chunk.
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            self._pos = _WS_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._read_more():
+                return ""
+
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in automata JSON, found {found!r}")
+        self._pos += 1
+
+    def _separator(self, closing: str) -> bool:
+        """Consume a `,` or the closing bracket; return True if more items follow."""
+        found = self._peek()
+        self._pos += 1
+        if found == ",":
+            return True
+        if found == closing:
+            return False
+        raise ValueError(f"Expected ',' or {closing!r} in automata JSON")
+
+    def at_end(self) -> bool:
+        return self._peek() == ""
+
+    def value(self):
+        """Decode one complete JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # The value may just be cut off by the chunk boundary.
+                if not self._read_more(max(self._chunk_size, len(self._buf))):
+                    raise
+                continue
+            if end == len(self._buf) and self._read_more():
+                # A number at the very end of the buffer may be incomplete.
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self):
+        """Yield the items of a JSON array one at a time."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        more = True
+        while more:
+            yield self.value()
+            more = self._separator("]")
+
+    def iter_object(self):
+        """Yield the keys of a JSON object; the caller must consume each value."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        more = True
+        while more:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Expected a string key in automata JSON")
+            self._expect(":")
+            yield key
+            more = self._separator("}")
+
+
+def read_automata_json(file, chunk_size: int = 1 << 20) -> dict:
+    """Incrementally parse an automata JSON file to constructor arguments."""
+    stream = _JSONStream(file, chunk_size)
+    intern = _intern
+    data = {}
+
+    for field in stream.iter_object():
+        if field in ("A", "X", "F"):
+            data[field] = set(map(intern, stream.iter_array()))
+        elif field == "f":
+            f = {}
+            for key in stream.iter_object():
+                f[parse_transition_key(key, intern)] = set(map(intern, stream.value()))
+            data["f"] = f
+        else:
+            value = stream.value()
+            data[field] = intern(value)
+
+    if not stream.at_end():
+        raise ValueError("Extra data after automata JSON object")
+    return data
@@ -0,0 +1,190 @@
+"""
+On-the-fly boolean operations on the languages of automata.
+
+Every operation returns a lazy automaton: an `initial` state, a successor
+function `successors(state, symbol)` and `is_final(state)`. Nothing is built
+up front; `materialize()` explores the states reachable from `initial` and
+returns an ordinary `Automata`.
+
+Two lazy views of an input automaton are used as operands:
+  - `NFAView` is the epsilon-free form of an (epsilon-)NFA. Its states are
+    interned ids plus a start state standing for the closure E(a0), and every
+    step already includes the closures of its targets.
+  - `Determinized` is the on-demand subset construction. Its states are
+    epsilon-closed bitsets, and the empty set is kept as a sink, so it is
+    complete over any alphabet.
+
+Intersection is the product of two `NFAView`s. Union needs both sides to be
+complete, so it is the product of two `Determinized` views. Difference only
+needs the subtracted side to be deterministic and complete: NFA on the left,
+`Determinized` on the right. Complement flips the finality of `Determinized`
+relative to its alphabet.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+
+from lab1.core.base import Automata
+from lab1.core.bitset import iter_bits
+from lab1.core.epsilon import ClosedRows
+
+
+class LazyAutomata(ABC):
+    """Base class of automata given by a successor function."""
+
+    X: set  # Alphabet
+    initial = None
+
+    @abstractmethod
+    def successors(self, state, symbol) -> tuple:
+        """Return the states reached from `state` on `symbol`."""
+
+    @abstractmethod
+    def is_final(self, state) -> bool:
+        """Tell whether `state` is accepting."""
+
+    def materialize(self, max_states: int = None) -> Automata:
+        """
+        Explore the states reachable from `initial` breadth-first and return
+        them as an `Automata` with states 0..n-1 in discovery order.
+        `state_of` then maps each of them back to its lazy state. Raises
+        ValueError if more than `max_states` states are reachable.
+        """
+        symbols = sorted(self.X, key=str)
+        ids = {self.initial: 0}
+        self.state_of = [self.initial]
+        queue = deque([self.initial])
+        f = {}
+        F = set()
+        while queue:
+            state = queue.popleft()
+            a = ids[state]
+            if self.is_final(state):
+                F.add(a)
+            for x in symbols:
+                targets = set()
+                for target in self.successors(state, x):
+                    b = ids.get(target)
+                    if b is None:
+                        if max_states is not None and len(ids) >= max_states:
+                            raise ValueError(f"More than {max_states} reachable states")
+                        b = ids[target] = len(self.state_of)
+                        self.state_of.append(target)
+                        queue.append(target)
+                    targets.add(b)
+                if targets:
+                    f[(a, x)] = targets
+        return Automata(set(range(len(ids))), set(self.X), f, 0, F)
+
+
+class NFAView(LazyAutomata):
+    """Epsilon-free lazy view of an (epsilon-)NFA over interned state ids."""
+
+    def __init__(self, automata):
+        self._rows = ClosedRows(automata)
+        compact = self._rows.automata
+        self.X = {
+            x
+            for i, x in enumerate(compact.symbols[: compact.n_input_symbols])
+            if i != compact.epsilon_id
+        }
+        # -1 stands for E(a0); every other state is an interned id.
+        self.initial = -1
+        self._start_bits = self._rows.closures[compact.initial]
+
+    def successors(self, state, symbol) -> tuple:
+        if state == -1:
+            return tuple(iter_bits(self._rows.step(self._start_bits, symbol)))
+        return tuple(iter_bits(self._rows.row(state, symbol)))
+
+    def is_final(self, state) -> bool:
+        if state == -1:
+            return bool(self._start_bits & self._rows.final_bits)
+        return bool(self._rows.final_bits >> state & 1)
+
+
+class Determinized(LazyAutomata):
+    """
+    On-demand subset construction. States are bitsets over interned ids, the
+    empty set included, so every state has exactly one successor per symbol.
+    """
+
+    def __init__(self, automata, alphabet=None):
+        self._rows = ClosedRows(automata)
+        compact = self._rows.automata
+        self.X = {
+            x
+            for i, x in enumerate(compact.symbols[: compact.n_input_symbols])
+            if i != compact.epsilon_id
+        }
+        if alphabet is not None:
+            self.X |= set(alphabet)
+        self.initial = self._rows.closures[compact.initial]
+
+    def successors(self, state, symbol) -> tuple:
+        return (self._rows.step(state, symbol),)
+
+    def is_final(self, state) -> bool:
+        return bool(state & self._rows.final_bits)
+
+
+class Complement(LazyAutomata):
+    """Words over the alphabet that a `Determinized` view does not accept."""
+
+    def __init__(self, determinized: Determinized):
+        self.operand = determinized
+        self.X = determinized.X
+        self.initial = determinized.initial
+
+    def successors(self, state, symbol) -> tuple:
+        return self.operand.successors(state, symbol)
+
+    def is_final(self, state) -> bool:
+        return not self.operand.is_final(state)
+
+
+class Product(LazyAutomata):
+    """
+    Product of two lazy automata, explored from (left.initial, right.initial).
+    `accept(left_final, right_final)` decides the finality of a pair.
+    """
+
+    def __init__(self, left: LazyAutomata, right: LazyAutomata, accept):
+        self.left = left
+        self.right = right
+        self.accept = accept
+        self.X = left.X | right.X
+        self.initial = (left.initial, right.initial)
+
+    def successors(self, state, symbol) -> tuple:
+        p, q = state
+        right = self.right.successors(q, symbol)
+        if not right:
+            return ()
+        return tuple((p2, q2) for p2 in self.left.successors(p, symbol) for q2 in right)
+
+    def is_final(self, state) -> bool:
+        p, q = state
+        return self.accept(self.left.is_final(p), self.right.is_final(q))
+
+
+def intersection(a, b) -> Product:
+    """Words accepted by both automata."""
+    return Product(NFAView(a), NFAView(b), lambda p, q: p and q)
+
+
+def union(a, b) -> Product:
+    """Words accepted by either automaton."""
+    return Product(Determinized(a), Determinized(b), lambda p, q: p or q)
+
+
+def difference(a, b) -> Product:
+    """Words accepted by `a` but not by `b`."""
+    return Product(NFAView(a), Determinized(b), lambda p, q: p and not q)
+
+
+def complement(a, alphabet=None) -> Complement:
+    """
+    Words over the alphabet of `a` (extended by `alphabet`, if given) that
+    `a` does not accept.
+    """
+    return Complement(Determinized(a, alphabet))
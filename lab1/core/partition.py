@@ -0,0 +1,127 @@
+"""
+Hopcroft's partition refinement over a complete deterministic transition
+table, shared by the DFA and Mealy minimizers.
+
+States are the ints 0..n-1 and delta[q * k + x] is the target of state q on
+symbol x. Starting from an initial partition, blocks are split until every
+block is stable: all its members go to the same block on every symbol. The
+partition is refinable in place: block b is elems[first[b]:end[b]], loc is
+the position of a state in elems and blk its block, and the marked members
+of a block are moved to its front, up to mid[b].
+"""
+from array import array
+
+
+def inverse_transitions(delta, n: int, k: int):
+    """
+    Return the inverse transition table in CSR form: the predecessors of
+    (q, x) are inv_sources[inv_offsets[q * k + x]:inv_offsets[q * k + x + 1]].
+    """
+    inv_offsets = array("i", bytes(4 * (n * k + 1)))
+    for p in range(n * k):
+        inv_offsets[delta[p] * k + p % k + 1] += 1
+    for row in range(n * k):
+        inv_offsets[row + 1] += inv_offsets[row]
+    fill = array("i", inv_offsets)
+    inv_sources = array("i", bytes(4 * n * k))
+    for p in range(n * k):
+        row = delta[p] * k + p % k
+        inv_sources[fill[row]] = p // k
+        fill[row] += 1
+    return inv_offsets, inv_sources
+
+
+def _partition(n: int, blocks: list):
+    elems = array("i")
+    loc = array("i", bytes(4 * n))
+    blk = array("i", bytes(4 * n))
+    first, end = array("i"), array("i")
+    for members in blocks:
+        if not members:
+            continue
+        first.append(len(elems))
+        for q in members:
+            blk[q] = len(end)
+            loc[q] = len(elems)
+            elems.append(q)
+        end.append(len(elems))
+    return elems, loc, blk, first, end
+
+
+def refine_partition(delta, n: int, k: int, blocks: list) -> array:
+    """
+    Refine `blocks`, lists of states covering 0..n-1, into the coarsest
+    stable partition in O(k * n log n) time, and return the block of every
+    state.
+
+    Every initial block but the largest, paired with every symbol, starts on
+    the waiting list W. A splitter (B, x) popped from W marks every state
+    with an x-transition into B and splits each block into its marked and
+    unmarked part. For every symbol y, if (C, y) is waiting then both halves
+    are waiting, otherwise only the smaller half is added.
+    """
+    inv_offsets, inv_sources = inverse_transitions(delta, n, k)
+    elems, loc, blk, first, end = _partition(n, blocks)
+    mid = array("i", first)
+
+    waiting = []
+    in_waiting = bytearray(n * k)
+    largest = max(range(len(first)), key=lambda b: end[b] - first[b], default=0)
+    for b in range(len(first)):
+        if b != largest:
+            for x in range(k):
+                waiting.append((b, x))
+                in_waiting[b * k + x] = 1
+
+    while waiting:
+        splitter, x = waiting.pop()
+        in_waiting[splitter * k + x] = 0
+
+        # Mark every state with an x-transition into the splitter.
+        # The splitter itself may get reordered, so iterate over a copy.
+        touched = []
+        for q in elems[first[splitter] : end[splitter]]:
+            row = q * k + x
+            for j in range(inv_offsets[row], inv_offsets[row + 1]):
+                p = inv_sources[j]
+                b = blk[p]
+                i_p, i_m = loc[p], mid[b]
+                if i_p >= i_m:
+                    other = elems[i_m]
+                    elems[i_m], elems[i_p] = p, other
+                    loc[p], loc[other] = i_m, i_p
+                    if i_m == first[b]:
+                        touched.append(b)
+                    mid[b] = i_m + 1
+
+        # Split every touched block into its marked and unmarked part.
+        for b in touched:
+            if mid[b] == end[b]:
+                mid[b] = first[b]
+                continue
+            nb = len(first)
+            if mid[b] - first[b] <= end[b] - mid[b]:
+                first.append(first[b])
+                end.append(mid[b])
+                first[b] = mid[b]
+            else:
+                first.append(mid[b])
+                end.append(end[b])
+                end[b] = mid[b]
+            mid[b] = first[b]
+            mid.append(first[nb])
+            for i in range(first[nb], end[nb]):
+                blk[elems[i]] = nb
+
+            for y in range(k):
+                if in_waiting[b * k + y]:
+                    add = nb
+                elif end[b] - first[b] < end[nb] - first[nb]:
+                    add = b
+                else:
+                    add = nb
+                if not in_waiting[add * k + y]:
+                    in_waiting[add * k + y] = 1
+                    waiting.append((add, y))
+
+    return blk
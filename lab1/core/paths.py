@@ -0,0 +1,161 @@
+"""
+Shortest-word queries over a precomputed distance index.
+
+`PathIndex` interns the states of an automaton and runs two searches once:
+  - forward from a0: the length of a shortest word reaching every state,
+    with the edge it was reached by, so the word can be spelled out;
+  - backward from F: the length of a shortest word leading from every
+    state to acceptance.
+Both are 0-1 breadth-first searches: epsilon edges have length 0 and put
+their target at the front of the queue, symbol edges at the back.
+
+Accepted words in length-lexicographic order are enumerated one length L at
+a time by a depth-first search over epsilon-closed state sets that tries the
+symbols in sorted order. A prefix is only extended if one of its states can
+still reach acceptance within the remaining number of symbols, which the
+backward distances answer with one AND per step. In an infinite language,
+consecutive word lengths are less than 2n apart (n states), so a run of 2n
+lengths without a word means that no longer words exist.
+"""
+from collections import deque
+from itertools import count
+
+from lab1.core.compact import CompactAutomata
+from lab1.core.epsilon import ClosedRows
+
+
+def _zero_one_bfs(n: int, sources, edges) -> tuple:
+    """
+    Distances from `sources` over `edges[q]`, a list of (r, symbol id or
+    None for epsilon), and the (q, symbol id) edge each state was reached by.
+    Unreachable states have distance None.
+    """
+    distance = [None] * n
+    reached_by = [None] * n
+    queue = deque()
+    for q in sources:
+        distance[q] = 0
+        queue.append(q)
+    while queue:
+        q = queue.popleft()
+        d = distance[q]
+        for r, x in edges[q]:
+            e = d if x is None else d + 1
+            if distance[r] is None or e < distance[r]:
+                distance[r] = e
+                reached_by[r] = (q, x)
+                if x is None:
+                    queue.appendleft(r)
+                else:
+                    queue.append(r)
+    return distance, reached_by
+
+
+class PathIndex:
+    """Forward and backward shortest-word distances of an automaton."""
+
+    def __init__(self, automata):
+        if not isinstance(automata, CompactAutomata):
+            automata = CompactAutomata.from_automata(automata)
+        self.automata = automata
+        n, k = automata.n_states, automata.n_symbols
+        eps = automata.epsilon_id
+        self.symbols = sorted(
+            (x for x in range(automata.n_input_symbols) if x != eps),
+            key=lambda x: str(automata.symbols[x]),
+        )
+
+        # One pass over the CSR rows builds both adjacency lists.
+        edges = [[] for _ in range(n)]
+        reverse = [[] for _ in range(n)]
+        for row in sorted(automata.row_order):
+            q, x = divmod(row, k)
+            if x != eps and x >= automata.n_input_symbols:
+                continue
+            label = None if x == eps else x
+            for r in automata.successors(q, x):
+                edges[q].append((r, label))
+                reverse[r].append((q, label))
+
+        self.distance, self._reached_by = _zero_one_bfs(n, [automata.initial], edges)
+        finals = [q for q in range(n) if automata.final_flags[q]]
+        self.distance_to_final, _ = _zero_one_bfs(n, finals, reverse)
+
+        # within[r]: the states that reach acceptance with at most r symbols.
+        self.within = []
+        for q, d in enumerate(self.distance_to_final):
+            if d is not None:
+                self.within.extend([0] * (d + 1 - len(self.within)))
+                self.within[d] |= 1 << q
+        for r in range(1, len(self.within)):
+            self.within[r] |= self.within[r - 1]
+        self._rows = None
+
+    def _spell(self, q: int) -> tuple:
+        symbols = self.automata.symbols
+        word = []
+        while self._reached_by[q] is not None:
+            q, x = self._reached_by[q]
+            if x is not None:
+                word.append(symbols[x])
+        return tuple(reversed(word))
+
+    def shortest_word_to(self, state):
+        """
+        Return a shortest word, as a tuple of symbols, whose run can end in
+        `state`, or None if the state is unreachable. Raises ValueError for
+        unknown states.
+        """
+        q = self.automata.state_ids.get(state)
+        if q is None:
+            raise ValueError(f"Unknown state {state!r}")
+        if self.distance[q] is None:
+            return None
+        return self._spell(q)
+
+    def shortest_word(self):
+        """Return a shortest accepted word, or None if none is accepted."""
+        best = None
+        for q in range(self.automata.n_states):
+            d = self.distance[q]
+            if self.automata.final_flags[q] and d is not None:
+                if best is None or d < self.distance[best]:
+                    best = q
+        return None if best is None else self._spell(best)
+
+    def shortest_words(self, k: int = None):
+        """
+        Yield the accepted words in length-lexicographic order (symbols
+        compared as strs), lazily, stopping after `k` words if given.
+        """
+        if k is not None and k <= 0:
+            return
+        if self._rows is None:
+            self._rows = ClosedRows(self.automata)
+        rows, within = self._rows, self.within
+        symbols = [self.automata.symbols[x] for x in self.symbols]
+        start = rows.closures[self.automata.initial]
+        if not within or not start & within[-1]:
+            return
+
+        n = self.automata.n_states
+        found, last = 0, -1
+        for length in count():
+            if length - last > 2 * n:
+                return
+            stack = [(start, ())]
+            while stack:
+                bits, word = stack.pop()
+                remaining = length - len(word)
+                if not remaining:
+                    if bits & rows.final_bits:
+                        yield word
+                        found, last = found + 1, length
+                        if found == k:
+                            return
+                    continue
+                reach = within[min(remaining - 1, len(within) - 1)]
+                for symbol in reversed(symbols):
+                    following = rows.step(bits, symbol)
+                    if following & reach:
+                        stack.append((following, word + (symbol,)))
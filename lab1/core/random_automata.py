@@ -0,0 +1,69 @@
+"""
+Seeded random ENFA generator, shared by the benchmark suite and the tests.
+"""
+import math
+import random
+
+from lab1.core.base import Automata
+
+
+def _symbol_name(i: int) -> str:
+    """Symbol names a, b, ..., z, aa, ab, ..."""
+    name = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        name = chr(ord("a") + r) + name
+    return name
+
+
+def _targets(rng: random.Random, states: list, mean: float) -> set:
+    """
+    Pick every state independently with probability mean / len(states), in
+    O(mean) time by skipping geometrically distributed gaps.
+    """
+    p = mean / len(states)
+    if p <= 0:
+        return set()
+    if p >= 1:
+        return set(states)
+    log_q = math.log(1 - p)
+    targets = set()
+    i = int(math.log(1 - rng.random()) / log_q)
+    while i < len(states):
+        targets.add(states[i])
+        i += int(math.log(1 - rng.random()) / log_q) + 1
+    return targets
+
+
+def random_enfa(
+    seed: int,
+    n_states: int,
+    n_symbols: int,
+    density: float = 1.0,
+    epsilon_density: float = 0.3,
+    final_ratio: float = 0.1,
+) -> Automata:
+    """
+    Generate a random ENFA in O(n_states * (n_symbols + density)).
+
+    `density` is the mean number of targets of every (state, symbol) pair and
+    `epsilon_density` the mean number of epsilon transitions of every state;
+    every possible transition is drawn independently. States are named "0",
+    "1", ... with "0" as the start state and symbols "a", "b", ... The same
+    arguments always generate the same automaton.
+    """
+    rng = random.Random(seed)
+    A = [str(i) for i in range(n_states)]
+    X = [_symbol_name(i) for i in range(n_symbols)]
+    f = {}
+    for a in A:
+        for x in X:
+            targets = _targets(rng, A, density)
+            if targets:
+                f[(a, x)] = targets
+        targets = _targets(rng, A, epsilon_density)
+        if targets:
+            f[(a, "epsilon")] = targets
+    F = {a for a in A if rng.random() < final_ratio}
+    return Automata(set(A), set(X), f, A[0], F, "epsilon")
@@ -0,0 +1,202 @@
+"""
+Streaming search for accepted substrings in large inputs.
+
+The scanner runs a `LazyDFA` in search mode over bytes: after every byte the
+start states are added back, so the current state is final exactly at the
+end offsets of accepted substrings. Input is read as zero-copy memoryview
+chunks, from a memory-mapped file or any iterable of bytes-like chunks, and
+the DFA state is carried from one chunk to the next.
+
+Automaton symbols are matched against bytes: one-character str symbols by
+their code point (< 256), one-byte bytes symbols and ints 0..255 directly.
+Other symbols never match, and bytes without a symbol restart the search.
+
+Parallel scans split a file into one segment per worker. The state at the
+start of a segment depends on all earlier input, so each worker guesses it:
+the search start state. In search mode the true state always contains the
+guessed one, and once the two meet at some offset they stay equal. After the
+workers finish, every segment is re-scanned from the true state (the end
+state of the previous segment) in lockstep with the guess until the two
+meet, usually within the length of the longest match, and the matches found
+only by the true run are added.
+"""
+import heapq
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from lab1.core.compact import CompactAutomata
+from lab1.core.lazy_dfa import LazyDFA
+
+
+class Scanner:
+    """Finds the end offsets of all accepted substrings of byte streams."""
+
+    def __init__(self, automata, chunk_size: int = 1 << 20, **options):
+        """`options` are passed to `LazyDFA` (e.g. `max_bytes`)."""
+        if isinstance(automata, CompactAutomata):
+            automata = automata.to_automata()
+        self.automata = automata
+        self.chunk_size = chunk_size
+        self.options = options
+        self.matcher = LazyDFA(automata, search=True, **options)
+
+        self.byte_ids = [-1] * 256
+        self.byte_symbols = [None] * 256
+        for symbol, x in self.matcher.symbol_ids.items():
+            if isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 256:
+                b = ord(symbol)
+            elif isinstance(symbol, bytes) and len(symbol) == 1:
+                b = symbol[0]
+            elif isinstance(symbol, int) and 0 <= symbol < 256:
+                b = symbol
+            else:
+                continue
+            self.byte_ids[b] = x
+            self.byte_symbols[b] = symbol
+
+    def scan_chunk(self, chunk, state, offset: int, out: list):
+        """
+        Scan one bytes-like chunk that starts at `offset` from DFA `state`,
+        append the end offsets of matches to `out` and return the new state.
+        """
+        matcher = self.matcher
+        byte_ids, byte_symbols = self.byte_ids, self.byte_symbols
+        if state.next is None:
+            # The state was flushed from the cache since it was returned.
+            state = matcher.state(state.bits)
+        misses, restarts = matcher.misses, 0
+        end = offset + 1
+        for b in chunk:
+            x = byte_ids[b]
+            if x < 0:
+                state = matcher.start
+                restarts += 1
+            else:
+                target = state.next[x]
+                if target is None:
+                    target = matcher.step(state, byte_symbols[b])
+                state = target
+            if state.final:
+                out.append(end)
+            end += 1
+        matcher.hits += len(chunk) - restarts - (matcher.misses - misses)
+        return state
+
+    def _initial_matches(self, offset: int) -> list:
+        return [offset] if self.matcher.start.final else []
+
+    def scan_chunks(self, chunks):
+        """Yield the end offsets of matches in a stream of bytes-like chunks."""
+        yield from self._initial_matches(0)
+        state = self.matcher.start
+        offset = 0
+        for chunk in chunks:
+            view = memoryview(chunk).cast("B")
+            out = []
+            state = self.scan_chunk(view, state, offset, out)
+            offset += len(view)
+            yield from out
+
+    def scan(self, data):
+        """Yield the end offsets of matches in a bytes-like object."""
+        view = memoryview(data).cast("B")
+        return self.scan_chunks(
+            view[start : start + self.chunk_size]
+            for start in range(0, len(view), self.chunk_size)
+        )
+
+    def scan_file(self, filename: str, workers: int = 1):
+        """
+        Yield the end offsets of matches in a file, in increasing order. The
+        file is memory-mapped; with `workers` > 1 its segments are scanned in
+        parallel processes.
+        """
+        size = os.path.getsize(filename)
+        if size == 0:
+            yield from self._initial_matches(0)
+            return
+        if workers > 1 and size >= 2 * workers:
+            yield from self._scan_parallel(filename, size, workers)
+            return
+        with open(filename, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)
+                try:
+                    yield from self.scan(view)
+                finally:
+                    view.release()
+
+    # Parallel scans
+
+    def _scan_parallel(self, filename: str, size: int, workers: int):
+        bounds = [size * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(
+                    _scan_segment,
+                    self.automata,
+                    self.options,
+                    self.chunk_size,
+                    filename,
+                    bounds[i],
+                    bounds[i + 1],
+                )
+                for i in range(workers)
+            ]
+            yield from self._initial_matches(0)
+            true_bits = None
+            for i, future in enumerate(futures):
+                matches, end_bits = future.result()
+                if i > 0 and true_bits != self.matcher.initial_bits:
+                    extra, fixed_bits = self._fix_segment(
+                        filename, bounds[i], bounds[i + 1], true_bits
+                    )
+                    if fixed_bits is not None:
+                        end_bits = fixed_bits
+                    yield from heapq.merge(matches, extra)
+                else:
+                    yield from matches
+                true_bits = end_bits
+
+    def _fix_segment(self, filename: str, start: int, end: int, true_bits: int):
+        """
+        Re-scan a segment from its true start state in lockstep with the
+        guessed one until they meet. Return the matches only the true run
+        finds and, if they never meet, the true end state.
+        """
+        matcher = self.matcher
+        byte_symbols = self.byte_symbols
+        true_state = matcher.state(true_bits)
+        guess = matcher.start
+        extra = []
+        with open(filename, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for position in range(start, end):
+                    symbol = byte_symbols[data[position]]
+                    true_state = matcher.step(true_state, symbol)
+                    guess = matcher.step(guess, symbol)
+                    if true_state.bits == guess.bits:
+                        return extra, None
+                    if true_state.final and not guess.final:
+                        extra.append(position + 1)
+        return extra, true_state.bits
+
+
+def _scan_segment(automata, options, chunk_size, filename, start, end):
+    """Worker: scan file[start:end] from the search start state."""
+    scanner = Scanner(automata, chunk_size, **options)
+    state = scanner.matcher.start
+    matches = []
+    with open(filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                for offset in range(start, end, chunk_size):
+                    chunk = view[offset : min(offset + chunk_size, end)]
+                    state = scanner.scan_chunk(chunk, state, offset, matches)
+                    chunk.release()
+            finally:
+                view.release()
+    return array("q", matches), state.bits
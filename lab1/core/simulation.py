@@ -0,0 +1,128 @@
+"""
+Vectorized simulation of (epsilon-)NFAs over many words at once.
+
+A set of current states is a bit vector of `n_words` uint64 words. All words
+are advanced in lockstep: at step t every word that is still running reads
+its t-th symbol, and the successor sets of the whole batch are gathered from
+precomputed tables with NumPy fancy indexing.
+
+The tables are indexed by (symbol, byte position, byte value): for every
+8-state slice of the state vector they hold the union of the (epsilon-closed)
+successors of the states whose bits are set in that byte. One step is then a
+gather and an OR per byte of the state vector, which is fast for the small
+automata this is meant for; table memory grows with n^2.
+"""
+import numpy as np
+
+from lab1.core.compact import CompactAutomata
+from lab1.core.epsilon import epsilon_closures
+
+_WORD_MASK = (1 << 64) - 1
+
+
+def _to_words(bits: int, n_words: int) -> list:
+    return [(bits >> (64 * w)) & _WORD_MASK for w in range(n_words)]
+
+
+class BatchSimulator:
+    """Precomputed transition tables for running an automaton on word batches."""
+
+    def __init__(self, automata):
+        if not isinstance(automata, CompactAutomata):
+            automata = CompactAutomata.from_automata(automata)
+        self.automata = automata
+
+        n = automata.n_states
+        self.n_words = max(1, (n + 63) // 64)
+        self.n_chunks = max(1, (n + 7) // 8)
+        closures = epsilon_closures(automata)
+
+        symbols = [
+            x for x in range(automata.n_input_symbols) if x != automata.epsilon_id
+        ]
+        self.symbol_ids = {automata.symbols[x]: i for i, x in enumerate(symbols)}
+        # Unknown symbols map to an extra row that leads to the empty set.
+        self.dead = len(symbols)
+
+        tables = np.zeros(
+            (len(symbols) + 1, self.n_chunks, 256, self.n_words), dtype=np.uint64
+        )
+        for i, x in enumerate(symbols):
+            successors = []
+            for q in range(n):
+                bits = 0
+                for r in automata.successors(q, x):
+                    bits |= closures[r]
+                successors.append(bits)
+            for c in range(self.n_chunks):
+                row = [0] * 256
+                for b in range(1, 256):
+                    low = b & -b
+                    q = 8 * c + low.bit_length() - 1
+                    row[b] = row[b ^ low] | (successors[q] if q < n else 0)
+                tables[i, c] = [_to_words(bits, self.n_words) for bits in row]
+        self.tables = tables
+
+        final = sum(1 << q for q in range(n) if automata.final_flags[q])
+        self.start = np.array(
+            _to_words(closures[automata.initial], self.n_words), dtype=np.uint64
+        )
+        self.final = np.array(_to_words(final, self.n_words), dtype=np.uint64)
+
+        # Fast path for str words over single-character symbols.
+        chars = {s: i for s, i in self.symbol_ids.items() if isinstance(s, str)}
+        if chars and all(len(s) == 1 for s in chars):
+            codes = sorted(chars)
+            self._char_codes = np.array([ord(s) for s in codes], dtype=np.uint32)
+            self._char_ids = np.array([chars[s] for s in codes], dtype=np.intp)
+        else:
+            self._char_codes = None
+
+    def _encode(self, words: list):
+        """Return the lengths and the concatenated symbol ids of all words."""
+        lengths = np.fromiter(map(len, words), dtype=np.intp, count=len(words))
+        total = int(lengths.sum())
+        if self._char_codes is not None and all(isinstance(w, str) for w in words):
+            codes = np.frombuffer("".join(words).encode("utf-32-le"), dtype=np.uint32)
+            pos = np.searchsorted(self._char_codes, codes)
+            pos[pos == len(self._char_codes)] = 0
+            known = self._char_codes[pos] == codes
+            flat = np.where(known, self._char_ids[pos], self.dead)
+        else:
+            get, dead = self.symbol_ids.get, self.dead
+            flat = np.fromiter(
+                (get(s, dead) for word in words for s in word),
+                dtype=np.intp,
+                count=total,
+            )
+        return lengths, flat
+
+    def accepts_many(self, words) -> np.ndarray:
+        """Return a boolean array telling which of the words are accepted."""
+        words = list(words)
+        if not words:
+            return np.zeros(0, dtype=bool)
+        lengths, flat = self._encode(words)
+        offsets = np.zeros(len(words), dtype=np.intp)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+
+        # Longest words first, so the running words are always a prefix.
+        order = np.argsort(-lengths, kind="stable")
+        starts = offsets[order]
+        ascending = lengths[order][::-1]
+
+        current = np.tile(self.start, (len(words), 1))
+        for t in range(int(ascending[-1])):
+            active = len(words) - int(np.searchsorted(ascending, t, side="right"))
+            step_symbols = flat[starts[:active] + t]
+            states = current[:active]
+            following = np.zeros_like(states)
+            for c in range(self.n_chunks):
+                byte = states[:, c >> 3] >> np.uint64(8 * (c & 7))
+                byte &= np.uint64(0xFF)
+                following |= self.tables[step_symbols, c, byte.astype(np.intp)]
+            current[:active] = following
+
+        accepted = np.empty(len(words), dtype=bool)
+        accepted[order] = (current & self.final).any(axis=1)
+        return accepted
@@ -0,0 +1,136 @@
+"""
+Sets and dicts that count their own mutations.
+
+`Automata` keeps its states, alphabet, transitions and final states in these
+containers, all sharing one `Changes` counter, so the tables cached on an
+instance can tell in O(1) whether anything was edited since they were built.
+Target sets stored in a `TrackedDict` become `TrackedSet`s on the same
+counter. Operators that build a new container (`|`, `-`, `copy()`) return
+plain sets and dicts.
+
+A counter is claimed by the automaton it belongs to. A `TrackedDict` on an
+unclaimed counter is adopted by the `Automata` it is assigned to, counter and
+all, instead of being copied; converters that emit one directly (see
+`TrackedDict.adopt`) save a copy of every target set.
+"""
+from functools import wraps
+
+
+class Changes:
+    """Mutation counter shared by the containers of one automaton."""
+
+    __slots__ = ("count", "claimed")
+
+    def __init__(self, claimed: bool = False):
+        self.count = 0
+        self.claimed = claimed
+
+
+def _counting(method):
+    @wraps(method)
+    def mutator(self, *args, **kwargs):
+        self._changes.count += 1
+        return method(self, *args, **kwargs)
+
+    return mutator
+
+
+class TrackedSet(set):
+    """
+    A set that bumps its `Changes` counter on every in-place edit. Build it
+    with `tracked_set`.
+    """
+
+    __slots__ = ("_changes",)
+
+    def __reduce__(self):
+        return tracked_set, (list(self), self._changes)
+
+    def __repr__(self):
+        return repr(set(self))
+
+
+for _name in (
+    "add",
+    "clear",
+    "discard",
+    "pop",
+    "remove",
+    "update",
+    "difference_update",
+    "intersection_update",
+    "symmetric_difference_update",
+    "__ior__",
+    "__iand__",
+    "__isub__",
+    "__ixor__",
+):
+    setattr(TrackedSet, _name, _counting(getattr(set, _name)))
+
+
+def tracked_set(iterable, changes: Changes) -> TrackedSet:
+    """Return a `TrackedSet` of the items counting its edits in `changes`."""
+    # Cheaper than a Python-level __init__, which matters for the target
+    # sets of large transition functions.
+    tracked = TrackedSet(iterable)
+    tracked._changes = changes
+    return tracked
+
+
+class TrackedDict(dict):
+    """
+    A dict that bumps its `Changes` counter on every in-place edit, including
+    edits of the target sets it holds.
+    """
+
+    __slots__ = ("_changes",)
+
+    def __init__(self, items=(), changes: Changes = None):
+        super().__init__(items)
+        self._changes = Changes() if changes is None else changes
+        track = self._track
+        for key, value in dict.items(self):
+            if isinstance(value, set):
+                dict.__setitem__(self, key, track(value))
+
+    @classmethod
+    def adopt(cls, rows: dict, changes: Changes) -> "TrackedDict":
+        """
+        Wrap `rows` without checking its values, which must already be
+        `TrackedSet`s on `changes` (or not sets at all).
+        """
+        tracked = cls()
+        dict.update(tracked, rows)
+        tracked._changes = changes
+        return tracked
+
+    def _track(self, value):
+        if not isinstance(value, set):
+            return value
+        if isinstance(value, TrackedSet) and value._changes is self._changes:
+            return value
+        return tracked_set(value, self._changes)
+
+    def __reduce__(self):
+        return TrackedDict, (dict(self), self._changes)
+
+    def __setitem__(self, key, value):
+        self._changes.count += 1
+        dict.__setitem__(self, key, self._track(value))
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+for _name in ("__delitem__", "clear", "pop", "popitem"):
+    setattr(TrackedDict, _name, _counting(getattr(dict, _name)))
@@ -0,0 +1,97 @@
+"""
+Trimming: removal of states that are unreachable from a0 or cannot reach F.
+
+Both searches are plain BFS passes over an adjacency index of the interned
+automaton. The forward index is the CSR table of `CompactAutomata` itself,
+since the rows of one state are contiguous; the backward index is built from
+it in one pass. Everything is linear in the number of states and transitions.
+"""
+from array import array
+from dataclasses import dataclass, field
+
+from lab1.core.base import Automata
+from lab1.core.compact import CompactAutomata
+
+
+@dataclass
+class TrimResult:
+    automata: Automata  # The trimmed automaton
+    removed_states: set = field(default_factory=set)
+    removed_transitions: set = field(default_factory=set)  # (a, x, b) triples
+
+
+def _search(start: list, n: int, offsets, targets) -> bytearray:
+    """BFS over a CSR adjacency index; return a 0/1 flag per state."""
+    seen = bytearray(n)
+    queue = []
+    for q in start:
+        if not seen[q]:
+            seen[q] = 1
+            queue.append(q)
+    for q in queue:
+        for i in range(offsets[q], offsets[q + 1]):
+            r = targets[i]
+            if not seen[r]:
+                seen[r] = 1
+                queue.append(r)
+    return seen
+
+
+def trim(automata: Automata) -> TrimResult:
+    """
+    Keep only the states that are reachable from a0 and co-reachable to F
+    (a0 is always kept). Epsilon transitions count as edges in both searches.
+    """
+    compact = automata
+    if not isinstance(compact, CompactAutomata):
+        compact = CompactAutomata.from_automata(automata)
+
+    n, k = compact.n_states, compact.n_symbols
+    offsets, targets = compact.offsets, compact.targets
+
+    # The outgoing edges of state q are targets[offsets[q * k]:offsets[q * k + k]].
+    forward_offsets = [offsets[q * k] for q in range(n + 1)]
+    reachable = _search([compact.initial], n, forward_offsets, targets)
+
+    backward_offsets = array("q", bytes(8 * (n + 1)))
+    for r in targets:
+        backward_offsets[r + 1] += 1
+    for q in range(n):
+        backward_offsets[q + 1] += backward_offsets[q]
+    fill = array("q", backward_offsets)
+    sources = array("i", bytes(4 * len(targets)))
+    for q in range(n):
+        for i in range(forward_offsets[q], forward_offsets[q + 1]):
+            r = targets[i]
+            sources[fill[r]] = q
+            fill[r] += 1
+    finals = [q for q in range(n) if compact.final_flags[q]]
+    coreachable = _search(finals, n, backward_offsets, sources)
+
+    keep = bytearray(a & b for a, b in zip(reachable, coreachable))
+    keep[compact.initial] = 1
+
+    names, symbols = compact.states, compact.symbols
+    f = {}
+    removed_transitions = set()
+    for (a, x), row_targets in compact.f.items():
+        kept_a = keep[compact.state_ids[a]]
+        for b in row_targets:
+            if kept_a and keep[compact.state_ids[b]]:
+                f.setdefault((a, x), set()).add(b)
+            else:
+                removed_transitions.add((a, x, b))
+
+    A = {names[q] for q in range(n) if keep[q]}
+    return TrimResult(
+        Automata(
+            A,
+            set(symbols[: compact.n_input_symbols]),
+            f,
+            compact.a0,
+            {names[q] for q in finals if keep[q]},
+            compact.epsilon,
+        ),
+        {names[q] for q in range(n) if not keep[q]},
+        removed_transitions,
+    )
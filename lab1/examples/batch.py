@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lab1 import Automata, ENFAToNFAConverter
+from lab1.core.cache import ConversionCache
+from lab1.examples.example import list_files
+
+
+def convert_file(
+    directory: str,
+    filename: str,
+    results: str,
+    engine: str,
+    cache_dir: str = None,
+    cache_bytes: int = 256 * 2**20,
+    trim: bool = False,
+) -> dict:
+    """Convert one e-NFA file to an NFA file and report per-stage timings."""
+    name = os.path.splitext(filename)[0]
+    output = os.path.join(results, "nfa-{}".format(filename))
+    record = {"stage": "convert", "file": filename, "output": output}
+    try:
+        start = time.perf_counter()
+        enfa = Automata.load_from_file(os.path.join(directory, filename))
+        loaded = time.perf_counter()
+        cache = ConversionCache(cache_dir, cache_bytes) if cache_dir else None
+        converter = ENFAToNFAConverter(enfa, engine=engine, cache=cache, trim=trim)
+        nfa = converter.convert_to_nfa()
+        converted = time.perf_counter()
+        nfa.save_to_file(output)
+        saved = time.perf_counter()
+    except Exception as e:
+        record["error"] = "{}: {}".format(type(e).__name__, e)
+        return record
+
+    record.update(
+        name=name,
+        states=len(enfa.A),
+        nfa_states=len(nfa.A),
+        nfa_transitions=sum(len(targets) for targets in nfa.f.values()),
+        load_s=loaded - start,
+        convert_s=converted - loaded,
+        save_s=saved - converted,
+        total_s=saved - start,
+    )
+    if cache is not None:
+        record["cache_hit"] = cache.hits > 0
+    if converter.trim_result is not None:
+        record["trimmed_states"] = len(converter.trim_result.removed_states)
+        record["trimmed_transitions"] = len(converter.trim_result.removed_transitions)
+    return record
+
+
+def render_file(directory: str, filename: str, results: str) -> dict:
+    """Render the e-NFA and its converted NFA to PNG files."""
+    name = os.path.splitext(filename)[0]
+    record = {"stage": "render", "file": filename}
+    try:
+        start = time.perf_counter()
+        Automata.load_from_file(os.path.join(directory, filename)).visualize(
+            os.path.join(results, "e-nfa-{}.png".format(name))
+        )
+        Automata.load_from_file(
+            os.path.join(results, "nfa-{}".format(filename))
+        ).visualize(os.path.join(results, "nfa-{}.png".format(name)))
+        record["render_s"] = time.perf_counter() - start
+    except Exception as e:
+        record["error"] = "{}: {}".format(type(e).__name__, e)
+    return record
+
+
+def run_batch(
+    directory: str,
+    results: str,
+    summary,
+    workers: int = None,
+    render_workers: int = 0,
+    engine: str = "closure",
+    cache_dir: str = None,
+    cache_bytes: int = 256 * 2**20,
+    trim: bool = False,
+) -> int:
+    """
+    Convert every file in `directory` on a process pool and write one JSON
+    line per finished stage to `summary`. Rendering runs on a separate pool
+    as conversions finish, and is skipped if `render_workers` is 0. If
+    `cache_dir` is set, workers share a `ConversionCache` in that directory.
+    If `trim` is set, every e-NFA is trimmed before conversion.
+    Return the number of failed stages.
+    """
+    os.makedirs(results, exist_ok=True)
+    failures = 0
+
+    def emit(record):
+        nonlocal failures
+        failures += "error" in record
+        summary.write(json.dumps(record) + "\n")
+        summary.flush()
+
+    start = time.perf_counter()
+    renderer = ProcessPoolExecutor(render_workers) if render_workers else None
+    try:
+        with ProcessPoolExecutor(workers) as converter:
+            conversions = [
+                converter.submit(
+                    convert_file,
+                    directory,
+                    filename,
+                    results,
+                    engine,
+                    cache_dir,
+                    cache_bytes,
+                    trim,
+                )
+                for filename in list_files(directory)
+            ]
+            renders = []
+            for future in as_completed(conversions):
+                record = future.result()
+                emit(record)
+                if renderer is not None and "error" not in record:
+                    renders.append(
+                        renderer.submit(render_file, directory, record["file"], results)
+                    )
+        for future in as_completed(renders):
+            emit(future.result())
+    finally:
+        if renderer is not None:
+            renderer.shutdown()
+
+    emit(
+        {
+            "stage": "summary",
+            "files": len(conversions),
+            "failures": failures,
+            "wall_s": time.perf_counter() - start,
+        }
+    )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a directory of e-NFA files to NFAs in parallel."
+    )
+    parser.add_argument("--data", default="lab1/data")
+    parser.add_argument("--results", default="lab1/results")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="conversion processes (all cores)"
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=0,
+        help="PNG rendering processes; 0 skips rendering",
+    )
+    parser.add_argument(
+        "--engine", default="closure", choices=ENFAToNFAConverter.ENGINES
+    )
+    parser.add_argument("--cache", help="directory of the conversion cache")
+    parser.add_argument(
+        "--cache-size", type=int, default=256, help="cache size limit in MB"
+    )
+    parser.add_argument(
+        "--trim",
+        action="store_true",
+        help="drop unreachable and dead states before conversion",
+    )
+    parser.add_argument(
+        "--summary", default="-", help="JSON Lines summary file ('-' for stdout)"
+    )
+    args = parser.parse_args()
+
+    summary = sys.stdout if args.summary == "-" else open(args.summary, "w")
+    try:
+        failures = run_batch(
+            args.data,
+            args.results,
+            summary,
+            workers=args.workers,
+            render_workers=args.render_workers,
+            engine=args.engine,
+            cache_dir=args.cache,
+            cache_bytes=args.cache_size * 2**20,
+            trim=args.trim,
+        )
+    finally:
+        if summary is not sys.stdout:
+            summary.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import argparse
 import os
 
 from lab1 import Automata, ENFAToNFAConverter
+from lab1.core.cache import ConversionCache
 
 
 def list_files(directory):
@@ -10,7 +12,7 @@ def list_files(directory):
             yield filename
 
 
-def process_file(directory: str, filename: str):
+def process_file(directory: str, filename: str, cache: ConversionCache = None):
     print("Processing file: {}".format(filename))
 
     automata = Automata.load_from_file(os.path.join(directory, filename))
@@ -21,7 +23,7 @@ def process_file(directory: str, filename: str):
         "lab1/results/e-nfa-{}.png".format(os.path.splitext(filename)[0])
     )
 
-    converter = ENFAToNFAConverter(automata)
+    converter = ENFAToNFAConverter(automata, cache=cache)
 
     nfa = converter.convert_to_nfa()
 
@@ -34,5 +36,19 @@ def process_file(directory: str, filename: str):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Convert the lab1 e-NFA examples.")
+    parser.add_argument("--cache", help="directory of the conversion cache")
+    parser.add_argument(
+        "--cache-size", type=int, default=256, help="cache size limit in MB"
+    )
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache:
+        cache = ConversionCache(args.cache, args.cache_size * 2**20)
+
     for file in list_files("lab1/data"):
-        process_file("lab1/data", file)
+        process_file("lab1/data", file, cache)
+
+    if cache is not None:
+        print("Conversion cache: {}".format(cache.stats()))
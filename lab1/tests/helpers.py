@@ -0,0 +1,63 @@
+"""
+Shared test helpers: a small random ENFA generator, a reference simulator
+and assertions comparing languages on every word up to a length.
+"""
+import itertools
+import unittest
+
+from lab1.core.random_automata import random_enfa as generate_enfa
+
+
+def random_enfa(seed, n_states=12, n_symbols=3, density=0.15, epsilon_density=0.15):
+    """
+    Small random ENFA; `density` and `epsilon_density` are the probabilities
+    of every possible transition.
+    """
+    return generate_enfa(
+        seed,
+        n_states,
+        n_symbols,
+        density * n_states,
+        epsilon_density * n_states,
+        final_ratio=0.2,
+    )
+
+
+def accepts(automata, word):
+    """Reference simulation of an (epsilon-)NFA on a word."""
+
+    def close(states):
+        stack, seen = list(states), set(states)
+        while stack:
+            for b in automata.f.get((stack.pop(), automata.epsilon), ()):
+                if b not in seen:
+                    seen.add(b)
+                    stack.append(b)
+        return seen
+
+    current = close({automata.a0})
+    for symbol in word:
+        current = close({b for a in current for b in automata.f.get((a, symbol), ())})
+    return bool(current & automata.F)
+
+
+def all_words(alphabet, max_length):
+    """Every word of at most `max_length` symbols, in length-lexicographic order."""
+    alphabet = sorted(alphabet)
+    for length in range(max_length + 1):
+        yield from itertools.product(alphabet, repeat=length)
+
+
+class LanguageTestCase(unittest.TestCase):
+    """Test case with assertions over all words up to `max_word_length`."""
+
+    max_word_length = 5
+
+    def assertLanguage(self, automata, predicate, alphabet, max_length=None):
+        if max_length is None:
+            max_length = self.max_word_length
+        for word in all_words(alphabet, max_length):
+            self.assertEqual(accepts(automata, word), predicate(word), word)
+
+    def assertSameLanguage(self, left, right, max_length=None):
+        self.assertLanguage(left, lambda word: accepts(right, word), left.X, max_length)
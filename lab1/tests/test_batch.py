@@ -0,0 +1,41 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from lab1 import Automata, ENFAToNFAConverter
+from lab1.examples.batch import run_batch
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestBatchDriver(unittest.TestCase):
+    def test_converts_all_files_and_streams_summary(self):
+        summary = io.StringIO()
+        with tempfile.TemporaryDirectory() as results:
+            failures = run_batch(DATA_DIR, results, summary, workers=2)
+            self.assertEqual(failures, 0)
+
+            records = [json.loads(line) for line in summary.getvalue().splitlines()]
+            converted = {r["file"] for r in records if r["stage"] == "convert"}
+            self.assertEqual(converted, set(os.listdir(DATA_DIR)))
+            self.assertEqual(records[-1]["stage"], "summary")
+            self.assertTrue(all("convert_s" in r for r in records[:-1]))
+
+            for filename in converted:
+                enfa = Automata.load_from_file(os.path.join(DATA_DIR, filename))
+                expected = ENFAToNFAConverter(enfa).convert_to_nfa()
+                actual = Automata.load_from_file(
+                    os.path.join(results, "nfa-{}".format(filename))
+                )
+                self.assertEqual(actual, expected, filename)
+
+    def test_errors_are_reported_per_file(self):
+        summary = io.StringIO()
+        with tempfile.TemporaryDirectory() as data, tempfile.TemporaryDirectory() as results:
+            with open(os.path.join(data, "broken.json"), "w") as file:
+                file.write("{not json")
+            self.assertEqual(run_batch(data, results, summary, workers=1), 1)
+            record = json.loads(summary.getvalue().splitlines()[0])
+            self.assertIn("error", record)
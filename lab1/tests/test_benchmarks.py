@@ -0,0 +1,20 @@
+import copy
+import unittest
+
+from lab1.benchmarks.suite import compare, run_case
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_run_case_and_compare(self):
+        result = {"cases": {"tiny": run_case(30, 2, 1.0, 0.5, repeat=1)}}
+        self.assertIn("convert_to_nfa[closure]", result["cases"]["tiny"]["results"])
+
+        slower = copy.deepcopy(result)
+        slower["cases"]["tiny"]["results"]["to_json"]["seconds"] *= 2
+        regressions = [row[:3] for row in compare(slower, result) if row[-1]]
+        self.assertEqual(regressions, [("tiny", "to_json", "seconds")])
+        self.assertFalse(any(row[-1] for row in compare(result, result)))
+
+
+if __name__ == "__main__":
+    unittest.main()
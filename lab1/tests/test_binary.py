@@ -0,0 +1,113 @@
+import mmap
+import os
+import struct
+import tempfile
+import unittest
+
+from lab1 import Automata, CompactAutomata, ENFAToNFAConverter
+from lab1.core import binary
+from lab1.core.binary import MappedAutomata, binary_to_json, json_to_binary
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestBinaryFormat(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.example_automata = Automata(
+            A={"0", "1", "2"},
+            X={"x", "y", "z"},
+            f={
+                ("0", "x"): {"0"},
+                ("1", "y"): {"1"},
+                ("2", "z"): {"2"},
+                ("0", "epsilon"): {"1"},
+                ("1", "epsilon"): {"2"},
+            },
+            a0="0",
+            F={"2"},
+            epsilon="epsilon",
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_save_and_load(self):
+        self.example_automata.save_to_file(self.path("a.bin"), binary=True)
+        loaded = Automata.load_from_file(self.path("a.bin"))
+        self.assertIsInstance(loaded, MappedAutomata)
+        self.assertEqual(loaded, self.example_automata)
+        self.assertEqual(loaded.to_json(), self.example_automata.to_json())
+        self.assertEqual(
+            ENFAToNFAConverter(loaded, engine="closure").convert_to_nfa(),
+            ENFAToNFAConverter(self.example_automata).convert_to_nfa(),
+        )
+        loaded.close()
+
+    def test_json_round_trip_is_exact(self):
+        for filename in sorted(os.listdir(DATA_DIR)):
+            original = Automata.load_from_file(os.path.join(DATA_DIR, filename))
+            original.save_to_file(self.path("original.json"))
+            json_to_binary(self.path("original.json"), self.path("a.bin"))
+            binary_to_json(self.path("a.bin"), self.path("copy.json"))
+            with open(self.path("original.json")) as file:
+                expected = file.read()
+            with open(self.path("copy.json")) as file:
+                self.assertEqual(file.read(), expected, filename)
+
+    def test_int_states_and_no_epsilon(self):
+        automata = CompactAutomata(
+            A={1, 2, 3},
+            X={"a"},
+            f={(1, "a"): {2, 3}, (3, "a"): {1}},
+            a0=1,
+            F={3},
+        )
+        automata.save_to_file(self.path("a.bin"), binary=True)
+        loaded = MappedAutomata.open(self.path("a.bin"))
+        self.assertIsNone(loaded.epsilon)
+        self.assertEqual(loaded.A, {1, 2, 3})
+        self.assertEqual(loaded.f[(1, "a")], {2, 3})
+        self.assertEqual(list(loaded.successors(0, 0)), [1, 2])
+        self.assertEqual(loaded.accepts_many(["a", "aa", "aaa"]).tolist(), [1, 0, 1])
+        loaded.close()
+
+    def test_rejects_json_files(self):
+        self.example_automata.save_to_file(self.path("a.json"))
+        with self.assertRaises(ValueError):
+            MappedAutomata.open(self.path("a.json"))
+
+    def test_corrupt_files_are_released(self):
+        self.example_automata.save_to_file(self.path("a.bin"), binary=True)
+        with open(self.path("a.bin"), "rb") as file:
+            data = file.read()
+        # n_states sits after the magic, the version and the flags.
+        wrong_count = bytearray(data)
+        struct.pack_into("<q", wrong_count, 16, 1000)
+        broken = {
+            "truncated.bin": data[: len(data) // 2],
+            "wrong_count.bin": bytes(wrong_count),
+        }
+
+        mappings = []
+
+        class RecordingMmap(mmap.mmap):
+            def __new__(cls, *args, **kwargs):
+                mapping = super().__new__(cls, *args, **kwargs)
+                mappings.append(mapping)
+                return mapping
+
+        binary.mmap.mmap = RecordingMmap
+        try:
+            for name, content in broken.items():
+                with open(self.path(name), "wb") as file:
+                    file.write(content)
+                with self.assertRaises(ValueError, msg=name):
+                    MappedAutomata.open(self.path(name))
+        finally:
+            binary.mmap.mmap = mmap.mmap
+        self.assertEqual(len(mappings), len(broken))
+        self.assertTrue(all(mapping.closed for mapping in mappings))
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from lab1 import Automata, CompactAutomata, ENFAToNFAConverter
+from lab1.core.cache import ConversionCache
+from lab1.tests.helpers import random_enfa
+
+
+class TestConversionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ConversionCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_matches_fresh_conversion(self):
+        for seed in range(5):
+            enfa = random_enfa(seed)
+            fresh = ENFAToNFAConverter(enfa).convert_to_nfa()
+            first = ENFAToNFAConverter(enfa, cache=self.cache).convert_to_nfa()
+            second = ENFAToNFAConverter(
+                enfa, engine="closure", cache=self.cache
+            ).convert_to_nfa()
+            self.assertEqual(first, fresh)
+            self.assertEqual(second, fresh)
+        self.assertEqual(self.cache.stats(), {"hits": 5, "misses": 5, "evictions": 0})
+
+    def test_key_ignores_representation_and_order(self):
+        enfa = random_enfa(1)
+        reordered = Automata(
+            set(sorted(enfa.A, reverse=True)),
+            enfa.X,
+            dict(reversed(list(enfa.f.items()))),
+            enfa.a0,
+            enfa.F,
+            enfa.epsilon,
+        )
+        key = self.cache.key(enfa)
+        self.assertEqual(self.cache.key(reordered), key)
+        self.assertEqual(self.cache.key(CompactAutomata.from_automata(enfa)), key)
+        self.assertNotEqual(self.cache.key(random_enfa(2)), key)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        nfa = ENFAToNFAConverter(random_enfa(0)).convert_to_nfa()
+        entry_size = len(nfa.to_json())
+        cache = ConversionCache(self.tmp.name, max_bytes=2 * entry_size)
+        for i, key in enumerate(["a", "b"]):
+            cache.put(key, nfa)
+            os.utime(os.path.join(self.tmp.name, key + ".json"), (i, i))
+        self.assertIsNotNone(cache.get("a"))  # "a" is now the most recent entry
+        cache.put("c", nfa)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_corrupt_entry_is_a_miss(self):
+        with open(os.path.join(self.tmp.name, "bad.json"), "w") as file:
+            file.write("{")
+        self.assertIsNone(self.cache.get("bad"))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "bad.json")))
+        self.assertEqual(
+            [name for name in os.listdir(self.tmp.name) if name.endswith(".tmp")], []
+        )
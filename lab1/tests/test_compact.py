@@ -0,0 +1,60 @@
+import json
+import unittest
+
+from lab1 import Automata, CompactAutomata, ENFAToNFAConverter
+
+
+class TestCompactAutomata(unittest.TestCase):
+    def setUp(self):
+        # Example ENFA for testing
+        self.example_automata = Automata(
+            A={"0", "1", "2"},
+            X={"x", "y", "z"},
+            f={
+                ("0", "x"): {"0"},
+                ("1", "y"): {"1"},
+                ("2", "z"): {"2"},
+                ("0", "epsilon"): {"1"},
+                ("1", "epsilon"): {"2"},
+            },
+            a0="0",
+            F={"2"},
+            epsilon="epsilon",
+        )
+        self.compact = CompactAutomata.from_automata(self.example_automata)
+
+    def test_views_match_original(self):
+        self.assertEqual(self.compact.A, self.example_automata.A)
+        self.assertEqual(self.compact.X, self.example_automata.X)
+        self.assertEqual(self.compact.F, self.example_automata.F)
+        self.assertEqual(self.compact.f, self.example_automata.f)
+        self.assertEqual(self.compact, self.example_automata)
+        self.assertEqual(self.example_automata, self.compact)
+
+    def test_csr_layout(self):
+        q = self.compact.state_ids["0"]
+        eps = self.compact.epsilon_id
+        self.assertEqual(self.compact.symbols[eps], "epsilon")
+        self.assertEqual(
+            list(self.compact.successors(q, eps)), [self.compact.state_ids["1"]]
+        )
+        self.assertEqual(len(self.compact.targets), 5)
+        self.assertEqual(len(self.compact.f), 5)
+
+    def test_json_round_trip(self):
+        self.assertEqual(
+            json.loads(self.compact.to_json()),
+            json.loads(self.example_automata.to_json()),
+        )
+        loaded = CompactAutomata.from_json(self.compact.to_json())
+        self.assertIsInstance(loaded, CompactAutomata)
+        self.assertEqual(loaded.to_automata(), self.example_automata)
+
+    def test_converter_accepts_compact_input(self):
+        expected = ENFAToNFAConverter(self.example_automata).convert_to_nfa()
+        actual = ENFAToNFAConverter(self.compact).convert_to_nfa()
+        self.assertEqual(actual, expected)
+
+    def test_unknown_target_raises(self):
+        with self.assertRaises(ValueError):
+            CompactAutomata({"0"}, {"x"}, {("0", "x"): {"1"}}, "0", set())
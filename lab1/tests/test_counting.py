@@ -0,0 +1,57 @@
+import collections
+import itertools
+import unittest
+
+from lab1 import Automata, RegexToENFAConverter
+from lab1.core.counting import WordCounter
+from lab1.tests.helpers import accepts, random_enfa
+
+
+class TestWordCounting(unittest.TestCase):
+    def test_counts_match_enumeration(self):
+        for seed in range(10):
+            enfa = random_enfa(seed, n_states=8)
+            expected = [
+                sum(accepts(enfa, w) for w in itertools.product("abc", repeat=n))
+                for n in range(6)
+            ]
+            self.assertEqual(enfa.count_words(5), expected, seed)
+
+    def test_large_counts_are_exact(self):
+        automata = Automata({0}, {"a", "b", "c"}, {}, 0, {0})
+        automata.f = {(0, x): {0} for x in automata.X}
+        self.assertEqual(automata.count_words(100)[-1], 3**100)
+        self.assertEqual(len(automata.sample_words(100, size=5, seed=0)[0]), 100)
+
+    def test_samples_are_accepted_and_uniform(self):
+        enfa = RegexToENFAConverter("ab|ba|aa|b(a|b)b").convert_to_enfa()
+        counter = WordCounter(enfa)
+        samples = counter.sample(2, size=30000, seed=0)
+        frequencies = collections.Counter(samples)
+        self.assertEqual(set(frequencies), {("a", "b"), ("b", "a"), ("a", "a")})
+        for count in frequencies.values():
+            self.assertAlmostEqual(count / 30000, 1 / 3, delta=0.02)
+
+        samples = counter.sample(3, size=20000, seed=1, up_to=True)
+        lengths = collections.Counter(map(len, samples))
+        self.assertAlmostEqual(lengths[3] / 20000, 2 / 5, delta=0.02)
+        self.assertTrue(all(accepts(enfa, word) for word in samples))
+
+    def test_many_samples_of_exponential_language(self):
+        enfa = RegexToENFAConverter("(a|b)*a(a|b){8}").convert_to_enfa()
+        samples = enfa.sample_words(20, size=10**5, seed=2)
+        self.assertEqual(len(samples), 10**5)
+        self.assertTrue(all(word[-9] == "a" for word in samples))
+        self.assertTrue(all(accepts(enfa, word) for word in samples[:200]))
+
+    def test_no_accepted_words(self):
+        enfa = RegexToENFAConverter("aaa").convert_to_enfa()
+        self.assertEqual(enfa.count_words(4), [0, 0, 0, 1, 0])
+        with self.assertRaises(ValueError):
+            enfa.sample_words(2)
+        with self.assertRaises(ValueError):
+            enfa.sample_words(2, up_to=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
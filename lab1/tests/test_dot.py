@@ -0,0 +1,68 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from lab1 import Automata, CompactAutomata
+
+
+class TestDotExport(unittest.TestCase):
+    def setUp(self):
+        self.example_automata = Automata(
+            A={"0", "1", "2"},
+            X={"x", "y", "z"},
+            f={
+                ("0", "x"): {"0", "1"},
+                ("0", "y"): {"1"},
+                ("1", "y"): {"2"},
+                ("2", "z"): {"2"},
+                ("0", "epsilon"): {"2"},
+            },
+            a0="0",
+            F={"2"},
+            epsilon="epsilon",
+        )
+
+    def dot(self, automata, **options):
+        out = io.StringIO()
+        automata.write_dot(out, **options)
+        return out.getvalue()
+
+    def test_merges_parallel_edges(self):
+        text = self.dot(self.example_automata)
+        self.assertTrue(text.startswith('digraph "automata" {'))
+        self.assertIn('"__start" -> "0";', text)
+        self.assertIn('"2" [shape=doublecircle];', text)
+        self.assertIn('"0" -> "0" [label="x"];', text)
+        self.assertIn('"0" -> "1" [label="x, y"];', text)
+        self.assertIn('"0" -> "2" [label="ε"];', text)
+
+    def test_separate_edges(self):
+        text = self.dot(self.example_automata, merge_edges=False)
+        self.assertIn('"0" -> "1" [label="x"];', text)
+        self.assertIn('"0" -> "1" [label="y"];', text)
+
+    def test_depth_and_node_limits(self):
+        A = {str(i) for i in range(100)}
+        f = {(str(i), "a"): {str(i + 1)} for i in range(99)}
+        chain = CompactAutomata(A, {"a"}, f, "0", {"99"})
+
+        text = self.dot(chain, depth=3)
+        self.assertIn('"2" -> "3"', text)
+        self.assertNotIn('"3" -> "4"', text)
+        self.assertNotIn('"4"', text)
+        self.assertIn("// 4 of 100 states drawn", text)
+
+        self.assertEqual(chain.write_dot(io.StringIO(), max_nodes=10), 10)
+
+    def test_quotes_names(self):
+        automata = Automata({'a"b'}, {"x"}, {('a"b', "x"): {'a"b'}}, 'a"b', set())
+        self.assertIn('"a\\"b" -> "a\\"b"', self.dot(automata))
+
+    @unittest.skipUnless(shutil.which("dot"), "Graphviz dot is not installed")
+    def test_render_dot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "automata.png")
+            self.example_automata.render_dot(filename)
+            self.assertTrue(os.path.getsize(filename))
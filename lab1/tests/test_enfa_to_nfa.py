@@ -1,6 +1,11 @@
+import os
 import unittest
 
-from lab1 import Automata, ENFAToNFAConverter
+from lab1 import Automata, CompactAutomata, ENFAToNFAConverter
+from lab1.core.epsilon import epsilon_closures
+from lab1.tests.helpers import random_enfa
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 
 
 class TestEnfaToNfaConversion(unittest.TestCase):
@@ -41,3 +46,42 @@ class TestEnfaToNfaConversion(unittest.TestCase):
 
         # Assert that the actual NFA matches the expected NFA
         self.assertTrue(actual_automata == expected_automata)
+
+
+class TestClosureEngine(unittest.TestCase):
+    def test_matches_worklist_engine_on_data_files(self):
+        for filename in sorted(os.listdir(DATA_DIR)):
+            enfa = Automata.load_from_file(os.path.join(DATA_DIR, filename))
+            expected = ENFAToNFAConverter(enfa).convert_to_nfa()
+            actual = ENFAToNFAConverter(enfa, engine="closure").convert_to_nfa()
+            self.assertEqual(actual, expected, filename)
+
+    def test_matches_worklist_engine_on_random_enfas(self):
+        for seed in range(50):
+            enfa = random_enfa(seed)
+            expected = ENFAToNFAConverter(enfa).convert_to_nfa()
+            actual = ENFAToNFAConverter(enfa, engine="closure").convert_to_nfa()
+            self.assertEqual(actual, expected, seed)
+
+    def test_epsilon_cycles_share_a_closure(self):
+        enfa = CompactAutomata(
+            A={"0", "1", "2", "3"},
+            X={"x"},
+            f={
+                ("0", "epsilon"): {"1"},
+                ("1", "epsilon"): {"2"},
+                ("2", "epsilon"): {"0", "3"},
+            },
+            a0="0",
+            F={"3"},
+            epsilon="epsilon",
+        )
+        closures = epsilon_closures(enfa)
+        self.assertEqual(closures[0], closures[1])
+        self.assertEqual(closures[0], closures[2])
+        self.assertEqual(closures[0], 0b1111)
+        self.assertEqual(closures[3], 0b1000)
+
+    def test_unknown_engine_raises(self):
+        with self.assertRaises(ValueError):
+            ENFAToNFAConverter(random_enfa(0), engine="magic")
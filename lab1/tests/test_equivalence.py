@@ -0,0 +1,74 @@
+import time
+import unittest
+
+from lab1 import Automata, ENFAToNFAConverter, RegexToENFAConverter
+from lab1.core.equivalence import (
+    equivalence_counterexample,
+    equivalent,
+    included,
+    inclusion_counterexample,
+)
+from lab1.tests.helpers import accepts, all_words, random_enfa
+
+
+def shortest_difference(a, b, alphabet, inclusion, max_length=6):
+    for word in all_words(alphabet, max_length):
+        in_a, in_b = accepts(a, word), accepts(b, word)
+        if in_a and not in_b or not inclusion and in_b and not in_a:
+            return word
+    return None
+
+
+class TestEquivalence(unittest.TestCase):
+    def test_conversion_preserves_language(self):
+        for seed in range(10):
+            enfa = random_enfa(seed)
+            nfa = ENFAToNFAConverter(enfa).convert_to_nfa()
+            self.assertTrue(equivalent(enfa, nfa), seed)
+            self.assertTrue(included(nfa, enfa), seed)
+
+    def test_shortest_counterexamples_on_random_enfas(self):
+        for seed in range(20):
+            a = random_enfa(seed, n_states=6, n_symbols=2)
+            b = random_enfa(seed + 100, n_states=6, n_symbols=2)
+            for inclusion, check in (
+                (False, equivalence_counterexample),
+                (True, inclusion_counterexample),
+            ):
+                word = check(a, b)
+                expected = shortest_difference(a, b, a.X | b.X - {"epsilon"}, inclusion)
+                if expected is None:
+                    self.assertTrue(word is None or len(word) > 6, (seed, word))
+                    continue
+                self.assertEqual(len(word), len(expected), (seed, inclusion))
+                self.assertTrue(accepts(a, word) or not inclusion and accepts(b, word))
+                self.assertNotEqual(accepts(a, word), accepts(b, word))
+
+    def test_inclusion_is_one_sided(self):
+        small = RegexToENFAConverter("ab*").convert_to_enfa()
+        large = RegexToENFAConverter("(a|b)*").convert_to_enfa()
+        self.assertTrue(included(small, large))
+        self.assertFalse(included(large, small))
+        self.assertEqual(inclusion_counterexample(large, small), ())
+        self.assertEqual(equivalence_counterexample(small, large), ())
+
+    def test_different_alphabets(self):
+        a = Automata({0, 1}, {"x"}, {(0, "x"): {1}}, 0, {1})
+        b = Automata({0, 1}, {"x", "y"}, {(0, "x"): {1}, (0, "y"): {1}}, 0, {1})
+        self.assertTrue(included(a, b))
+        self.assertEqual(inclusion_counterexample(b, a), ("y",))
+
+    def test_exponential_determinization(self):
+        # The minimal DFA of (a|b)*a(a|b){n} has 2^(n+1) states.
+        n = 24
+        enfa = RegexToENFAConverter(f"(a|b)*a(a|b){{{n}}}").convert_to_enfa()
+        nfa = ENFAToNFAConverter(enfa).convert_to_nfa()
+        shorter = RegexToENFAConverter(f"(a|b)*a(a|b){{{n - 1}}}").convert_to_enfa()
+        start = time.perf_counter()
+        self.assertTrue(equivalent(enfa, nfa))
+        self.assertEqual(len(equivalence_counterexample(enfa, shorter)), n)
+        self.assertLess(time.perf_counter() - start, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
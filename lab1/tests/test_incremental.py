@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from lab1 import ENFAToNFAConverter, IncrementalENFAToNFAConverter
+from lab1.tests.helpers import random_enfa
+
+
+class TestIncrementalConversion(unittest.TestCase):
+    def assertMatchesFullConversion(self, converter, message=None):
+        expected = ENFAToNFAConverter(converter.enfa).convert_to_nfa()
+        self.assertEqual(converter.convert_to_nfa(), expected, message)
+
+    def test_random_edit_sequences(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            enfa = random_enfa(seed, n_states=10, density=0.1, epsilon_density=0.1)
+            converter = IncrementalENFAToNFAConverter(enfa)
+            self.assertMatchesFullConversion(converter, seed)
+
+            states = sorted(enfa.A)
+            symbols = sorted(enfa.X) + ["epsilon"] * 2
+            for step in range(40):
+                existing = [
+                    (a, x, b)
+                    for (a, x), targets in converter.f.items()
+                    for b in targets
+                ]
+                if existing and rng.random() < 0.4:
+                    converter.remove_transition(*rng.choice(sorted(existing)))
+                else:
+                    converter.add_transition(
+                        rng.choice(states), rng.choice(symbols), rng.choice(states)
+                    )
+                self.assertMatchesFullConversion(converter, (seed, step))
+
+    def test_epsilon_cycle_edits(self):
+        enfa = random_enfa(0, n_states=4, density=0, epsilon_density=0)
+        converter = IncrementalENFAToNFAConverter(enfa)
+        converter.add_transition("0", "epsilon", "1")
+        converter.add_transition("1", "epsilon", "2")
+        converter.add_transition("2", "epsilon", "0")
+        converter.add_transition("2", "a", "3")
+        self.assertMatchesFullConversion(converter)
+        self.assertEqual(converter.convert_to_nfa().f[("0", "a")], {"3"})
+        converter.remove_transition("1", "epsilon", "2")
+        self.assertMatchesFullConversion(converter)
+        self.assertNotIn(("0", "a"), converter.convert_to_nfa().f)
+
+    def test_new_states_and_invalid_edits(self):
+        converter = IncrementalENFAToNFAConverter(random_enfa(1, n_states=3))
+        converter.add_transition("0", "a", "new")
+        self.assertIn("new", converter.convert_to_nfa().A)
+        self.assertMatchesFullConversion(converter)
+        with self.assertRaises(ValueError):
+            converter.add_transition("0", "unknown", "1")
+        with self.assertRaises(ValueError):
+            converter.remove_transition("new", "a", "0")
+
+    def test_result_is_patched_in_place(self):
+        converter = IncrementalENFAToNFAConverter(random_enfa(2, n_states=8))
+        nfa = converter.convert_to_nfa()
+        rows = dict(converter._rows)
+        converter.add_transition("0", "a", "new")
+        self.assertIs(converter.convert_to_nfa(), nfa)
+        self.assertIn("new", nfa.A)
+        self.assertMatchesFullConversion(converter)
+        # Only the edited row was recomputed.
+        recomputed = {
+            key for key, row in rows.items() if converter._rows[key] is not row
+        }
+        self.assertEqual(recomputed, {("0", "a")})
+
+        converter.remove_transition("0", "a", "new")
+        self.assertIs(converter.convert_to_nfa(), nfa)
+        self.assertNotIn("new", nfa.A)
+        self.assertMatchesFullConversion(converter)
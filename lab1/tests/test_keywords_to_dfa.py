@@ -0,0 +1,96 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from lab1 import Automata, KeywordsToDFAConverter
+from lab1.core.scanner import Scanner
+from lab1.tests.helpers import accepts
+
+
+def random_keywords(seed, count, alphabet="abcd", max_length=6):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(1, max_length)))
+        for _ in range(count)
+    ]
+
+
+def run(dfa, word):
+    state = dfa.a0
+    for symbol in word:
+        (state,) = dfa.f[(state, symbol)]
+    return state
+
+
+class TestKeywordsToDFA(unittest.TestCase):
+    def test_classic_example(self):
+        converter = KeywordsToDFAConverter(["he", "she", "his", "hers"])
+        dfa = converter.convert_to_dfa()
+        self.assertEqual(dfa.X, {"e", "h", "i", "r", "s"})
+        self.assertEqual(len(dfa.f), len(dfa.A) * len(dfa.X))
+        for word, expected in [("shers", True), ("hishe", True), ("shis", True)]:
+            self.assertEqual(accepts(dfa, word), expected, word)
+        for word in ["", "h", "hi", "shr", "hisr"]:
+            self.assertFalse(accepts(dfa, word), word)
+        # "she" ends with "he", and the longer keyword wins.
+        she = run(dfa, "she")
+        self.assertEqual(converter.accept_labels[she], 1)
+        self.assertEqual(converter.failure_links[she], run(dfa, "he"))
+        self.assertEqual(run(dfa, "hersh"), run(dfa, "sh"))
+
+    def test_accepts_words_ending_with_a_keyword(self):
+        for seed in range(5):
+            keywords = random_keywords(seed, 30)
+            dfa = KeywordsToDFAConverter(keywords).convert_to_dfa()
+            for word in random_keywords(seed + 100, 300, max_length=12):
+                expected = any(word.endswith(keyword) for keyword in keywords)
+                self.assertEqual(accepts(dfa, word), expected, (seed, word))
+
+    def test_labels_and_symbol_sequences(self):
+        converter = KeywordsToDFAConverter(
+            {"get": ("GET", "/"), "post": ("POST", "/"), "root": ("/",)},
+            alphabet={"PUT"},
+        )
+        dfa = converter.convert_to_dfa()
+        self.assertIn("PUT", dfa.X)
+        self.assertTrue(accepts(dfa, ["PUT", "GET", "/"]))
+        self.assertEqual(
+            sorted(converter.accept_labels.values()), ["get", "post", "root"]
+        )
+
+    def test_scanner_finds_every_occurrence(self):
+        keywords = random_keywords(1, 200, max_length=5)
+        rng = random.Random(2)
+        text = "".join(rng.choice("abcd") for _ in range(3000))
+        dfa = KeywordsToDFAConverter(keywords).convert_to_dfa()
+        expected = [
+            end
+            for end in range(1, len(text) + 1)
+            if any(text.endswith(keyword, 0, end) for keyword in keywords)
+        ]
+        self.assertEqual(list(Scanner(dfa).scan(text.encode())), expected)
+
+    def test_save_load_and_dot(self):
+        dfa = KeywordsToDFAConverter(random_keywords(3, 50)).convert_to_dfa()
+        with tempfile.TemporaryDirectory() as tmp:
+            for binary in (False, True):
+                filename = os.path.join(tmp, f"keywords-{binary}")
+                dfa.save_to_file(filename, binary=binary)
+                self.assertEqual(Automata.load_from_file(filename), dfa)
+        out = io.StringIO()
+        dfa.write_dot(out)
+        self.assertIn("digraph", out.getvalue())
+
+    def test_many_keywords(self):
+        keywords = random_keywords(4, 10**4, alphabet="abcdefghij", max_length=10)
+        converter = KeywordsToDFAConverter(keywords)
+        dfa = converter.convert_to_dfa()
+        self.assertEqual(len(dfa.X), 10)
+        for keyword in keywords[:100]:
+            self.assertTrue(accepts(dfa, "j" + keyword))
+
+
+if __name__ == "__main__":
+    unittest.main()
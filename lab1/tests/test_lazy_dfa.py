@@ -0,0 +1,103 @@
+import random
+import sys
+import unittest
+
+from lab1 import RegexToENFAConverter
+from lab1.core.lazy_dfa import LazyDFA
+from lab1.tests.helpers import accepts, random_enfa
+
+
+def random_words(seed, alphabet, count=300, max_length=30):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        for _ in range(count)
+    ]
+
+
+class TestLazyDFA(unittest.TestCase):
+    def setUp(self):
+        # Its minimal DFA has 2^9 states.
+        self.enfa = RegexToENFAConverter("(a|b)*a(a|b){8}").convert_to_enfa()
+        self.words = random_words(0, "ab")
+        self.expected = [accepts(self.enfa, word) for word in self.words]
+
+    def test_matches_nfa_simulation(self):
+        matcher = LazyDFA(self.enfa)
+        self.assertEqual(matcher.accepts_many(self.words), self.expected)
+        self.assertEqual(matcher.flushes, 0)
+        self.assertEqual(matcher.fallbacks, 0)
+
+        for seed in range(10):
+            enfa = random_enfa(seed)
+            words = random_words(seed, "abcd", count=50, max_length=8)
+            self.assertEqual(
+                LazyDFA(enfa).accepts_many(words),
+                [accepts(enfa, word) for word in words],
+                seed,
+            )
+
+    def test_hit_rate_grows_on_repeated_input(self):
+        matcher = LazyDFA(self.enfa)
+        matcher.accepts_many(self.words)
+        first, misses = matcher.hit_rate, matcher.misses
+        matcher.accepts_many(self.words)
+        self.assertGreater(matcher.hit_rate, first)
+        # Every transition taken the second time is already cached.
+        self.assertEqual(matcher.misses, misses)
+
+    def test_small_cache_flushes_and_falls_back(self):
+        matcher = LazyDFA(self.enfa, max_bytes=5000)
+        self.assertEqual(matcher.accepts_many(self.words), self.expected)
+        self.assertGreater(matcher.flushes, 0)
+        self.assertGreater(matcher.fallbacks, 0)
+        self.assertLessEqual(matcher.memory_used, 5000)
+
+    def test_row_memo_is_bounded(self):
+        enfa = RegexToENFAConverter("(a|b)*a(a|b){100}").convert_to_enfa()
+        words = random_words(1, "ab", count=20, max_length=200)
+        max_bytes = 64 * 1024
+        matcher = LazyDFA(enfa, max_bytes=max_bytes)
+        self.assertEqual(
+            matcher.accepts_many(words), [accepts(enfa, word) for word in words]
+        )
+        rows = matcher._rows
+        real_size = sys.getsizeof(rows) + sum(
+            sys.getsizeof(key) + sys.getsizeof(row) for key, row in rows.items()
+        )
+        self.assertLessEqual(real_size, max_bytes)
+        self.assertLessEqual(matcher.memory_used, max_bytes)
+        self.assertGreater(matcher.flushes, 0)
+
+    def test_fallback_does_not_touch_the_cache(self):
+        matcher = LazyDFA(self.enfa, max_bytes=5000)
+        matcher.accepts_many(self.words)
+        flushes, memory_used = matcher.flushes, matcher.memory_used
+        rows = dict(matcher._rows)
+        for word, expected in zip(self.words, self.expected):
+            self.assertEqual(
+                matcher._simulate(matcher.initial_bits, iter(word)), expected, word
+            )
+        self.assertEqual(matcher.flushes, flushes)
+        self.assertEqual(matcher.memory_used, memory_used)
+        self.assertEqual(matcher._rows, rows)
+
+    def test_step_survives_flushes(self):
+        matcher = LazyDFA(self.enfa, max_bytes=2000)
+        for word, expected in zip(self.words, self.expected):
+            state = matcher.start
+            for symbol in word:
+                state = matcher.step(state, symbol)
+            self.assertEqual(state.final, expected, word)
+        self.assertGreater(matcher.flushes, 0)
+        self.assertGreater(matcher.fallbacks, 0)
+        self.assertLessEqual(matcher.memory_used, 2000)
+
+    def test_unknown_symbols_reject(self):
+        matcher = LazyDFA(self.enfa)
+        self.assertFalse(matcher.accepts("aaaaaaaaaz"))
+        self.assertFalse(matcher.step(matcher.start, "z").final)
+
+
+if __name__ == "__main__":
+    unittest.main()
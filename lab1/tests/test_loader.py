@@ -0,0 +1,77 @@
+import io
+import json
+import os
+import unittest
+
+from lab1 import Automata
+from lab1.benchmarks.json_loader import legacy_load_from_file
+from lab1.core.loader import parse_transition_key, read_automata_json
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class TestTransitionKeyParsing(unittest.TestCase):
+    def test_plain_key(self):
+        self.assertEqual(parse_transition_key("('0', 'x')"), ("0", "x"))
+
+    def test_int_state_key(self):
+        self.assertEqual(parse_transition_key("(1, 'b')"), (1, "b"))
+
+    def test_key_with_quotes_in_names(self):
+        key = str(("it's", 'say "hi"'))
+        self.assertEqual(parse_transition_key(key), ("it's", 'say "hi"'))
+
+    def test_key_is_never_evaluated(self):
+        with self.assertRaises(ValueError):
+            parse_transition_key("__import__('os').getcwd()")
+        with self.assertRaises(ValueError):
+            parse_transition_key("('0', 'x', 'y')")
+
+
+class TestStreamingLoader(unittest.TestCase):
+    def setUp(self):
+        self.example_automata = Automata(
+            A={"0", "1", "2"},
+            X={"x", "y", "z"},
+            f={
+                ("0", "x"): {"0", "1", "2"},
+                ("0", "y"): {"1", "2"},
+                ("1", "y"): {"1", "2"},
+                ("2", "epsilon"): {"0"},
+            },
+            a0="0",
+            F={"2"},
+            epsilon="epsilon",
+        )
+
+    def test_data_files_match_legacy_loader(self):
+        for filename in sorted(os.listdir(DATA_DIR)):
+            path = os.path.join(DATA_DIR, filename)
+            expected = legacy_load_from_file(path)
+            self.assertEqual(Automata.load_from_file(path), expected, filename)
+            with open(path) as file:
+                self.assertEqual(Automata.from_json(file.read()), expected, filename)
+
+    def test_small_chunks_match_from_json(self):
+        json_string = json.dumps(json.loads(self.example_automata.to_json()), indent=4)
+        for chunk_size in (1, 3, 7, 64):
+            data = read_automata_json(io.StringIO(json_string), chunk_size=chunk_size)
+            self.assertEqual(Automata(**data), self.example_automata)
+
+    def test_names_are_interned(self):
+        automata = Automata(
+            A={"start state", "final state"},
+            X={"x"},
+            f={("start state", "x"): {"final state"}},
+            a0="start state",
+            F={"final state"},
+        )
+        data = read_automata_json(io.StringIO(automata.to_json()))
+        (final,) = data["F"]
+        (target,) = data["f"][("start state", "x")]
+        self.assertIs(final, target)
+        self.assertIs(data["a0"], next(s for s in data["A"] if s == "start state"))
+
+    def test_trailing_data_raises(self):
+        with self.assertRaises(ValueError):
+            read_automata_json(io.StringIO(self.example_automata.to_json() + "{}"))
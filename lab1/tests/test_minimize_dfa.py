@@ -0,0 +1,86 @@
+from lab1 import Automata, DFAMinimizer, NFAToDFAConverter
+from lab1.tests.helpers import LanguageTestCase, accepts, all_words, random_enfa
+
+
+def brute_force_state_count(dfa, max_length=6):
+    """Count Myhill-Nerode classes of reachable, co-reachable states by their suffix languages."""
+    words = list(all_words(dfa.X, max_length))
+
+    def signature(state):
+        return tuple(
+            accepts(Automata(dfa.A, dfa.X, dfa.f, state, dfa.F), word) for word in words
+        )
+
+    signatures = {signature(state) for state in dfa.A}
+    signatures.discard(tuple(False for _ in words))
+    return len(signatures)
+
+
+class TestDfaMinimization(LanguageTestCase):
+    max_word_length = 6
+
+    def test_merges_equivalent_states(self):
+        dfa = Automata(
+            A={"0", "1", "2", "3", "4"},
+            X={"a", "b"},
+            f={
+                ("0", "a"): {"1"},
+                ("0", "b"): {"2"},
+                ("1", "a"): {"3"},
+                ("2", "a"): {"3"},
+                ("3", "a"): {"3"},
+                ("4", "a"): {"0"},
+            },
+            a0="0",
+            F={"3"},
+        )
+        minimizer = DFAMinimizer(dfa)
+        minimal = minimizer.minimize()
+        self.assertEqual(minimal.A, {"0", "1", "3"})
+        self.assertEqual(minimal.f[("0", "b")], {"1"})
+        self.assertEqual(minimizer.removed_states, 2)
+        self.assertEqual(minimizer.state_map["2"], "1")
+        self.assertSameLanguage(dfa, minimal)
+
+    def test_complete_adds_sink(self):
+        dfa = Automata(
+            A={"0", "1"},
+            X={"a", "b"},
+            f={("0", "a"): {"1"}},
+            a0="0",
+            F={"1"},
+        )
+        minimal = DFAMinimizer(dfa, complete=True).minimize()
+        self.assertEqual(minimal.A, {"0", "1", "sink"})
+        self.assertEqual(len(minimal.f), 6)
+        self.assertEqual(minimal.f[("1", "a")], {"sink"})
+        self.assertSameLanguage(dfa, minimal)
+
+    def test_random_dfas_are_minimal_and_equivalent(self):
+        for seed in range(10):
+            dfa = NFAToDFAConverter(random_enfa(seed, n_states=5)).convert_to_dfa()
+            minimal = DFAMinimizer(dfa).minimize()
+            self.assertSameLanguage(dfa, minimal)
+            self.assertEqual(len(minimal.A), max(1, brute_force_state_count(dfa)))
+
+    def test_empty_language(self):
+        dfa = Automata({"0", "1"}, {"a"}, {("0", "a"): {"1"}}, "0", set())
+        minimal = DFAMinimizer(dfa).minimize()
+        self.assertEqual(minimal.A, {"0"})
+        self.assertEqual(minimal.f, {})
+
+    def test_large_cycle_collapses(self):
+        # A counter that accepts on multiples of 3, unrolled to 6,000 states.
+        n = 6000
+        A = {str(i) for i in range(n)}
+        f = {(str(i), "a"): {str((i + 1) % n)} for i in range(n)}
+        f.update({(str(i), "b"): {str(i)} for i in range(n)})
+        dfa = Automata(A, {"a", "b"}, f, "0", {str(i) for i in range(0, n, 3)})
+        minimizer = DFAMinimizer(dfa)
+        self.assertEqual(len(minimizer.minimize().A), 3)
+        self.assertEqual(minimizer.removed_states, n - 3)
+
+    def test_rejects_nondeterministic_input(self):
+        nfa = Automata({"0", "1"}, {"a"}, {("0", "a"): {"0", "1"}}, "0", {"1"})
+        with self.assertRaises(ValueError):
+            DFAMinimizer(nfa).minimize()
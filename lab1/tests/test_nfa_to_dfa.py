@@ -0,0 +1,54 @@
+import os
+import tempfile
+
+from lab1 import Automata, NFAToDFAConverter
+from lab1.tests.helpers import LanguageTestCase, random_enfa
+
+
+class TestNfaToDfaConversion(LanguageTestCase):
+    def test_result_is_deterministic_and_equivalent(self):
+        for seed in range(20):
+            nfa = random_enfa(seed, n_states=8)
+            dfa = NFAToDFAConverter(nfa).convert_to_dfa()
+            self.assertTrue(all(len(targets) == 1 for targets in dfa.f.values()))
+            self.assertSameLanguage(nfa, dfa)
+
+    def test_subset_names(self):
+        nfa = Automata(
+            A={"0", "1", "2"},
+            X={"x"},
+            f={("0", "x"): {"1", "2"}, ("1", "x"): {"2"}},
+            a0="0",
+            F={"2"},
+        )
+        converter = NFAToDFAConverter(nfa)
+        dfa = converter.convert_to_dfa()
+        self.assertEqual(dfa.A, {"{0}", "{1, 2}", "{2}"})
+        self.assertEqual(dfa.f[("{0}", "x")], {"{1, 2}"})
+        self.assertEqual(dfa.F, {"{1, 2}", "{2}"})
+        self.assertEqual(converter.subset_of["{1, 2}"], {"1", "2"})
+
+    def test_on_demand_skips_unreachable_subsets(self):
+        nfa = random_enfa(3, n_states=6, epsilon_density=0)
+        full = NFAToDFAConverter(nfa, on_demand=False).convert_to_dfa()
+        lazy = NFAToDFAConverter(nfa).convert_to_dfa()
+        self.assertEqual(len(full.A), 2**6 - 1)
+        self.assertLess(len(lazy.A), len(full.A))
+        self.assertSameLanguage(full, lazy)
+
+    def test_large_nfa_with_small_reachable_part(self):
+        # A 2,000-state NFA where a0 can only reach a handful of states.
+        A = {str(i) for i in range(2000)}
+        f = {(str(i), "a"): {str(i), str(i + 1)} for i in range(1999)}
+        f.update({(str(i), "b"): {str(i + 1)} for i in range(1999)})
+        nfa = Automata(A, {"a", "b"}, f, "1990", {"1999"})
+        dfa = NFAToDFAConverter(nfa).convert_to_dfa()
+        self.assertLessEqual(len(dfa.A), 55)
+        self.assertSameLanguage(nfa, dfa, max_length=4)
+
+    def test_save_and_load(self):
+        dfa = NFAToDFAConverter(random_enfa(1, n_states=6)).convert_to_dfa()
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "dfa.json")
+            dfa.save_to_file(filename)
+            self.assertEqual(Automata.load_from_file(filename), dfa)
@@ -0,0 +1,89 @@
+import unittest
+
+from lab1 import Automata, RegexToENFAConverter
+from lab1.core.operations import (
+    Determinized,
+    LazyAutomata,
+    complement,
+    difference,
+    intersection,
+    union,
+)
+from lab1.tests.helpers import LanguageTestCase, accepts, random_enfa
+
+
+class TestBooleanOperations(LanguageTestCase):
+    def test_operations_on_random_enfas(self):
+        for seed in range(10):
+            a = random_enfa(seed, n_states=6, n_symbols=2)
+            b = random_enfa(seed + 100, n_states=6, n_symbols=3)
+            alphabet = a.X | b.X
+            self.assertLanguage(
+                intersection(a, b).materialize(),
+                lambda w: accepts(a, w) and accepts(b, w),
+                alphabet,
+            )
+            self.assertLanguage(
+                union(a, b).materialize(),
+                lambda w: accepts(a, w) or accepts(b, w),
+                alphabet,
+            )
+            self.assertLanguage(
+                difference(a, b).materialize(),
+                lambda w: accepts(a, w) and not accepts(b, w),
+                alphabet,
+            )
+            self.assertLanguage(
+                complement(a, alphabet).materialize(),
+                lambda w: not accepts(a, w),
+                alphabet,
+            )
+
+    def test_lazy_successor_function(self):
+        a = RegexToENFAConverter("(ab)*").convert_to_enfa()
+        b = RegexToENFAConverter("a*b*").convert_to_enfa()
+        product = intersection(a, b)
+        states = {product.initial}
+        for symbol in "ab":
+            states = {t for s in states for t in product.successors(s, symbol)}
+        self.assertTrue(any(product.is_final(state) for state in states))
+        for symbol in "aba":
+            states = {t for s in states for t in product.successors(s, symbol)}
+        self.assertEqual(states, set())
+
+    def test_only_reachable_product_states(self):
+        # Two chains of 1000 states; only the diagonal of the product is reachable.
+        def chain(n):
+            f = {(str(i), "a"): {str(i + 1)} for i in range(n)}
+            return Automata({str(i) for i in range(n + 1)}, {"a"}, f, "0", {str(n)})
+
+        product = intersection(chain(1000), chain(1000))
+        materialized = product.materialize()
+        self.assertEqual(len(materialized.A), 1001)
+        self.assertEqual(len(product.state_of), 1001)
+
+    def test_complement_is_complete(self):
+        dfa = complement(Automata({"0"}, {"a", "b"}, {}, "0", set())).materialize()
+        # {"0"} and the empty sink set, both accepting.
+        self.assertEqual(dfa.F, {0, 1})
+        self.assertEqual(
+            dfa.f,
+            {(0, "a"): {1}, (0, "b"): {1}, (1, "a"): {1}, (1, "b"): {1}},
+        )
+
+    def test_materialize_limit(self):
+        nfa = RegexToENFAConverter("(a|b)*a(a|b){10}").convert_to_enfa()
+        with self.assertRaises(ValueError):
+            Determinized(nfa).materialize(max_states=100)
+
+    def test_incomplete_subclass_cannot_be_instantiated(self):
+        class NoFinality(LazyAutomata):
+            def successors(self, state, symbol):
+                return ()
+
+        with self.assertRaises(TypeError):
+            NoFinality()
+
+
+if __name__ == "__main__":
+    unittest.main()
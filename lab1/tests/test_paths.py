@@ -0,0 +1,121 @@
+import copy
+import itertools
+import pickle
+import unittest
+
+from lab1 import Automata, CompactAutomata, RegexToENFAConverter
+from lab1.tests.helpers import accepts, all_words, random_enfa
+
+
+def reachable(automata, word) -> set:
+    """States a run on `word` can end in (with epsilon closure)."""
+
+    def close(states):
+        stack, seen = list(states), set(states)
+        while stack:
+            for b in automata.f.get((stack.pop(), automata.epsilon), ()):
+                if b not in seen:
+                    seen.add(b)
+                    stack.append(b)
+        return seen
+
+    current = close({automata.a0})
+    for symbol in word:
+        current = close({b for a in current for b in automata.f.get((a, symbol), ())})
+    return current
+
+
+class TestPathQueries(unittest.TestCase):
+    def test_words_in_length_lexicographic_order(self):
+        for seed in range(15):
+            enfa = random_enfa(seed, n_states=6, n_symbols=2)
+            expected = [word for word in all_words("ab", 6) if accepts(enfa, word)]
+            words = list(itertools.islice(enfa.shortest_words(), len(expected)))
+            self.assertEqual(words, expected, seed)
+            if expected:
+                self.assertEqual(len(enfa.shortest_word()), len(expected[0]))
+            else:
+                self.assertLessEqual(len(list(enfa.shortest_words(1))), 1)
+
+    def test_shortest_word_to_state(self):
+        for seed in range(10):
+            enfa = random_enfa(seed)
+            words = list(all_words("abc", 4))
+            for state in enfa.A:
+                word = enfa.shortest_word_to(state)
+                lengths = [len(w) for w in words if state in reachable(enfa, w)]
+                if word is None:
+                    self.assertEqual(lengths, [], (seed, state))
+                elif len(word) <= 4:
+                    self.assertIn(state, reachable(enfa, word))
+                    self.assertEqual(len(word), min(lengths), (seed, state))
+        with self.assertRaises(ValueError):
+            enfa.shortest_word_to("missing")
+
+    def test_finite_and_empty_languages(self):
+        enfa = RegexToENFAConverter("ab(c|d)|b").convert_to_enfa()
+        self.assertEqual(
+            list(enfa.shortest_words()), [("b",), ("a", "b", "c"), ("a", "b", "d")]
+        )
+        self.assertEqual(list(enfa.shortest_words(2)), [("b",), ("a", "b", "c")])
+        empty = Automata({0, 1}, {"a"}, {(0, "a"): {0}}, 0, {1})
+        self.assertIsNone(empty.shortest_word())
+        self.assertEqual(list(empty.shortest_words()), [])
+
+    def test_sparse_lengths(self):
+        enfa = RegexToENFAConverter("(a{7})*").convert_to_enfa()
+        words = list(itertools.islice(enfa.shortest_words(), 4))
+        self.assertEqual([len(word) for word in words], [0, 7, 14, 21])
+
+    def test_index_is_cached_and_invalidated(self):
+        automata = Automata({0, 1, 2}, {"a", "b"}, {(0, "a"): {1}}, 0, {2})
+        index = automata.path_index()
+        self.assertIs(automata.path_index(), index)
+        self.assertIsNone(automata.shortest_word())
+
+        automata.f[(1, "b")] = {2}
+        self.assertEqual(automata.shortest_word(), ("a", "b"))
+        automata.f = {(0, "b"): {2}}
+        self.assertEqual(automata.shortest_word(), ("b",))
+        automata.f[(0, "b")].clear()
+        self.assertIsNone(automata.shortest_word())
+
+        compact = CompactAutomata.from_automata(automata)
+        self.assertIsNone(compact.shortest_word_to(2))
+        self.assertEqual(compact.shortest_word_to(0), ())
+
+    def test_final_state_changes_rebuild_index(self):
+        automata = Automata(
+            {0, 1, 2}, {"a", "b"}, {(0, "a"): {1}, (1, "b"): {2}}, 0, {2}
+        )
+        self.assertEqual(automata.shortest_word(), ("a", "b"))
+        automata.F = {1}
+        self.assertEqual(automata.shortest_word(), ("a",))
+        automata.F.add(0)
+        self.assertEqual(automata.shortest_word(), ())
+        automata.F.clear()
+        self.assertIsNone(automata.shortest_word())
+
+    def test_same_size_edit_rebuilds_index(self):
+        automata = Automata({0, 1}, {"a", "b"}, {(0, "a"): {0}}, 0, {1})
+        self.assertIsNone(automata.shortest_word())
+        # Removing one transition and adding another keeps len(f) unchanged.
+        del automata.f[(0, "a")]
+        automata.f[(0, "b")] = {1}
+        self.assertEqual(automata.shortest_word(), ("b",))
+        automata.f[(0, "b")].add(0)
+        automata.A.add(2)
+        automata.f[(0, "b")].discard(1)
+        self.assertIsNone(automata.shortest_word())
+
+    def test_copies_keep_tracking_edits(self):
+        automata = Automata({0, 1}, {"a"}, {(0, "a"): {1}}, 0, {1})
+        self.assertEqual(automata.shortest_word(), ("a",))
+        for clone in (copy.deepcopy(automata), pickle.loads(pickle.dumps(automata))):
+            clone.f[(0, "a")].discard(1)
+            self.assertIsNone(clone.shortest_word())
+        self.assertEqual(automata.shortest_word(), ("a",))
+
+
+if __name__ == "__main__":
+    unittest.main()
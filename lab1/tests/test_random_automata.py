@@ -0,0 +1,19 @@
+import unittest
+
+from lab1.core.random_automata import random_enfa
+
+
+class TestRandomENFA(unittest.TestCase):
+    def test_generator_is_seeded(self):
+        self.assertEqual(random_enfa(3, 50, 3), random_enfa(3, 50, 3))
+        self.assertNotEqual(random_enfa(3, 50, 3), random_enfa(4, 50, 3))
+
+    def test_generator_parameters(self):
+        enfa = random_enfa(0, 200, 5, density=2.0, epsilon_density=0.0)
+        self.assertEqual(len(enfa.A), 200)
+        self.assertEqual(len(enfa.X), 5)
+        self.assertFalse(any(x == enfa.epsilon for _, x in enfa.f))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import itertools
+import re
+import unittest
+
+from lab1 import ENFAToNFAConverter, RegexToENFAConverter
+from lab1.core.converters.regex_to_enfa import parse_regex
+from lab1.tests.helpers import accepts
+
+ALPHABET = "abcxy."
+
+PATTERNS = [
+    "abc",
+    "ab*c",
+    "(a|b)*abb",
+    "a?b+",
+    "x{2,3}y",
+    "(ab*){0,1}",
+    "(ab)+c?",
+    "[a-c]+x",
+    "[^a]b",
+    ".*a",
+    "(a*)*b",
+    "a(b|)c",
+    "a{2,}",
+    "abc|x",
+    r"ab\.c",
+    "",
+]
+
+
+def reached_finals(automata, word):
+    """Final states reached after reading `word` (reference simulation)."""
+
+    def close(states):
+        stack, seen = list(states), set(states)
+        while stack:
+            for b in automata.f.get((stack.pop(), automata.epsilon), ()):
+                if b not in seen:
+                    seen.add(b)
+                    stack.append(b)
+        return seen
+
+    current = close({automata.a0})
+    for symbol in word:
+        current = close({b for a in current for b in automata.f.get((a, symbol), ())})
+    return current & automata.F
+
+
+class TestRegexToENFA(unittest.TestCase):
+    def test_patterns_match_python_re(self):
+        for pattern in PATTERNS:
+            enfa = RegexToENFAConverter(pattern, alphabet=ALPHABET).convert_to_enfa()
+            self.assertEqual(enfa.epsilon, "epsilon")
+            for length in range(6):
+                for word in itertools.product(ALPHABET, repeat=length):
+                    word = "".join(word)
+                    self.assertEqual(
+                        accepts(enfa, word),
+                        re.fullmatch(pattern, word) is not None,
+                        (pattern, word),
+                    )
+
+    def test_combined_automaton_labels(self):
+        patterns = {"keyword": "if", "name": "[a-z]+", "number": "[0-9]+"}
+        converter = RegexToENFAConverter(patterns)
+        enfa = converter.convert_to_enfa()
+        self.assertEqual(set(converter.accept_labels), enfa.F)
+
+        def labels(word):
+            return {
+                converter.accept_labels[state] for state in reached_finals(enfa, word)
+            }
+
+        self.assertEqual(labels("if"), {"keyword", "name"})
+        self.assertEqual(labels("iff"), {"name"})
+        self.assertEqual(labels("42"), {"number"})
+        self.assertEqual(labels("4a"), set())
+
+    def test_compact_numbering(self):
+        patterns = ["abc", "abd", "(a|b)*c", "a?"]
+        enfa = RegexToENFAConverter(patterns).convert_to_enfa()
+        self.assertEqual(enfa.A, set(range(len(enfa.A))))
+        self.assertEqual(enfa.a0, 0)
+        # Literal runs need one state per symbol and no epsilon moves.
+        self.assertEqual(len(RegexToENFAConverter("abcd").convert_to_enfa().A), 5)
+
+    def test_result_converts_to_nfa(self):
+        enfa = RegexToENFAConverter(["a(b|c)*", "c+"]).convert_to_enfa()
+        nfa = ENFAToNFAConverter(enfa, engine="closure").convert_to_nfa()
+        for word in ["a", "abcb", "ccc", "", "ac", "ca"]:
+            self.assertEqual(accepts(nfa, word), accepts(enfa, word), word)
+
+    def test_result_tracks_edits(self):
+        enfa = RegexToENFAConverter("ab").convert_to_enfa()
+        self.assertEqual(enfa.shortest_word(), ("a", "b"))
+        enfa.f[(0, "a")].add(2)
+        self.assertEqual(enfa.shortest_word(), ("a",))
+        enfa.f = {(0, "b"): {2}}
+        self.assertEqual(enfa.shortest_word(), ("b",))
+
+    def test_parse_tree(self):
+        self.assertEqual(
+            parse_regex("ab*"), ("cat", [("str", "a"), ("star", ("str", "b"))])
+        )
+        self.assertEqual(parse_regex("(ab)?"), ("opt", ("cat", [("str", "ab")])))
+
+    def test_syntax_errors(self):
+        for pattern in ["(ab", "ab)", "*a", "[ab", "a{3,2}", "[z-a]", "a\\"]:
+            with self.assertRaises(ValueError, msg=pattern):
+                RegexToENFAConverter(pattern).convert_to_enfa()
+
+    def test_symbols_outside_alphabet(self):
+        with self.assertRaises(ValueError):
+            RegexToENFAConverter("abz", alphabet="ab").convert_to_enfa()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import random
+import re
+import tempfile
+import unittest
+
+from lab1 import Automata, RegexToENFAConverter
+from lab1.core.scanner import Scanner
+
+PATTERNS = ["ab+c", "x[abc]*x", "z{3}", "(a|b)*c"]
+
+
+def brute_force_ends(pattern: str, data: bytes) -> list:
+    text = data.decode("latin-1")
+    regex = re.compile(pattern)
+    return [
+        end
+        for end in range(len(text) + 1)
+        if any(regex.fullmatch(text, start, end) for start in range(end + 1))
+    ]
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.data = bytes(rng.choice(b"abcxz\n") for _ in range(600))
+
+    def test_matches_brute_force_across_chunks(self):
+        for pattern in PATTERNS:
+            enfa = RegexToENFAConverter(pattern).convert_to_enfa()
+            expected = brute_force_ends(pattern, self.data)
+            for chunk_size in (1, 7, 4096):
+                scanner = Scanner(enfa, chunk_size=chunk_size)
+                self.assertEqual(
+                    list(scanner.scan(self.data)), expected, (pattern, chunk_size)
+                )
+
+    def test_scan_chunks_carries_state(self):
+        enfa = RegexToENFAConverter("abc").convert_to_enfa()
+        scanner = Scanner(enfa)
+        self.assertEqual(list(scanner.scan_chunks([b"xa", b"b", b"cab", b"c"])), [4, 7])
+
+    def test_empty_word_matches_everywhere(self):
+        enfa = RegexToENFAConverter("a*").convert_to_enfa()
+        self.assertEqual(list(Scanner(enfa).scan(b"bab")), [0, 1, 2, 3])
+
+    def test_int_and_str_symbols(self):
+        automata = Automata({0, 1}, {10}, {(0, 10): {1}}, 0, {1})
+        self.assertEqual(list(Scanner(automata).scan(b"a\nb\n")), [2, 4])
+
+    def test_file_scan_sequential_and_parallel(self):
+        rng = random.Random(1)
+        data = bytes(rng.choice(b"abcx\nzzz") for _ in range(20000))
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "input.log")
+            with open(filename, "wb") as file:
+                file.write(data)
+            for pattern in ["x[abc]*x", "z{3}"]:
+                enfa = RegexToENFAConverter(pattern).convert_to_enfa()
+                expected = list(Scanner(enfa).scan(data))
+                scanner = Scanner(enfa, chunk_size=999)
+                self.assertEqual(list(scanner.scan_file(filename)), expected)
+                self.assertEqual(
+                    list(scanner.scan_file(filename, workers=3)), expected, pattern
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import itertools
+import random
+import unittest
+
+from lab1 import Automata, CompactAutomata
+from lab1.tests.helpers import accepts, random_enfa
+
+
+class TestAcceptsMany(unittest.TestCase):
+    def test_matches_reference_simulation(self):
+        for seed in range(10):
+            enfa = random_enfa(seed, n_states=10)
+            words = [
+                "".join(word)
+                for length in range(5)
+                for word in itertools.product("abc", repeat=length)
+            ]
+            expected = [accepts(enfa, word) for word in words]
+            self.assertEqual(enfa.accepts_many(words).tolist(), expected, seed)
+
+    def test_more_than_64_states(self):
+        # Accepts exactly the words a^k with k = 99 (mod 100).
+        A = {str(i) for i in range(100)}
+        f = {(str(i), "a"): {str((i + 1) % 100)} for i in range(100)}
+        automata = CompactAutomata(A, {"a", "b"}, f, "0", {"99"})
+        words = ["a" * k for k in range(250)] + ["a" * 98 + "b"]
+        accepted = automata.accepts_many(words)
+        self.assertEqual(
+            [k for k, ok in enumerate(accepted) if ok],
+            [99, 199],
+        )
+
+    def test_symbol_sequences_and_unknown_symbols(self):
+        automata = Automata(
+            A={"0", "1"},
+            X={"ab", "c"},
+            f={("0", "ab"): {"1"}, ("1", "c"): {"1"}},
+            a0="0",
+            F={"1"},
+        )
+        words = [("ab",), ("ab", "c", "c"), (), ("c",), ("ab", "zz")]
+        self.assertEqual(
+            automata.accepts_many(words).tolist(), [True, True, False, False, False]
+        )
+
+    def test_mixed_lengths_keep_input_order(self):
+        enfa = random_enfa(7, n_states=6)
+        rng = random.Random(7)
+        words = [
+            "".join(rng.choice("abcd") for _ in range(rng.randrange(8)))
+            for _ in range(500)
+        ]
+        expected = [accepts(enfa, word) for word in words]
+        self.assertEqual(enfa.accepts_many(words).tolist(), expected)
+        self.assertEqual(enfa.accepts_many([]).tolist(), [])
+
+    def test_simulator_is_cached_until_the_automaton_changes(self):
+        automata = Automata({0, 1}, {"a"}, {(0, "a"): {1}}, 0, {1})
+        self.assertEqual(automata.accepts_many(["a", ""]).tolist(), [True, False])
+        _, simulator = automata._batch_simulator
+        self.assertEqual(automata.accepts_many(["aa"]).tolist(), [False])
+        self.assertIs(automata._batch_simulator[1], simulator)
+
+        automata.f[(1, "a")] = {1}
+        self.assertEqual(automata.accepts_many(["aa"]).tolist(), [True])
+        self.assertIsNot(automata._batch_simulator[1], simulator)
+        automata.F.add(0)
+        self.assertEqual(automata.accepts_many([""]).tolist(), [True])
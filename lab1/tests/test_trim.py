@@ -0,0 +1,83 @@
+import io
+import itertools
+import unittest
+
+from lab1 import Automata, ENFAToNFAConverter, NFAToDFAConverter
+from lab1.core.trim import trim
+from lab1.tests.helpers import accepts, random_enfa
+
+
+class TestTrim(unittest.TestCase):
+    def setUp(self):
+        # 3 is unreachable, 4 is reachable but dead.
+        self.automata = Automata(
+            A={"0", "1", "2", "3", "4"},
+            X={"a", "b"},
+            f={
+                ("0", "a"): {"1", "4"},
+                ("1", "epsilon"): {"2"},
+                ("3", "b"): {"2"},
+                ("4", "b"): {"4"},
+            },
+            a0="0",
+            F={"2"},
+            epsilon="epsilon",
+        )
+
+    def test_removes_unreachable_and_dead_states(self):
+        result = trim(self.automata)
+        self.assertEqual(result.removed_states, {"3", "4"})
+        self.assertEqual(
+            result.removed_transitions,
+            {("0", "a", "4"), ("3", "b", "2"), ("4", "b", "4")},
+        )
+        self.assertEqual(
+            result.automata,
+            Automata(
+                A={"0", "1", "2"},
+                X={"a", "b"},
+                f={("0", "a"): {"1"}, ("1", "epsilon"): {"2"}},
+                a0="0",
+                F={"2"},
+                epsilon="epsilon",
+            ),
+        )
+
+    def test_empty_language_keeps_start_state(self):
+        self.automata.F = set()
+        result = trim(self.automata)
+        self.assertEqual(result.automata.A, {"0"})
+        self.assertEqual(result.automata.f, {})
+        self.assertEqual(result.removed_states, {"1", "2", "3", "4"})
+
+    def test_preserves_language(self):
+        for seed in range(20):
+            enfa = random_enfa(seed, density=0.1, epsilon_density=0.05)
+            trimmed = trim(enfa).automata
+            self.assertLessEqual(trimmed.A, enfa.A)
+            for length in range(5):
+                for word in itertools.product(sorted(enfa.X), repeat=length):
+                    self.assertEqual(
+                        accepts(trimmed, word), accepts(enfa, word), (seed, word)
+                    )
+
+    def test_converters_accept_trim_pre_pass(self):
+        converter = ENFAToNFAConverter(self.automata, engine="closure", trim=True)
+        nfa = converter.convert_to_nfa()
+        self.assertEqual(converter.trim_result.removed_states, {"3", "4"})
+        self.assertEqual(nfa.A, {"0", "1", "2"})
+
+        # 1 only reaches F by an epsilon move, so it is dead in the NFA.
+        converter = NFAToDFAConverter(nfa, trim=True)
+        dfa = converter.convert_to_dfa()
+        self.assertEqual(converter.trim_result.removed_states, {"1"})
+        self.assertEqual(len(dfa.A), 2)
+
+    def test_dot_export_accepts_trim_pre_pass(self):
+        out = io.StringIO()
+        self.assertEqual(self.automata.write_dot(out, trim=True), 3)
+        self.assertNotIn('"4"', out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
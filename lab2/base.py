@@ -1,6 +1,7 @@
-from collections import defaultdict
 from dataclasses import dataclass, field
 
+from lab2.compiled import CompiledMealy
+
 
 @dataclass
 class MooreAutomata:
@@ -8,8 +9,10 @@ class MooreAutomata:
     input_alphabet: set
     output_alphabet: set
     transitions: dict
-    initial_state: tuple
+    initial_state: int
     final_states: set
+    # state_pairs[i] is the (Mealy state, output) pair that state i stands for.
+    state_pairs: list = field(default=None)
 
 
 @dataclass
@@ -38,54 +41,66 @@ class MealyAutomata:
         self.current_state = next_state
         return output_symbol
 
+    def compile(self):
+        """
+        Intern the machine into integer NumPy tables. They are built on first
+        use and cached on the instance until `states`, `input_alphabet` or
+        `transitions` is replaced or `initial_state` changes. In-place edits
+        of those are not detected; call `invalidate_compiled()` after them.
+        """
+        # The tables are keyed on the objects themselves, not their ids, so
+        # a replacement that reuses a freed id is still noticed.
+        sources = (self.states, self.input_alphabet, self.transitions)
+        cached = self.__dict__.get("_compiled")
+        if (
+            cached is None
+            or any(old is not new for old, new in zip(cached[0], sources))
+            or cached[1] != self.initial_state
+        ):
+            cached = (sources, self.initial_state, CompiledMealy(self))
+            self._compiled = cached
+        return cached[2]
+
+    def invalidate_compiled(self):
+        """Drop the cached integer tables."""
+        self.__dict__.pop("_compiled", None)
+
+    def transduce_many(self, sequences):
+        """
+        Run every input sequence from the initial state and return the list of
+        output symbols of each. The result matches calling `step` on every
+        symbol after `reset`, but all sequences advance together in NumPy on
+        the cached tables of `compile()`.
+        """
+        return self.compile().transduce_many(sequences)
+
+    def minimize(self):
+        """
+        Return the minimal machine with the same input/output behavior and the
+        map from every reachable state to its state in that machine.
+        """
+        # Imported here because the minimizer builds MealyAutomata instances.
+        from lab2.minimize import MealyMinimizer
+
+        minimizer = MealyMinimizer(self)
+        return minimizer.minimize(), minimizer.state_map
+
     def to_moore(self, final_symbols):
-        # Create an empty set for the states of the Moore machine.
-        states = set()
-
-        # Get the input and output alphabets from the Mealy machine.
-        input_alphabet = self.input_alphabet
-        output_alphabet = self.output_alphabet
-
-        # Create a default dictionary for the transitions of the Moore machine.
-        transitions = defaultdict(dict)
-
-        # Create an empty set for the final states of the Moore machine.
-        final_states = set()
-
-        # Iterate through each state in the Mealy machine.
-        for state in self.states:
-            # Iterate through each input symbol in the Mealy machine.
-            for input_symbol in self.input_alphabet:
-                # Get the next state and output symbol for the current state and input symbol.
-                next_state, output_symbol = self.transitions[state][input_symbol]
-
-                # Create a new state for the Moore machine by combining the state and output symbol.
-                new_state = (state, output_symbol)
-
-                # Add the new state to the set of states.
-                states.add(new_state)
-
-                # Add a transition for the new state and input symbol.
-                transitions[new_state][input_symbol] = (next_state, output_symbol)
-
-                # If the output symbol is in the set of final symbols, add the new state to the set of final states.
-                if output_symbol in final_symbols:
-                    final_states.add(new_state)
-
-        # Get the initial state for the Moore machine by combining the initial state of the Mealy machine with the
-        # output function.
-        initial_state = (self.initial_state, self.output_function[self.initial_state])
-
-        # Create a Moore machine with the states, input alphabet, output alphabet, transitions, initial state,
-        # and final states.
-        moore_machine = MooreAutomata(
-            states,
-            input_alphabet,
-            output_alphabet,
-            transitions,
-            initial_state,
-            final_states,
-        )
-
-        # Return the Moore machine.
-        return moore_machine
+        """
+        Return the Moore machine over the reachable (state, output) pairs.
+        Its states are the ints 0, 1, ... in breadth-first order from the
+        initial pair (`initial_state` with its `output_function` value, or
+        None), and `state_pairs` maps them back to the pairs. A pair is
+        final if its output is one of `final_symbols`.
+        """
+        return self.to_moore_lazy(final_symbols).materialize()
+
+    def to_moore_lazy(self, final_symbols):
+        """
+        Return a `LazyMoore` that creates the states of `to_moore` only when
+        their transitions are first asked for.
+        """
+        # Imported here because the Moore builder builds MooreAutomata instances.
+        from lab2.moore import LazyMoore
+
+        return LazyMoore(self, final_symbols)
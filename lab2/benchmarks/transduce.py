@@ -0,0 +1,81 @@
+import argparse
+import random
+import time
+
+from lab2 import MealyAutomata
+
+
+def random_mealy(seed: int, n_states: int, inputs: str, n_outputs: int):
+    """A complete random Mealy machine over single-character inputs."""
+    rng = random.Random(seed)
+    transitions = {
+        q: {x: (rng.randrange(n_states), rng.randrange(n_outputs)) for x in inputs}
+        for q in range(n_states)
+    }
+    return MealyAutomata(
+        set(range(n_states)), set(inputs), set(range(n_outputs)), transitions, 0
+    )
+
+
+def step_outputs(machine, sequences) -> list:
+    """The baseline: `reset` and one `step` call per symbol."""
+    result = []
+    for sequence in sequences:
+        machine.reset()
+        result.append([machine.step(x) for x in sequence])
+    return result
+
+
+def best_time(operation, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare batch transduction of a Mealy machine with step loops."
+    )
+    parser.add_argument("--states", type=int, default=2000)
+    parser.add_argument("--inputs", default="abcd")
+    parser.add_argument("--outputs", type=int, default=5)
+    parser.add_argument(
+        "--batch",
+        nargs=2,
+        type=int,
+        action="append",
+        metavar=("SEQUENCES", "LENGTH"),
+        help="batch shape; may be repeated (default: 200 50, 10000 20, 100000 20)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    machine = random_mealy(args.seed, args.states, args.inputs, args.outputs)
+    compiled = machine.compile()
+    rng = random.Random(args.seed)
+    print(
+        "{:>10} {:>7} {:>12} {:>16} {:>16}".format(
+            "sequences", "length", "step (s)", "transduce_many", "transduce_ids"
+        )
+    )
+    for count, length in args.batch or [(200, 50), (10_000, 20), (100_000, 20)]:
+        sequences = [
+            "".join(rng.choice(args.inputs) for _ in range(length))
+            for _ in range(count)
+        ]
+        baseline = best_time(lambda: step_outputs(machine, sequences), 1)
+        many = best_time(lambda: machine.transduce_many(sequences), args.repeat)
+        ids = best_time(lambda: compiled.transduce_ids(sequences), args.repeat)
+        print(
+            "{:>10} {:>7} {:>12.3f} {:>15.1f}x {:>15.1f}x".format(
+                count, length, baseline, baseline / many, baseline / ids
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
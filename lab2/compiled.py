@@ -0,0 +1,199 @@
+"""
+Integer transition tables for running Mealy machines on many inputs at once.
+
+States, input symbols and output symbols are interned to dense ids, and the
+transition dicts become two (state, input) tables: the next state id and the
+output id, with -1 where no transition is defined. Both are packed into one
+table for the hot loop.
+
+A batch of input sequences is laid out as a steps x batch matrix and
+advanced in lockstep: every position is one contiguous gather from the
+packed table for all sequences that are still running, writing one row of a
+steps x batch output matrix. Decoding takes the output symbols of the whole
+matrix at once.
+"""
+import numpy as np
+
+
+class CompiledMealy:
+    """Transition and output tables of a `MealyAutomata`."""
+
+    def __init__(self, machine):
+        self.states = sorted(machine.states, key=str)
+        self.state_ids = {state: i for i, state in enumerate(self.states)}
+        self.inputs = sorted(machine.input_alphabet, key=str)
+        self.input_ids = {symbol: i for i, symbol in enumerate(self.inputs)}
+        if machine.initial_state not in self.state_ids:
+            raise ValueError("Current state not in list of states")
+        self.initial = self.state_ids[machine.initial_state]
+
+        self.outputs = []
+        output_ids = {}
+        shape = (len(self.states), len(self.inputs))
+        self.next_table = np.full(shape, -1, dtype=np.int32)
+        self.output_table = np.full(shape, -1, dtype=np.int32)
+        for state, row in machine.transitions.items():
+            q = self.state_ids.get(state)
+            if q is None:
+                continue
+            for symbol, (next_state, output) in row.items():
+                x = self.input_ids.get(symbol)
+                if x is None:
+                    continue
+                if next_state not in self.state_ids:
+                    raise ValueError(
+                        f"Transition target {next_state!r} not in list of states"
+                    )
+                if output not in output_ids:
+                    output_ids[output] = len(self.outputs)
+                    self.outputs.append(output)
+                self.next_table[q, x] = self.state_ids[next_state]
+                self.output_table[q, x] = output_ids[output]
+
+        # Flat views: row q * k + x.
+        self._next = self.next_table.ravel()
+        self._output = self.output_table.ravel()
+
+        # The hot loop reads one packed table: the row offset of the next
+        # state shifted left, with the output id + 1 (0 if undefined) in the
+        # low bits. An undefined transition leads to row -k, which stays in
+        # bounds, and the arithmetic shift restores negative offsets.
+        k = len(self.inputs)
+        self._shift = (len(self.outputs) + 1).bit_length()
+        self._packed = (self._next.astype(np.int64) * k << self._shift) | (
+            self._output.astype(np.int64) + 1
+        )
+
+        # Fast path for str sequences over single-character input symbols: a
+        # lookup table from code point to input id.
+        if self.inputs and all(isinstance(s, str) and len(s) == 1 for s in self.inputs):
+            codes = [ord(s) for s in self.inputs]
+            # At least 256 entries, so Latin-1 bytes index it directly.
+            self._char_ids = np.full(max(max(codes) + 2, 256), -1, dtype=np.int32)
+            self._char_ids[codes] = np.arange(len(codes))
+        else:
+            self._char_ids = None
+
+    def _encode(self, sequences: list):
+        """Return the lengths and the concatenated input ids of all sequences."""
+        lengths = np.fromiter(map(len, sequences), dtype=np.intp, count=len(sequences))
+        text = None
+        if self._char_ids is not None:
+            try:
+                # Only succeeds if every sequence is a str.
+                text = "".join(sequences)
+            except TypeError:
+                pass
+        if text is not None:
+            try:
+                codes = np.frombuffer(text.encode("latin-1"), dtype=np.uint8)
+                flat = self._char_ids.take(codes)
+            except UnicodeEncodeError:
+                codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+                # Code points past the table map to its last entry, which is -1.
+                limit = len(self._char_ids) - 1
+                flat = self._char_ids[np.minimum(codes, limit)]
+        else:
+            get = self.input_ids.get
+            flat = np.fromiter(
+                (get(s, -1) for sequence in sequences for s in sequence),
+                dtype=np.int32,
+                count=int(lengths.sum()),
+            )
+        if len(flat) and flat.min() < 0:
+            raise ValueError("Input symbol not in input alphabet")
+        return lengths, flat
+
+    def _run(self, sequences: list):
+        """
+        Run the sequences in lockstep. Return the steps x batch matrix of
+        output ids, whose column j holds the sequence order[j] (longest
+        first), with the lengths and offsets of the sequences.
+        """
+        lengths, flat = self._encode(sequences)
+        offsets = np.zeros(len(sequences), dtype=np.intp)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+
+        # Longest sequences first, so the running ones are always a prefix.
+        order = np.argsort(-lengths, kind="stable")
+        sorted_lengths = lengths[order]
+        n_steps = int(sorted_lengths[0])
+        running = len(sequences) - np.searchsorted(
+            sorted_lengths[::-1], np.arange(n_steps), side="right"
+        )
+
+        # Lay the inputs out as a steps x batch matrix once, so every step
+        # reads and writes one contiguous row. Entries past the end of a
+        # sequence are never read.
+        if sorted_lengths[-1] == n_steps:
+            inputs = np.ascontiguousarray(flat.reshape(len(sequences), n_steps).T)
+        else:
+            steps = np.arange(n_steps, dtype=np.intp)[:, None]
+            positions = np.minimum(offsets[order][None, :] + steps, len(flat) - 1)
+            inputs = flat[positions]
+        inputs = inputs.astype(np.int64, copy=False)
+
+        # States are kept as their row offset q * k in the flat tables; out
+        # holds the output ids + 1, so 0 marks an undefined transition.
+        packed, shift = self._packed, self._shift
+        mask = (1 << shift) - 1
+        rows = np.full(len(sequences), self.initial * len(self.inputs), np.int64)
+        out = np.ones((n_steps, len(sequences)), dtype=np.int64)
+        current = np.empty(len(sequences), dtype=np.int64)
+        for t in range(n_steps):
+            active = running[t]
+            step = current[:active]
+            np.add(rows[:active], inputs[t, :active], out=step)
+            packed.take(step, out=step)
+            np.bitwise_and(step, mask, out=out[t, :active])
+            np.right_shift(step, shift, out=rows[:active])
+
+        if out.size and out.min() == 0:
+            self._report_undefined(out, order, flat, offsets)
+        return out, order, lengths, offsets
+
+    def _report_undefined(self, out, order, flat, offsets):
+        """Raise the KeyError of the undefined transition `step` would hit first."""
+        columns = np.flatnonzero((out == 0).any(axis=0))
+        column = columns[np.argmin(order[columns])]
+        i, t = int(order[column]), int(np.argmax(out[:, column] == 0))
+        q = self.initial
+        for x in flat[offsets[i] : offsets[i] + t]:
+            q = self.next_table[q, x]
+        raise KeyError((self.states[q], self.inputs[flat[offsets[i] + t]]))
+
+    def transduce_ids(self, sequences) -> tuple:
+        """
+        Run every input sequence from the initial state without decoding the
+        outputs. Return the output ids of all sequences concatenated (decode
+        them with `outputs`) and the offset where each sequence starts.
+        """
+        sequences = list(sequences)
+        if not sequences:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.intp)
+        out, order, lengths, offsets = self._run(sequences)
+        by_sequence = np.empty_like(out.T)
+        by_sequence[order] = out.T
+        mask = np.arange(out.shape[0])[None, :] < lengths[:, None]
+        return (by_sequence[mask] - 1).astype(np.int32), offsets
+
+    def transduce_many(self, sequences) -> list:
+        """
+        Run every input sequence from the initial state and return the list
+        of output symbols of each, as repeated `step` calls would.
+        """
+        sequences = list(sequences)
+        if not sequences:
+            return []
+        out, order, lengths, _ = self._run(sequences)
+        # Index 0 stands for undefined outputs, which `_run` has ruled out.
+        symbols = np.empty(len(self.outputs) + 1, dtype=object)
+        symbols[1:] = self.outputs
+        # One take decodes the whole matrix; rows are then whole sequences.
+        emitted = symbols.take(out.T).tolist()
+        lengths = lengths.tolist()
+        result = [None] * len(sequences)
+        for row, i in zip(emitted, order.tolist()):
+            length = lengths[i]
+            result[i] = row if length == len(row) else row[:length]
+        return result
@@ -1,6 +1,7 @@
 from typing import Set
 
 from lab2 import MealyAutomata
+from lab2.lab2.regex import EMPTY, EPSILON, concat, regex_of, star, symbol, union
 from lab2.tests.test_data import (
     STATES,
     INPUT_ALPHABET,
@@ -12,126 +13,110 @@ from lab2.tests.test_data import (
 )
 
 
-def solve_linear_equations(equations):
+def solve_linear_equations(equations: dict) -> dict:
     """
     Solve left linear equations of the form:
-    Si = SjXj or SkXk or ...
+    X = X1A1 | X2A2 | ... | B
+
+    `equations` maps every variable X to its terms {Xi: Ai}, where the key
+    None holds the constant term B. A coefficient is a `Regex`, a symbol or
+    a list of alternatives. Variables without an equation denote no words.
+    Returns the `Regex` of every variable.
+
+    Algorithm:
+    ----------
+    1. Pick the variable X whose elimination creates the fewest terms: the
+       number of equations using X times the number of terms of X.
+    2. Arden's lemma: X = XA | C1 | ... | Cm has the solution
+       X = C1A* | ... | CmA*, so drop the loop and append A* to every term.
+    3. Substitute X into every equation that uses it: a term XD becomes the
+       terms of X followed by D, merged with the existing ones by union.
+    4. Repeat until every variable has been eliminated; each equation then
+       holds only its constant term.
     """
-
-    # Deep copy the input equations to avoid modifying them in-place
-    solved_equations = equations.copy()
-
-    # Flag to check if we have made any updates in the current iteration
-    updated = True
-
-    while updated:
-        updated = False
-
-        # For each state in the equations
-        for state, terms in solved_equations.items():
-            new_terms = terms.copy()
-
-            # For each term in the state's equation
-            for term_state, term_symbols in terms.items():
-                # If the term's state is not the current state and has its own equation
-                if term_state != state and term_state in solved_equations:
-                    for next_term_state, next_term_symbols in solved_equations[
-                        term_state
-                    ].items():
-                        # Expand the term using its equation
-                        if next_term_state not in new_terms:
-                            new_terms[next_term_state] = []
-
-                        for symbol in term_symbols:
-                            for next_symbol in next_term_symbols:
-                                # Check if expansion leads to infinite repetition
-                                if (
-                                    symbol + next_symbol
-                                    not in new_terms[next_term_state]
-                                ):
-                                    new_terms[next_term_state].append(
-                                        symbol + next_symbol
-                                    )
-                                    updated = True
-
-            # Remove duplicates from the terms
-            for term_state in new_terms:
-                new_terms[term_state] = list(set(new_terms[term_state]))
-
-            # Update the equation for the current state
-            solved_equations[state] = new_terms
-
-    # Return the solved equations
-    return solved_equations
+    # Step 1: Normalize the terms and record which equations use each variable.
+    system = {variable: {} for variable in equations}
+    for variable, terms in equations.items():
+        for term, coefficient in terms.items():
+            if term is not None and term not in equations:
+                continue
+            system[variable][term] = regex_of(coefficient)
+    users = {variable: set() for variable in system}
+    for variable, terms in system.items():
+        for term in terms:
+            if term is not None:
+                users[term].add(variable)
+    position = {variable: i for i, variable in enumerate(system)}
+
+    remaining = set(system)
+    while remaining:
+        variable = min(
+            remaining,
+            key=lambda v: (
+                (len(users[v]) - (v in users[v])) * len(system[v]),
+                position[v],
+            ),
+        )
+        remaining.discard(variable)
+
+        # Step 2: Apply Arden's lemma to remove the loop on the variable.
+        terms = system[variable]
+        loop = terms.pop(variable, None)
+        users[variable].discard(variable)
+        if loop is not None:
+            closure = star(loop)
+            for term in terms:
+                terms[term] = concat(terms[term], closure)
+
+        # Step 3: Substitute the variable into every equation that uses it.
+        for user in users.pop(variable):
+            user_terms = system[user]
+            coefficient = user_terms.pop(variable)
+            for term, term_coefficient in terms.items():
+                expansion = concat(term_coefficient, coefficient)
+                if term in user_terms:
+                    expansion = union(user_terms[term], expansion)
+                user_terms[term] = expansion
+                if term is not None:
+                    users[term].add(user)
+
+    # Step 4: Every equation is now reduced to its constant term.
+    return {variable: terms.get(None, EMPTY) for variable, terms in system.items()}
 
 
 def solve_linear_equations_mealy(
     mealy_machine: MealyAutomata, final_symbols: Set[str]
-) -> None:
-    print("Mealy machine:")
-    print(f"States: {mealy_machine.states}")
-    print(f"Input alphabet: {mealy_machine.input_alphabet}")
-    print(f"Output alphabet: {mealy_machine.output_alphabet}")
-    print(f"Transitions: {mealy_machine.transitions}")
-    print(f"Initial state: {mealy_machine.initial_state}")
-    print(f"Output function: {mealy_machine.output_function}")
-
-    # Build left linear equations Let's represent left linear equations as a list of mappings, where in mapping key
-    # is a state and value is tuple. First element of tuple is a state from which we can get to the key state Second
-    # element of tuple is a list of symbols which are used to get to the key state from the first element of tuple
-    left_linear_equations = dict()
-    for transition in mealy_machine.transitions:
-        value = mealy_machine.transitions[transition]
-
-        for symbol in value:
-            key = value[symbol][0]
-            equation = left_linear_equations.get(key, None)
-
-            if equation is None:
-                left_linear_equations[key] = dict()
-                left_linear_equations[key][transition] = [symbol]
-            else:
-                nested_eq = left_linear_equations[key].get(transition, None)
-
-                if nested_eq is None:
-                    left_linear_equations[key][transition] = [symbol]
-                else:
-                    left_linear_equations[key][transition].append(symbol)
-
-    print("Left linear equations:")
-    print(left_linear_equations)
-
-    # After solving left linear equations let's build SM.
-    sm_equation = dict()
-    for transition in mealy_machine.transitions:
-        value = mealy_machine.transitions[transition]
-
-        for symbol in value:
-            output_symbol = value[symbol][1]
-
-            if output_symbol not in final_symbols:
-                continue
-
-            print(
-                f"Transition: {transition}, symbol: {symbol}, output symbol: {output_symbol}. State: {value[symbol][0]}"
-            )
-
-            state = value[symbol][0]
-            equation = sm_equation.get(state, None)
-
-            if equation is None:
-                sm_equation[state] = dict()
-                sm_equation[state][transition] = [symbol]
-            else:
-                nested_eq = sm_equation[state].get(transition, None)
-
-                if nested_eq is None:
-                    sm_equation[state][transition] = [symbol]
-                else:
-                    sm_equation[state][transition].append(symbol)
+) -> dict:
+    """
+    Return, for every final output symbol, the `Regex` of the input words
+    whose last output is that symbol.
 
-    print("SM equation:")
-    print(sm_equation)
+    The left linear equations describe the words leading to each state:
+    Xq = Xp1a1 | Xp2a2 | ... over the transitions pi -ai-> q, plus ε for the
+    initial state. The words ending with output o are then the union of Xpa
+    over the transitions p -a/o-> q.
+    """
+    # Build the left linear equations.
+    equations = {state: {} for state in mealy_machine.states}
+    equations.setdefault(mealy_machine.initial_state, {})[None] = EPSILON
+    transitions = []
+    for state in sorted(mealy_machine.transitions, key=str):
+        row = mealy_machine.transitions[state]
+        for input_symbol in sorted(row, key=str):
+            next_state, output_symbol = row[input_symbol]
+            transitions.append((state, input_symbol, output_symbol))
+            terms = equations.setdefault(next_state, {})
+            terms.setdefault(state, []).append(input_symbol)
+            equations.setdefault(state, {})
+
+    solved = solve_linear_equations(equations)
+
+    # Collect the words ending with each final output symbol.
+    words = {output_symbol: [] for output_symbol in final_symbols}
+    for state, input_symbol, output_symbol in transitions:
+        if output_symbol in words:
+            words[output_symbol].append(concat(solved[state], symbol(input_symbol)))
+    return {output_symbol: union(*parts) for output_symbol, parts in words.items()}
 
 
 if __name__ == "__main__":
@@ -145,5 +130,8 @@ if __name__ == "__main__":
         output_function=OUTPUT_FUNCTION,
     )
 
-    # Debug the analysis problem for the Mealy machine
-    solve_linear_equations_mealy(mealy_machine, FINAL_SYMBOLS)
+    # Print the regular expression of every final output symbol
+    for output_symbol, regex in solve_linear_equations_mealy(
+        mealy_machine, FINAL_SYMBOLS
+    ).items():
+        print(f"{output_symbol}: {regex}")
@@ -0,0 +1,218 @@
+"""
+Hash-consed regular expressions.
+
+Every expression is built by `symbol`, `concat`, `union` and `star`, which
+simplify their operands and return the unique node for the result, so equal
+expressions are the same object: comparing or hashing them is O(1), and
+sub-expressions shared by many equations are stored once.
+
+Simplifications:
+  - concat: nested concatenations are flattened, ε is dropped, ∅ absorbs
+    everything, and A*A* becomes A*;
+  - union: nested unions are flattened, ∅ and duplicates are dropped, A is
+    dropped next to A*, ε is dropped next to a nullable member, and members
+    sharing a last or first factor are factored (xA|yA becomes (x|y)A);
+  - star: ∅* and ε* are ε, (A*)* is A*, and (ε|A*|B)* is (A|B)*.
+"""
+import weakref
+
+EMPTY_KIND = "empty"
+EPSILON_KIND = "epsilon"
+SYMBOL_KIND = "symbol"
+CONCAT_KIND = "concat"
+UNION_KIND = "union"
+STAR_KIND = "star"
+
+_nodes = weakref.WeakValueDictionary()
+
+
+class Regex:
+    """A node of a regular expression; build nodes with the module functions."""
+
+    __slots__ = ("kind", "args", "nullable", "text", "_derivatives", "__weakref__")
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Regex({self.text!r})"
+
+    def derivative(self, input_symbol) -> "Regex":
+        """Return the expression of the words w such that `input_symbol` w matches."""
+        result = self._derivatives.get(input_symbol)
+        if result is None:
+            result = self._derivatives[input_symbol] = _derivative(self, input_symbol)
+        return result
+
+    def matches(self, word) -> bool:
+        """Tell whether the sequence of symbols `word` matches the expression."""
+        node = self
+        for input_symbol in word:
+            node = node.derivative(input_symbol)
+            if node is EMPTY:
+                return False
+        return node.nullable
+
+
+def _make(kind: str, args, nullable: bool, text: str) -> Regex:
+    key = (kind, args)
+    node = _nodes.get(key)
+    if node is None:
+        node = Regex()
+        node.kind, node.args = kind, args
+        node.nullable, node.text = nullable, text
+        node._derivatives = {}
+        _nodes[key] = node
+    return node
+
+
+# Kept alive by the module, so they are never collected and stay unique.
+EMPTY = _make(EMPTY_KIND, None, False, "∅")
+EPSILON = _make(EPSILON_KIND, None, True, "ε")
+
+
+def _atom(node: Regex) -> str:
+    """Text of `node` as an operand of a postfix operator."""
+    if node.kind in (EMPTY_KIND, EPSILON_KIND, STAR_KIND):
+        return node.text
+    if node.kind == SYMBOL_KIND and len(node.text) == 1:
+        return node.text
+    return f"({node.text})"
+
+
+def symbol(input_symbol) -> Regex:
+    return _make(SYMBOL_KIND, input_symbol, False, str(input_symbol))
+
+
+def _factors(node: Regex) -> tuple:
+    if node.kind == CONCAT_KIND:
+        return node.args
+    if node.kind == EPSILON_KIND:
+        return ()
+    return (node,)
+
+
+def concat(*parts) -> Regex:
+    factors = []
+    for part in parts:
+        if part is EMPTY:
+            return EMPTY
+        for factor in _factors(part):
+            if factor.kind == STAR_KIND and factors and factors[-1] is factor:
+                continue
+            factors.append(factor)
+    if not factors:
+        return EPSILON
+    if len(factors) == 1:
+        return factors[0]
+    args = tuple(factors)
+    text = "".join(
+        f"({f.text})" if f.kind == UNION_KIND and not _optional(f) else f.text
+        for f in args
+    )
+    return _make(CONCAT_KIND, args, all(f.nullable for f in args), text)
+
+
+def _optional(node: Regex) -> bool:
+    """Tell whether `node` is rendered as A? (a union with ε)."""
+    return node.kind == UNION_KIND and EPSILON in node.args
+
+
+def _factor(members: list, position: int) -> list:
+    """
+    Group the members by their factor at `position` (0 or -1) and factor
+    every group of two or more out. Return None if nothing was grouped.
+    """
+    groups = {}
+    for member in members:
+        factors = _factors(member)
+        groups.setdefault(factors[position] if factors else None, []).append(member)
+    if all(len(group) == 1 for key, group in groups.items() if key is not None):
+        return None
+
+    result = []
+    for key, group in groups.items():
+        if key is None or len(group) == 1:
+            result += group
+        elif position == 0:
+            rest = union(*(concat(*_factors(m)[1:]) for m in group))
+            result.append(concat(key, rest))
+        else:
+            rest = union(*(concat(*_factors(m)[:-1]) for m in group))
+            result.append(concat(rest, key))
+    return result
+
+
+def union(*parts) -> Regex:
+    members = {}
+    for part in parts:
+        for member in part.args if part.kind == UNION_KIND else (part,):
+            if member is not EMPTY:
+                members[member] = None
+    starred = {m.args for m in members if m.kind == STAR_KIND}
+    members = [m for m in members if m not in starred]
+    if any(m.nullable and m is not EPSILON for m in members):
+        members = [m for m in members if m is not EPSILON]
+
+    if len(members) > 1:
+        for position in (-1, 0):
+            factored = _factor(members, position)
+            if factored is not None:
+                return union(*factored)
+
+    if not members:
+        return EMPTY
+    if len(members) == 1:
+        return members[0]
+    args = tuple(sorted(members, key=lambda m: m.text))
+    if EPSILON in args:
+        rest = [m for m in args if m is not EPSILON]
+        body = rest[0] if len(rest) == 1 else union(*rest)
+        text = _atom(body) + "?"
+    else:
+        text = "|".join(m.text for m in args)
+    return _make(UNION_KIND, args, any(m.nullable for m in args), text)
+
+
+def star(node: Regex) -> Regex:
+    if node is EMPTY or node is EPSILON:
+        return EPSILON
+    if node.kind == STAR_KIND:
+        return node
+    if node.kind == UNION_KIND:
+        members = [
+            m.args if m.kind == STAR_KIND else m for m in node.args if m is not EPSILON
+        ]
+        node = union(*members)
+        if node.kind == STAR_KIND:
+            return node
+    return _make(STAR_KIND, node, True, _atom(node) + "*")
+
+
+def regex_of(value) -> Regex:
+    """
+    Coerce `value` to an expression: a `Regex` is kept, a list, tuple or set
+    is the union of its coerced items, and anything else is a symbol.
+    """
+    if isinstance(value, Regex):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return union(*map(regex_of, value))
+    return symbol(value)
+
+
+def _derivative(node: Regex, input_symbol) -> Regex:
+    kind = node.kind
+    if kind == SYMBOL_KIND:
+        return EPSILON if node.args == input_symbol else EMPTY
+    if kind == UNION_KIND:
+        return union(*(m.derivative(input_symbol) for m in node.args))
+    if kind == STAR_KIND:
+        return concat(node.args.derivative(input_symbol), node)
+    if kind == CONCAT_KIND:
+        head, rest = node.args[0], concat(*node.args[1:])
+        result = concat(head.derivative(input_symbol), rest)
+        if head.nullable:
+            result = union(result, rest.derivative(input_symbol))
+        return result
+    return EMPTY
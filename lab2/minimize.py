@@ -0,0 +1,146 @@
+"""
+Minimization of Mealy machines by Hopcroft's partition refinement.
+
+Two states are equivalent if they produce the same output sequence for
+every input sequence. Equivalent states have equal output rows (the output,
+or its absence, for every input symbol), so the refinement starts from the
+partition of the states by output row instead of the DFA's {F, A \\ F}, and
+then refines it with the same Hopcroft refinement as `DFAMinimizer`
+(`lab1.core.partition`).
+"""
+from lab1.core.partition import refine_partition
+from lab2.base import MealyAutomata
+
+# Output of an undefined transition; it differs from every real output.
+_UNDEFINED = object()
+
+
+class MealyMinimizer:
+    """
+    Minimizer for Mealy machines in O(k * n log n) time (n states, k input
+    symbols).
+
+    Algorithm:
+    ----------
+    1. Keep only the states reachable from the initial state and add a
+       virtual sink that receives every undefined transition, with undefined
+       outputs, so the transition table is complete.
+    2. Partition the states by output row.
+    3. Refine the partition until every block is stable under every input
+       symbol, with `refine_partition`.
+    4. The blocks of the final partition are the states of the minimal
+       machine, named after their first member in breadth-first order, so
+       the initial state keeps its name.
+
+    If `output_function` is a dict, it labels the states: states with
+    different labels are never merged, and the result keeps the labels of
+    its states. A callable `output_function` is kept as is.
+
+    After `minimize()`, `state_map` maps every reachable state to its state
+    in the minimal machine, and `removed_states` is the number of states that
+    were merged away or dropped as unreachable.
+    """
+
+    def __init__(self, machine: MealyAutomata):
+        self.machine = machine
+        self.state_map = {}
+        self.removed_states = 0
+
+    def minimize(self) -> MealyAutomata:
+        """Return the minimal machine with the same input/output behavior."""
+        machine = self.machine
+        symbols = sorted(machine.input_alphabet, key=str)
+        k = len(symbols)
+        order, delta, outputs = self._reachable_table(symbols)
+        n = len(order) + 1
+
+        blocks = self._initial_blocks(order, outputs, k)
+        blk = refine_partition(delta, n, k, blocks)
+        return self._build_result(symbols, order, delta, outputs, blk)
+
+    def _reachable_table(self, symbols: list):
+        """
+        Number the reachable states in breadth-first order and return them
+        with the completed transition and output tables (row q * k + x).
+        """
+        machine = self.machine
+        if machine.initial_state not in machine.states:
+            raise ValueError("Initial state not in list of states")
+        dense = {machine.initial_state: 0}
+        order = [machine.initial_state]
+        delta, outputs = [], []
+        for state in order:
+            row = machine.transitions.get(state, {})
+            for x in symbols:
+                if x not in row:
+                    delta.append(-1)
+                    outputs.append(_UNDEFINED)
+                    continue
+                target, output = row[x]
+                if target not in machine.states:
+                    raise ValueError(
+                        f"Transition target {target!r} not in list of states"
+                    )
+                if target not in dense:
+                    dense[target] = len(order)
+                    order.append(target)
+                delta.append(dense[target])
+                outputs.append(output)
+
+        sink = len(order)
+        delta = [sink if t == -1 else t for t in delta] + [sink] * len(symbols)
+        outputs += [_UNDEFINED] * len(symbols)
+        return order, delta, outputs
+
+    def _initial_blocks(self, order: list, outputs: list, k: int) -> list:
+        """Return the partition of the states by output row (and label)."""
+        labels = self.machine.output_function
+        n = len(order) + 1
+        groups = {}
+        for q in range(n):
+            key = tuple(outputs[q * k : q * k + k])
+            if isinstance(labels, dict):
+                key += (labels.get(order[q], _UNDEFINED) if q < n - 1 else None,)
+            groups.setdefault(key, []).append(q)
+        return list(groups.values())
+
+    def _build_result(self, symbols, order, delta, outputs, blk) -> MealyAutomata:
+        machine = self.machine
+        k = len(symbols)
+
+        # Name each block after its first member; the sink block only keeps
+        # a name if it contains real states.
+        names = {}
+        representative = {}
+        for q, state in enumerate(order):
+            if blk[q] not in names:
+                names[blk[q]] = state
+                representative[blk[q]] = q
+
+        transitions = {}
+        for b, q in representative.items():
+            row = {}
+            for i, x in enumerate(symbols):
+                output = outputs[q * k + i]
+                if output is not _UNDEFINED:
+                    row[x] = (names[blk[delta[q * k + i]]], output)
+            transitions[names[b]] = row
+
+        output_function = machine.output_function
+        if isinstance(output_function, dict):
+            output_function = {
+                names[b]: output_function[order[q]]
+                for b, q in representative.items()
+                if order[q] in output_function
+            }
+
+        self.state_map = {state: names[blk[q]] for q, state in enumerate(order)}
+        self.removed_states = len(machine.states) - len(names)
+        return MealyAutomata(
+            set(names.values()),
+            set(machine.input_alphabet),
+            set(machine.output_alphabet),
+            transitions,
+            machine.initial_state,
+            output_function,
+        )
@@ -0,0 +1,109 @@
+"""
+Mealy to Moore conversion over the reachable part of the Mealy machine.
+
+A Moore state is a pair (q, o): the Mealy machine is in state q and the last
+output was o. Reading x in (q, o) leads to (delta(q, x), lambda(q, x)), and
+(q, o) is final if o is one of the final symbols. The initial pair is the
+initial Mealy state with its `output_function` value, or None if there is
+none.
+
+Pairs are interned to the ints 0, 1, ... in the order they are discovered,
+starting with the initial pair as 0, so only reachable pairs ever exist.
+`LazyMoore` expands a pair's transitions the first time they are asked
+for; `materialize()` runs the worklist over everything reachable.
+"""
+from collections import deque
+
+from lab2.base import MooreAutomata
+
+
+def _initial_output(mealy):
+    output_function = mealy.output_function
+    if output_function is None:
+        return None
+    if callable(output_function):
+        return output_function(mealy.initial_state)
+    return output_function.get(mealy.initial_state)
+
+
+class LazyMoore:
+    """Moore machine of a `MealyAutomata`, built on demand."""
+
+    def __init__(self, mealy, final_symbols):
+        self.mealy = mealy
+        self.final_symbols = set(final_symbols)
+        self.input_symbols = sorted(mealy.input_alphabet, key=str)
+        self.pairs = []
+        self._ids = {}
+        self._rows = []
+        initial_pair = (mealy.initial_state, _initial_output(mealy))
+        self.initial_state = self._intern(initial_pair)
+
+    def _intern(self, pair) -> int:
+        i = self._ids.get(pair)
+        if i is None:
+            i = self._ids[pair] = len(self.pairs)
+            self.pairs.append(pair)
+            self._rows.append(None)
+        return i
+
+    def successors(self, state: int) -> dict:
+        """Return the `{input symbol: state}` transitions of a state."""
+        row = self._rows[state]
+        if row is None:
+            transitions = self.mealy.transitions.get(self.pairs[state][0], {})
+            row = {}
+            for x in self.input_symbols:
+                if x in transitions:
+                    target, output = transitions[x]
+                    row[x] = self._intern((target, output))
+            self._rows[state] = row
+        return row
+
+    def step(self, state: int, input_symbol):
+        """Return the state reached on `input_symbol`, or None if undefined."""
+        return self.successors(state).get(input_symbol)
+
+    def output(self, state: int):
+        return self.pairs[state][1]
+
+    def is_final(self, state: int) -> bool:
+        return self.pairs[state][1] in self.final_symbols
+
+    def accepts(self, sequence) -> bool:
+        """Tell whether reading `sequence` ends in a final state."""
+        state = self.initial_state
+        for input_symbol in sequence:
+            state = self.step(state, input_symbol)
+            if state is None:
+                return False
+        return self.is_final(state)
+
+    @property
+    def expanded_states(self) -> int:
+        return sum(row is not None for row in self._rows)
+
+    def materialize(self):
+        """Expand every reachable state and return the `MooreAutomata`."""
+        queue = deque([self.initial_state])
+        seen = {self.initial_state}
+        while queue:
+            state = queue.popleft()
+            for x in self.input_symbols:
+                target = self.successors(state).get(x)
+                if target is not None and target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+
+        # Every interned pair is a successor of an expanded one, so all of
+        # them are reachable and `seen` now holds every id.
+        states = range(len(self.pairs))
+        return MooreAutomata(
+            set(states),
+            set(self.mealy.input_alphabet),
+            set(self.mealy.output_alphabet),
+            {state: dict(self._rows[state]) for state in states},
+            self.initial_state,
+            {state for state in states if self.is_final(state)},
+            list(self.pairs),
+        )
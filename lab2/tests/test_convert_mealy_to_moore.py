@@ -12,23 +12,95 @@ from lab2.tests.test_data import (
 )
 
 
+def _mealy(output_function=OUTPUT_FUNCTION):
+    return MealyAutomata(
+        STATES,
+        INPUT_ALPHABET,
+        OUTPUT_ALPHABET,
+        TRANSITIONS,
+        INITIAL_STATE,
+        output_function,
+    )
+
+
 class TestConvertMealyToMoore(unittest.TestCase):
     def test_convert_mealy_to_moore(self):
-        mealy_machine = MealyAutomata(
-            STATES,
-            INPUT_ALPHABET,
-            OUTPUT_ALPHABET,
-            TRANSITIONS,
-            INITIAL_STATE,
-            OUTPUT_FUNCTION,
+        moore_machine = _mealy().to_moore(FINAL_SYMBOLS)
+        pairs = moore_machine.state_pairs
+        states = {pairs[state] for state in moore_machine.states}
+        final_states = {pairs[state] for state in moore_machine.final_states}
+
+        assert (1, "v") in states
+        assert (4, "u") in states
+        assert (2, "u") in states
+        assert (3, "v") in states
+        assert (4, "u") in final_states
+        assert (2, "u") in final_states
+        assert (1, "v") not in final_states
+        assert (3, "v") not in final_states
+
+    def test_only_reachable_pairs(self):
+        moore_machine = _mealy().to_moore(FINAL_SYMBOLS)
+        pairs = moore_machine.state_pairs
+
+        self.assertEqual(moore_machine.states, set(range(len(pairs))))
+        self.assertEqual(
+            set(pairs), {(1, None), (1, "v"), (1, "u"), (2, "u"), (3, "v"), (4, "u")}
         )
+        self.assertEqual(pairs[moore_machine.initial_state], (1, None))
+
+    def test_transitions_follow_mealy(self):
+        mealy_machine = _mealy()
         moore_machine = mealy_machine.to_moore(FINAL_SYMBOLS)
+        pairs = moore_machine.state_pairs
+        for state, row in moore_machine.transitions.items():
+            mealy_state = pairs[state][0]
+            for input_symbol, target in row.items():
+                self.assertEqual(
+                    pairs[target], mealy_machine.transitions[mealy_state][input_symbol]
+                )
+
+    def test_initial_output(self):
+        for output_function in ({1: "u", 2: "v"}, lambda state: "u"):
+            moore_machine = _mealy(output_function).to_moore(FINAL_SYMBOLS)
+            initial = moore_machine.initial_state
+            self.assertEqual(moore_machine.state_pairs[initial], (1, "u"))
+            self.assertIn(initial, moore_machine.final_states)
+
+    def test_partial_machine(self):
+        transitions = {1: {"x": (2, "u")}, 2: {}, 3: {"x": (1, "v")}}
+        mealy_machine = MealyAutomata({1, 2, 3}, {"x", "y"}, {"u", "v"}, transitions, 1)
+        moore_machine = mealy_machine.to_moore({"u"})
+
+        self.assertEqual(moore_machine.state_pairs, [(1, None), (2, "u")])
+        self.assertEqual(moore_machine.transitions, {0: {"x": 1}, 1: {}})
+        self.assertEqual(moore_machine.final_states, {1})
+
+    def test_lazy_expands_on_demand(self):
+        lazy = _mealy().to_moore_lazy(FINAL_SYMBOLS)
+        self.assertEqual(lazy.expanded_states, 0)
+
+        self.assertTrue(lazy.accepts("y"))
+        self.assertFalse(lazy.accepts("yy"))
+        self.assertTrue(lazy.accepts("yyx"))
+        self.assertEqual(lazy.expanded_states, 3)
+        self.assertEqual(lazy.output(lazy.step(lazy.initial_state, "y")), "u")
+
+        moore_machine = lazy.materialize()
+        self.assertEqual(len(moore_machine.states), 6)
+
+    def test_lazy_large_machine(self):
+        # A counter with 100000 states; only the visited ones are built.
+        n = 10**5
+        transitions = {
+            q: {"a": ((q + 1) % n, "u" if q % 2 else "v"), "b": (0, "v")}
+            for q in range(n)
+        }
+        mealy_machine = MealyAutomata(
+            set(range(n)), {"a", "b"}, {"u", "v"}, transitions, 0
+        )
+        lazy = mealy_machine.to_moore_lazy({"u"})
 
-        assert (1, "v") in moore_machine.states
-        assert (4, "u") in moore_machine.states
-        assert (2, "v") in moore_machine.states
-        assert (3, "u") in moore_machine.states
-        assert (4, "u") in moore_machine.final_states
-        assert (3, "u") in moore_machine.final_states
-        assert (1, "v") not in moore_machine.final_states
-        assert (2, "v") not in moore_machine.final_states
+        self.assertTrue(lazy.accepts("aa"))
+        self.assertFalse(lazy.accepts("aab"))
+        self.assertLessEqual(len(lazy.pairs), 6)
@@ -0,0 +1,136 @@
+import random
+import unittest
+from itertools import product
+
+from lab2 import MealyAutomata
+from lab2.lab2.first_method import (
+    solve_linear_equations,
+    solve_linear_equations_mealy,
+)
+from lab2.lab2.regex import EMPTY, EPSILON, concat, star, symbol, union
+from lab2.tests.test_data import (
+    STATES,
+    INPUT_ALPHABET,
+    OUTPUT_ALPHABET,
+    TRANSITIONS,
+    INITIAL_STATE,
+    OUTPUT_FUNCTION,
+    FINAL_SYMBOLS,
+)
+
+
+def _last_output(machine, word):
+    state, output_symbol = machine.initial_state, None
+    for input_symbol in word:
+        row = machine.transitions.get(state, {})
+        if input_symbol not in row:
+            return None
+        state, output_symbol = row[input_symbol]
+    return output_symbol
+
+
+def _random_machine(rng, n_states, inputs, outputs):
+    transitions = {
+        q: {
+            x: (rng.randrange(n_states), rng.choice(outputs))
+            for x in inputs
+            if rng.random() < 0.85
+        }
+        for q in range(n_states)
+    }
+    return MealyAutomata(
+        set(range(n_states)), set(inputs), set(outputs), transitions, 0
+    )
+
+
+class TestRegex(unittest.TestCase):
+    def test_hash_consing(self):
+        a, b = symbol("a"), symbol("b")
+        self.assertIs(concat(a, b), concat(a, b))
+        self.assertIs(union(a, b), union(b, a))
+        self.assertIs(star(union(a, b)), star(union(b, a)))
+
+    def test_simplification(self):
+        a, b = symbol("a"), symbol("b")
+        self.assertIs(union(a, EMPTY), a)
+        self.assertIs(concat(a, EPSILON), a)
+        self.assertIs(concat(EMPTY, a), EMPTY)
+        self.assertIs(star(star(a)), star(a))
+        self.assertIs(star(union(EPSILON, a)), star(a))
+        self.assertIs(star(union(star(a), b)), star(union(a, b)))
+        self.assertIs(union(a, star(a)), star(a))
+        self.assertIs(concat(star(a), star(a)), star(a))
+        self.assertEqual(str(union(concat(a, b), concat(b, b))), "(a|b)b")
+        self.assertEqual(str(union(b, concat(a, b))), "a?b")
+
+    def test_matches(self):
+        a, b = symbol("a"), symbol("b")
+        regex = concat(star(union(a, b)), a, b)
+        self.assertTrue(regex.matches("ab"))
+        self.assertTrue(regex.matches("babab"))
+        self.assertFalse(regex.matches("aba"))
+        self.assertFalse(regex.matches(""))
+
+
+class TestSolveLinearEquations(unittest.TestCase):
+    def test_arden(self):
+        # X = Xa | b
+        solved = solve_linear_equations({"X": {"X": ["a"], None: ["b"]}})
+        self.assertEqual(str(solved["X"]), "ba*")
+
+    def test_two_variables(self):
+        # X = ε | Yb, Y = Xa: X = (ab)*
+        solved = solve_linear_equations(
+            {"X": {None: EPSILON, "Y": "b"}, "Y": {"X": "a"}}
+        )
+        self.assertEqual(str(solved["X"]), "(ab)*")
+        self.assertEqual(str(solved["Y"]), "(ab)*a")
+
+    def test_unsolvable_variable(self):
+        solved = solve_linear_equations({"X": {"X": "a"}, "Y": {"Z": "a"}})
+        self.assertIs(solved["X"], EMPTY)
+        self.assertIs(solved["Y"], EMPTY)
+
+
+class TestSolveLinearEquationsMealy(unittest.TestCase):
+    def _check(self, machine, final_symbols, max_length):
+        regexes = solve_linear_equations_mealy(machine, final_symbols)
+        self.assertEqual(set(regexes), set(final_symbols))
+        inputs = sorted(machine.input_alphabet)
+        for length in range(max_length + 1):
+            for word in product(inputs, repeat=length):
+                last = _last_output(machine, word)
+                for output_symbol, regex in regexes.items():
+                    self.assertEqual(
+                        regex.matches(word), last == output_symbol, (word, regex)
+                    )
+
+    def test_test_data(self):
+        machine = MealyAutomata(
+            STATES,
+            INPUT_ALPHABET,
+            OUTPUT_ALPHABET,
+            TRANSITIONS,
+            INITIAL_STATE,
+            OUTPUT_FUNCTION,
+        )
+        self._check(machine, FINAL_SYMBOLS, 8)
+        self._check(machine, OUTPUT_ALPHABET, 8)
+
+    def test_random_machines(self):
+        rng = random.Random(25)
+        for _ in range(25):
+            machine = _random_machine(rng, rng.randint(1, 5), "ab", "uvw")
+            self._check(machine, {"u", "w"}, 6)
+
+    def test_ring_stays_compact(self):
+        # A ring of n states that emits u on returning to the start.
+        n = 40
+        transitions = {
+            q: {"a": ((q + 1) % n, "u" if q == n - 1 else "v")} for q in range(n)
+        }
+        machine = MealyAutomata(set(range(n)), {"a"}, {"u", "v"}, transitions, 0)
+        regex = solve_linear_equations_mealy(machine, {"u"})["u"]
+        self.assertLess(len(str(regex)), 4 * n)
+        self.assertTrue(regex.matches("a" * n))
+        self.assertFalse(regex.matches("a" * (n + 1)))
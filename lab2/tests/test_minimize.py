@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from lab2 import MealyAutomata
+from lab2.tests.test_data import (
+    STATES,
+    INPUT_ALPHABET,
+    OUTPUT_ALPHABET,
+    TRANSITIONS,
+    INITIAL_STATE,
+    OUTPUT_FUNCTION,
+)
+
+
+def random_machine(seed, n_states=12, n_inputs=2, n_outputs=2, partial=0.0):
+    rng = random.Random(seed)
+    inputs = ["x{}".format(i) for i in range(n_inputs)]
+    transitions = {
+        q: {
+            x: (rng.randrange(n_states), rng.randrange(n_outputs))
+            for x in inputs
+            if rng.random() >= partial
+        }
+        for q in range(n_states)
+    }
+    return MealyAutomata(
+        set(range(n_states)), set(inputs), set(range(n_outputs)), transitions, 0
+    )
+
+
+def naive_class_count(machine):
+    """Number of classes of reachable states, by refinement until stable."""
+    reachable = [machine.initial_state]
+    for q in reachable:
+        for target, _ in machine.transitions.get(q, {}).values():
+            if target not in reachable:
+                reachable.append(target)
+    inputs = sorted(machine.input_alphabet)
+    cls = {q: 0 for q in reachable}
+    while True:
+        signatures = {}
+        for q in reachable:
+            row = machine.transitions.get(q, {})
+            signatures[q] = (cls[q],) + tuple(
+                (row[x][1], cls[row[x][0]]) if x in row else None for x in inputs
+            )
+        ids = {s: i for i, s in enumerate(sorted(set(signatures.values()), key=str))}
+        new = {q: ids[signatures[q]] for q in reachable}
+        if len(set(new.values())) == len(set(cls.values())):
+            return len(ids)
+        cls = new
+
+
+class TestMealyMinimization(unittest.TestCase):
+    def test_test_data_is_minimal(self):
+        machine = MealyAutomata(
+            STATES,
+            INPUT_ALPHABET,
+            OUTPUT_ALPHABET,
+            TRANSITIONS,
+            INITIAL_STATE,
+            OUTPUT_FUNCTION,
+        )
+        minimal, state_map = machine.minimize()
+        self.assertEqual(minimal.states, STATES)
+        self.assertEqual(state_map, {q: q for q in STATES})
+        self.assertEqual(minimal.transitions, TRANSITIONS)
+
+    def test_merges_equivalent_states(self):
+        # 2 and 3 behave the same; 4 is unreachable.
+        transitions = {
+            1: {"a": (2, 0), "b": (3, 0)},
+            2: {"a": (1, 1), "b": (2, 0)},
+            3: {"a": (1, 1), "b": (3, 0)},
+            4: {"a": (4, 0)},
+        }
+        machine = MealyAutomata({1, 2, 3, 4}, {"a", "b"}, {0, 1}, transitions, 1)
+        minimal, state_map = machine.minimize()
+        self.assertEqual(minimal.states, {1, 2})
+        self.assertEqual(state_map, {1: 1, 2: 2, 3: 2})
+        self.assertEqual(minimal.transitions[1], {"a": (2, 0), "b": (2, 0)})
+
+    def test_random_machines(self):
+        for seed in range(30):
+            machine = random_machine(seed, partial=0.2 if seed % 2 else 0.0)
+            minimal, state_map = machine.minimize()
+            self.assertEqual(len(minimal.states), naive_class_count(machine), seed)
+            rng = random.Random(seed)
+            sequences = [
+                [rng.choice(["x0", "x1"]) for _ in range(rng.randint(0, 15))]
+                for _ in range(100)
+            ]
+            for sequence in sequences:
+                expected = self.run_partial(machine, sequence)
+                self.assertEqual(self.run_partial(minimal, sequence), expected)
+            for state, target in state_map.items():
+                self.assertIn(target, minimal.states)
+
+    def test_labels_are_kept_apart(self):
+        transitions = {1: {"a": (2, 0)}, 2: {"a": (1, 0)}}
+        machine = MealyAutomata({1, 2}, {"a"}, {0}, transitions, 1)
+        self.assertEqual(len(machine.minimize()[0].states), 1)
+        machine.output_function = {1: "p", 2: "q"}
+        minimal, _ = machine.minimize()
+        self.assertEqual(minimal.states, {1, 2})
+        self.assertEqual(minimal.output_function, {1: "p", 2: "q"})
+
+    @staticmethod
+    def run_partial(machine, sequence):
+        """Outputs of `step` until the first undefined transition."""
+        machine.reset()
+        outputs = []
+        for symbol in sequence:
+            if symbol not in machine.transitions.get(machine.current_state, {}):
+                outputs.append(None)
+                break
+            outputs.append(machine.step(symbol))
+        return outputs
+
+
+if __name__ == "__main__":
+    unittest.main()
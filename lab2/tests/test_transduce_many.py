@@ -0,0 +1,99 @@
+import random
+import unittest
+
+from lab2 import MealyAutomata
+from lab2.tests.test_data import (
+    STATES,
+    INPUT_ALPHABET,
+    OUTPUT_ALPHABET,
+    TRANSITIONS,
+    INITIAL_STATE,
+    OUTPUT_FUNCTION,
+)
+
+
+def step_outputs(machine, sequence):
+    machine.reset()
+    return [machine.step(input_symbol) for input_symbol in sequence]
+
+
+class TestTransduceMany(unittest.TestCase):
+    def setUp(self):
+        self.machine = MealyAutomata(
+            STATES,
+            INPUT_ALPHABET,
+            OUTPUT_ALPHABET,
+            TRANSITIONS,
+            INITIAL_STATE,
+            OUTPUT_FUNCTION,
+        )
+
+    def test_matches_step(self):
+        rng = random.Random(0)
+        sequences = [
+            "".join(rng.choice("xy") for _ in range(rng.randint(0, 40)))
+            for _ in range(200)
+        ]
+        expected = [step_outputs(self.machine, s) for s in sequences]
+        self.assertEqual(self.machine.transduce_many(sequences), expected)
+        self.assertEqual(
+            self.machine.transduce_many([list(s) for s in sequences]), expected
+        )
+        self.assertEqual(self.machine.transduce_many(["xyxy"]), [["v", "u", "u", "v"]])
+
+    def test_random_machine_with_tuple_symbols(self):
+        rng = random.Random(1)
+        states = set(range(30))
+        inputs = [("in", i) for i in range(5)]
+        transitions = {
+            q: {x: (rng.randrange(30), rng.randrange(4)) for x in inputs}
+            for q in states
+        }
+        machine = MealyAutomata(states, set(inputs), set(range(4)), transitions, 0)
+        sequences = [
+            [rng.choice(inputs) for _ in range(rng.randint(0, 30))] for _ in range(100)
+        ]
+        compiled = machine.compile()
+        self.assertEqual(
+            compiled.transduce_many(sequences),
+            [step_outputs(machine, s) for s in sequences],
+        )
+        out, offsets = compiled.transduce_ids(sequences)
+        self.assertEqual(len(out), sum(map(len, sequences)))
+        self.assertEqual(offsets[1], len(sequences[0]))
+
+    def test_compiled_tables_are_cached(self):
+        compiled = self.machine.compile()
+        self.assertIs(self.machine.compile(), compiled)
+        self.machine.transduce_many(["xy"])
+        self.assertIs(self.machine.compile(), compiled)
+
+        self.machine.transitions = {
+            q: {x: (q, "u") for x in INPUT_ALPHABET} for q in STATES
+        }
+        self.assertIsNot(self.machine.compile(), compiled)
+        self.assertEqual(self.machine.transduce_many(["xy"]), [["u", "u"]])
+
+        self.machine.transitions[1]["x"] = (1, "v")
+        self.assertEqual(self.machine.transduce_many(["xy"]), [["u", "u"]])
+        self.machine.invalidate_compiled()
+        self.assertEqual(self.machine.transduce_many(["xy"]), [["v", "u"]])
+
+        self.machine.initial_state = 2
+        self.assertEqual(self.machine.transduce_many(["xy"]), [["u", "u"]])
+
+    def test_errors_match_step(self):
+        with self.assertRaises(ValueError):
+            self.machine.transduce_many(["xyz"])
+        partial = MealyAutomata(
+            {1, 2}, {"x", "y"}, {"u"}, {1: {"x": (2, "u")}, 2: {"x": (1, "u")}}, 1
+        )
+        self.assertEqual(partial.transduce_many(["", "xx"]), [[], ["u", "u"]])
+        with self.assertRaises(KeyError) as context:
+            partial.transduce_many(["xx", "xxy"])
+        self.assertEqual(context.exception.args[0], (1, "y"))
+        self.assertEqual(self.machine.transduce_many([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()